@@ -1,21 +1,18 @@
 import contextlib
-import datetime
+import functools
 import os
 import pathlib
 import sys
-import time
 from pathlib import Path
 
 import typer
-import manim as m
-
-from fontTools.ttLib import TTFont
 
 import git_sim.commands
 from git_sim.settings import (
     ColorByOptions,
     StyleOptions,
     ImgFormat,
+    StreamFormat,
     VideoFormat,
     settings,
 )
@@ -23,8 +20,11 @@ from git_sim.settings import (
 app = typer.Typer(context_settings={"help_option_names": ["-h", "--help"]})
 
 
+@functools.lru_cache(maxsize=None)
 def get_font_name(font_path):
     """Get the name of a font from its .ttf file."""
+    from fontTools.ttLib import TTFont
+
     font = TTFont(font_path)
     return font["name"].getName(4, 3, 1, 1033).toUnicode()
 
@@ -75,6 +75,16 @@ def main(
         "--low-quality",
         help="Render output video in low quality, useful for faster testing",
     ),
+    preview: bool = typer.Option(
+        settings.preview,
+        "--preview",
+        help="Render a fast, low resolution and low frame rate preview of the animation, with shortened animations, for quick iteration",
+    ),
+    tiles: bool = typer.Option(
+        settings.tiles,
+        "--tiles",
+        help="Split the output image into tiles at the default zoom level instead of zooming out to fit, rendered in parallel and indexed by a manifest.json",
+    ),
     max_branches_per_commit: int = typer.Option(
         settings.max_branches_per_commit,
         help="Maximum number of branch labels to display for each commit",
@@ -126,6 +136,10 @@ def main(
         settings.stdout,
         help="Write raw image data to stdout while suppressing all other program output",
     ),
+    stream: StreamFormat = typer.Option(
+        settings.stream,
+        help="Stream each rendered frame to stdout as it is produced, as a png sequence, mjpeg or raw rgba frames, without writing media files",
+    ),
     output_only_path: bool = typer.Option(
         settings.output_only_path,
         help="Only output the path to the generated media file to stdout (useful for other programs to ingest)",
@@ -136,6 +150,14 @@ def main(
         "-q",
         help="Suppress all output except errors",
     ),
+    profile: bool = typer.Option(
+        settings.profile,
+        help="Print the wall and CPU time spent in each phase and method to stderr",
+    ),
+    profile_output: pathlib.Path = typer.Option(
+        settings.profile_output,
+        help="Also write the profile to this file, as a Chrome trace if it ends with .json or as cProfile stats otherwise. Implies --profile",
+    ),
     invert_branches: bool = typer.Option(
         settings.invert_branches,
         help="Invert positioning of branches by reversing order of multiple parents where applicable",
@@ -176,8 +198,17 @@ def main(
         help="Use the simulated git command as the title of the output image or animated video",
     ),
 ):
+    # The client only forwards its arguments to a running git-sim server, and
+    # gc only removes scratch dirs
+    if ctx.invoked_subcommand in ("client", "gc"):
+        return
+
+    # Rendering dependencies are imported here rather than at module level so
+    # that --help, --version and mistyped subcommands start quickly
     import git
-    from manim import WHITE, config
+    from manim import WHITE, config, register_font
+
+    from git_sim.repos import open_repo
 
     settings.animate = animate
     settings.n = n
@@ -187,6 +218,8 @@ def main(
     settings.transparent_bg = transparent_bg
     settings.logo = logo
     settings.low_quality = low_quality
+    settings.preview = preview
+    settings.tiles = tiles
     settings.max_branches_per_commit = max_branches_per_commit
     settings.max_tags_per_commit = max_tags_per_commit
     settings.media_dir = os.path.join(os.path.expanduser(media_dir), "git-sim_media")
@@ -199,6 +232,7 @@ def main(
     settings.title = title
     settings.video_format = video_format
     settings.stdout = stdout
+    settings.stream = stream
     settings.output_only_path = output_only_path
     settings.quiet = quiet
     settings.invert_branches = invert_branches
@@ -208,25 +242,31 @@ def main(
     settings.highlight_commit_messages = highlight_commit_messages
     settings.style = style
     settings.show_command_as_title = show_command_as_title
+    settings.profile = profile or profile_output is not None
+    settings.profile_output = profile_output
+
+    if settings.profile:
+        from git_sim.profiling import finish, start
+
+        start()
+        ctx.call_on_close(finish)
 
     # If font is a path, define the context that will be used when using Manim.
     if Path(font).exists():
         font_path = Path(font)
-        settings.font_context = m.register_font(font_path)
+        settings.font_context = register_font(font_path)
         settings.font = get_font_name(font_path)
+        settings.font_path = font_path
     else:
         settings.font_context = contextlib.nullcontext()
         settings.font = font
+        settings.font_path = None
 
     try:
         if sys.platform == "linux" or sys.platform == "darwin":
-            repo_name = git.repo.Repo(
-                search_parent_directories=True
-            ).working_tree_dir.split("/")[-1]
+            repo_name = open_repo().working_tree_dir.split("/")[-1]
         elif sys.platform == "win32":
-            repo_name = git.repo.Repo(
-                search_parent_directories=True
-            ).working_tree_dir.split("\\")[-1]
+            repo_name = open_repo().working_tree_dir.split("\\")[-1]
     except git.InvalidGitRepositoryError as e:
         repo_name = ""
 
@@ -238,25 +278,61 @@ def main(
     if settings.low_quality:
         config.quality = "low_quality"
 
+    if settings.animate and settings.preview:
+        from git_sim.preview import configure_preview
+
+        configure_preview()
+
+    # Let manim's file writer encode WebM directly instead of transcoding an mp4
+    if settings.animate and settings.video_format == VideoFormat.WEBM:
+        config.format = "webm"
+        config.resolve_movie_file_extension(config.transparent)
+
+    # Static images are rasterized directly from the final scene state, and
+    # streamed frames are written to stdout instead of a video file
+    if not settings.animate or settings.stream:
+        config.write_to_movie = False
+
+    # Streaming takes over stdout, so suppress all other program output
+    if settings.stream:
+        settings.stdout = True
+
     if settings.light_mode:
         config.background_color = WHITE
 
-    if settings.transparent_bg:
+    # Vector formats have no background to make transparent
+    if settings.transparent_bg and settings.img_format == ImgFormat.JPG:
         settings.img_format = ImgFormat.PNG
 
-    t = datetime.datetime.fromtimestamp(time.time()).strftime("%m-%d-%y_%H-%M-%S")
-    config.output_file = "git-sim-" + ctx.invoked_subcommand + "_" + t + ".mp4"
+    from git_sim.output import get_timestamp
+
+    # Partial movie files are written to a fresh scratch dir on every run, see
+    # GitSimBaseCommand.render, so hashing animations to look them up is wasted
+    config.disable_caching = True
+
+    config.output_file = (
+        "git-sim-"
+        + ctx.invoked_subcommand
+        + "_"
+        + get_timestamp()
+        + config.movie_file_extension
+    )
 
 
 app.command()(git_sim.commands.add)
+app.command()(git_sim.commands.batch)
 app.command()(git_sim.commands.branch)
 app.command()(git_sim.commands.checkout)
 app.command()(git_sim.commands.cherry_pick)
 app.command()(git_sim.commands.clean)
+app.command(
+    context_settings={"allow_extra_args": True, "ignore_unknown_options": True}
+)(git_sim.commands.client)
 app.command()(git_sim.commands.clone)
 app.command()(git_sim.commands.commit)
 app.command()(git_sim.commands.config)
 app.command()(git_sim.commands.fetch)
+app.command()(git_sim.commands.gc)
 app.command()(git_sim.commands.init)
 app.command()(git_sim.commands.log)
 app.command()(git_sim.commands.merge)
@@ -269,6 +345,7 @@ app.command()(git_sim.commands.reset)
 app.command()(git_sim.commands.restore)
 app.command()(git_sim.commands.revert)
 app.command()(git_sim.commands.rm)
+app.command()(git_sim.commands.serve)
 app.command()(git_sim.commands.stash)
 app.command()(git_sim.commands.status)
 app.command()(git_sim.commands.switch)
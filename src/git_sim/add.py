@@ -1,5 +1,4 @@
 import sys
-import git
 import manim as m
 
 from typing import List
@@ -22,10 +21,9 @@ class Add(GitSimBaseCommand):
         except TypeError:
             pass
 
+        status = self.get_status()
         for file in self.files:
-            if file not in [x.a_path for x in self.repo.index.diff(None)] + [
-                z for z in self.repo.untracked_files
-            ]:
+            if file not in status.unstaged + status.untracked:
                 print(f"git-sim error: No modified file with name: '{file}'")
                 sys.exit()
 
@@ -54,25 +52,22 @@ class Add(GitSimBaseCommand):
         secondColumnArrowMap={},
         thirdColumnArrowMap={},
     ):
-        for x in self.repo.index.diff(None):
-            if "git-sim_media" not in x.a_path:
-                secondColumnFileNames.add(x.a_path)
+        status = self.get_status()
+        for x in status.unstaged:
+            if "git-sim_media" not in x:
+                secondColumnFileNames.add(x)
                 for file in self.files:
-                    if file == x.a_path:
-                        thirdColumnFileNames.add(x.a_path)
-                        secondColumnArrowMap[x.a_path] = m.Arrow(
+                    if file == x:
+                        thirdColumnFileNames.add(x)
+                        secondColumnArrowMap[x] = m.Arrow(
                             stroke_width=3, color=self.fontColor
                         )
-        try:
-            for y in self.repo.index.diff("HEAD"):
-                if "git-sim_media" not in y.a_path:
-                    thirdColumnFileNames.add(y.a_path)
-        except git.exc.BadName:
-            for (y, _stage), entry in self.repo.index.entries.items():
-                if "git-sim_media" not in y:
-                    thirdColumnFileNames.add(y)
 
-        for z in self.repo.untracked_files:
+        for y in status.staged:
+            if "git-sim_media" not in y:
+                thirdColumnFileNames.add(y)
+
+        for z in status.untracked:
             if "git-sim_media" not in z:
                 firstColumnFileNames.add(z)
                 for file in self.files:
@@ -0,0 +1,95 @@
+import collections
+
+import git
+
+from git_sim.commit_graph import is_hexsha
+from git_sim.settings import settings
+
+
+class Ancestry:
+    """Answer commit reachability queries from memory.
+
+    The first question about two commits loads their symmetric difference
+    with one `git rev-list --left-right --boundary` call: the commits that
+    only one side can reach, and the common commits at the boundary where
+    the two histories meet. The ancestors of the boundary, down to the -n
+    window, are common commits too, and are read through GitPython's
+    persistent cat-file process. A loaded range answers every later
+    question about the commits in it, like a rebase walking back from HEAD
+    until it meets the other branch, so git only runs again for a commit
+    outside the ranges loaded so far. Revisions are resolved in-process.
+    """
+
+    def __init__(self, repo):
+        self.repo = repo
+        self.hexshas = {}
+        self.ranges = []
+        self.results = {}
+
+    def resolve(self, rev):
+        if rev not in self.hexshas:
+            if is_hexsha(rev):
+                self.hexshas[rev] = rev
+            else:
+                try:
+                    self.hexshas[rev] = self.repo.commit(rev).hexsha
+                except (ValueError, git.exc.BadName):
+                    self.hexshas[rev] = None
+        return self.hexshas[rev]
+
+    def load(self, left, right):
+        """Mark each commit reachable from only one of left and right with <
+        or >, and the common commits at the boundary and below it with -."""
+        output = self.repo.git.rev_list(
+            "--left-right", "--boundary", f"{left}...{right}"
+        )
+        sides = {line[1:]: line[0] for line in output.splitlines() if line}
+        queue = collections.deque(
+            (hexsha, 0) for hexsha, side in sides.items() if side == "-"
+        )
+        while queue:
+            hexsha, depth = queue.popleft()
+            if depth >= settings.n:
+                continue
+            for parent in self.repo.commit(hexsha).parents:
+                if parent.hexsha not in sides:
+                    sides[parent.hexsha] = "-"
+                    queue.append((parent.hexsha, depth + 1))
+        self.ranges.append((left, right, sides))
+
+    def lookup(self, ancestor, descendant):
+        for left, right, sides in self.ranges:
+            if descendant not in (left, right) or ancestor not in sides:
+                continue
+            own_side = "<" if descendant == left else ">"
+            return sides[ancestor] in (own_side, "-")
+        return None
+
+    def is_ancestor(self, ancestor, descendant):
+        """Check whether ancestor is reachable from descendant, like
+        `git merge-base --is-ancestor`. A commit is its own ancestor."""
+        ancestor = self.resolve(ancestor)
+        descendant = self.resolve(descendant)
+        if ancestor is None or descendant is None:
+            return False
+        if ancestor == descendant:
+            return True
+
+        key = (ancestor, descendant)
+        if key not in self.results:
+            found = self.lookup(ancestor, descendant)
+            if found is None:
+                try:
+                    self.load(descendant, ancestor)
+                except git.exc.GitCommandError:
+                    # Not a commit of this repo
+                    self.ranges.append((descendant, ancestor, {}))
+                # An ancestor of descendant is always on the range's boundary
+                found = self.lookup(ancestor, descendant)
+            self.results[key] = bool(found)
+        return self.results[key]
+
+    def contains(self, rev, commit):
+        """Check whether the history of rev contains commit, like
+        `git branch --contains`."""
+        return self.is_ancestor(commit, rev)
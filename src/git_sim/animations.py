@@ -1,76 +1,98 @@
-import datetime
 import inspect
 import os
-import subprocess
 import sys
-import time
+from typing import Optional
 
 import cv2
 import git.repo
 from manim import WHITE, Scene
 from manim.utils.file_ops import open_file
+from manim.utils.iterables import list_update
 
+from git_sim.output import claim_unique_dir, claim_unique_path, get_timestamp
 from git_sim.settings import settings
-from git_sim.enums import VideoFormat
+from git_sim.stream import write_frame
+from git_sim.tiles import write_tiles
+from git_sim.vector import VECTOR_FORMATS, write_vector_image
 
 
-def handle_animations(scene: Scene) -> None:
+def handle_animations(scene: Scene) -> Optional[str]:
     scene.render()
 
-    if settings.video_format == VideoFormat.WEBM:
-        webm_file_path = str(scene.renderer.file_writer.movie_file_path)[:-3] + "webm"
-        cmd = f"ffmpeg -y -i {scene.renderer.file_writer.movie_file_path} -hide_banner -loglevel error -c:v libvpx-vp9 -crf 50 -b:v 0 -b:a 128k -c:a libopus {webm_file_path}"
-        print("Converting video output to .webm format...")
-        # Start ffmpeg conversion
-        p = subprocess.Popen(cmd, shell=True)
-        p.wait()
-        # if the conversion is successful, delete the .mp4
-        if os.path.exists(webm_file_path):
-            os.remove(scene.renderer.file_writer.movie_file_path)
-            scene.renderer.file_writer.movie_file_path = webm_file_path
+    # Streamed output goes straight to stdout without touching disk. Animation
+    # frames were already written while rendering.
+    if settings.stream:
+        if not settings.animate:
+            write_frame(capture_final_frame(scene))
+        return None
 
-    if not settings.animate:
-        video = cv2.VideoCapture(str(scene.renderer.file_writer.movie_file_path))
-        success, image = video.read()
-        if success:
-            t = datetime.datetime.fromtimestamp(time.time()).strftime(
-                "%m-%d-%y_%H-%M-%S"
-            )
-            image_file_name = (
+    # Videos, including WebM ones, are encoded by manim's file writer while
+    # rendering, so a missing file means that encoding failed
+    if settings.animate and not os.path.exists(
+        scene.renderer.file_writer.movie_file_path
+    ):
+        print(
+            f"git-sim error: Failed to write video output to {scene.renderer.file_writer.movie_file_path}."
+        )
+        sys.exit(1)
+
+    # Tiled images are written as a directory of tiles with a manifest
+    if settings.tiles and not settings.animate and not settings.stdout:
+        tiles_dir = claim_unique_dir(
+            os.path.join(
+                settings.media_dir,
+                "images",
                 "git-sim-"
                 + inspect.stack()[2].function
                 + "_"
-                + t
-                + "."
-                + settings.img_format
-            )
-            image_file_path = os.path.join(
-                os.path.join(settings.media_dir, "images"), image_file_name
+                + get_timestamp()
+                + "_tiles",
             )
+        )
+        manifest_path = write_tiles(scene, tiles_dir)
+        if not settings.output_only_path and not settings.quiet:
+            print("Output tiles location:", tiles_dir)
+        elif settings.output_only_path and not settings.quiet:
+            print(manifest_path)
+        if settings.auto_open:
+            try:
+                open_file(tiles_dir)
+            except FileNotFoundError:
+                print(
+                    "Error automatically opening media, please manually open the tiles directory to view."
+                )
+        return manifest_path
+
+    if not settings.animate:
+        image_file_name = (
+            "git-sim-"
+            + inspect.stack()[2].function
+            + "_"
+            + get_timestamp()
+            + "."
+            + settings.img_format
+        )
+        image_file_path = claim_unique_path(
+            os.path.join(os.path.join(settings.media_dir, "images"), image_file_name)
+        )
+        # Vector images are drawn straight from the mobjects, skipping the
+        # pixel buffer
+        if settings.img_format in VECTOR_FORMATS:
+            write_vector_image(scene, image_file_path)
+        else:
+            image = get_still_frame(scene)
             if settings.transparent_bg:
-                unsharp_image = cv2.GaussianBlur(image, (0, 0), 3)
-                image = cv2.addWeighted(image, 1.5, unsharp_image, -0.5, 0)
-
-                tmp = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-                if settings.light_mode:
-                    _, alpha = cv2.threshold(tmp, 225, 255, cv2.THRESH_BINARY_INV)
-                else:
-                    _, alpha = cv2.threshold(tmp, 25, 255, cv2.THRESH_BINARY)
-                b, g, r = cv2.split(image)
-                rgba = [b, g, r, alpha]
-                image = cv2.merge(rgba, 4)
+                image = make_transparent(image)
             cv2.imwrite(image_file_path, image)
-            if (
-                not settings.stdout
-                and not settings.output_only_path
-                and not settings.quiet
-            ):
-                print("Output image location:", image_file_path)
-            elif (
-                not settings.stdout and settings.output_only_path and not settings.quiet
-            ):
-                print(image_file_path)
-            if settings.stdout and not settings.quiet:
+        if not settings.stdout and not settings.output_only_path and not settings.quiet:
+            print("Output image location:", image_file_path)
+        elif not settings.stdout and settings.output_only_path and not settings.quiet:
+            print(image_file_path)
+        if settings.stdout and not settings.quiet:
+            if settings.img_format in VECTOR_FORMATS:
+                with open(image_file_path, "rb") as f:
+                    sys.stdout.buffer.write(f.read())
+            else:
                 sys.stdout.buffer.write(cv2.imencode(".jpg", image)[1].tobytes())
     else:
         if not settings.stdout and not settings.output_only_path and not settings.quiet:
@@ -88,3 +110,39 @@ def handle_animations(scene: Scene) -> None:
             print(
                 "Error automatically opening media, please manually open the image or video file to view."
             )
+
+    if not settings.animate:
+        return image_file_path
+    return str(scene.renderer.file_writer.movie_file_path)
+
+
+def make_transparent(image):
+    """Sharpen a BGR image and add an alpha channel that is clear where it
+    shows the background."""
+    unsharp_image = cv2.GaussianBlur(image, (0, 0), 3)
+    image = cv2.addWeighted(image, 1.5, unsharp_image, -0.5, 0)
+
+    tmp = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    if settings.light_mode:
+        _, alpha = cv2.threshold(tmp, 225, 255, cv2.THRESH_BINARY_INV)
+    else:
+        _, alpha = cv2.threshold(tmp, 25, 255, cv2.THRESH_BINARY)
+    b, g, r = cv2.split(image)
+    rgba = [b, g, r, alpha]
+    return cv2.merge(rgba, 4)
+
+
+def get_still_frame(scene: Scene):
+    """Rasterize the final state of the scene straight from the camera.
+
+    Static images skip movie encoding entirely, so the last frame is drawn
+    into the camera's pixel buffer and returned as a BGR array for cv2.
+    """
+    return cv2.cvtColor(capture_final_frame(scene), cv2.COLOR_RGBA2BGR)
+
+
+def capture_final_frame(scene: Scene):
+    camera = scene.renderer.camera
+    camera.reset()
+    camera.capture_mobjects(list_update(scene.mobjects, scene.foreground_mobjects))
+    return camera.pixel_array
@@ -0,0 +1,145 @@
+import concurrent.futures
+import contextlib
+import multiprocessing
+import os
+import shlex
+import shutil
+import sys
+import tempfile
+
+from git_sim.output import get_timestamp
+from git_sim.repos import share_indexes
+from git_sim.runner import is_usage_error
+from git_sim.settings import settings
+
+NON_BATCH_COMMANDS = ["batch", "client", "serve"]
+
+# State shared with forked job workers, see run_batch
+_group_ctx = None
+_batch_file = None
+_batch_settings = None
+
+
+def read_batch_lines(batch_file):
+    """Yield (line number, args) for each subcommand line of a batch file.
+    Blank lines and lines starting with # are skipped, and a leading
+    `git-sim` is optional."""
+    with contextlib.ExitStack() as stack:
+        if str(batch_file) == "-":
+            f = sys.stdin
+        else:
+            f = stack.enter_context(open(batch_file, encoding="utf-8"))
+        for number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            args = shlex.split(line)
+            if args[0] == "git-sim":
+                args = args[1:]
+            yield number, args
+
+
+def run_batch(ctx, batch_file, jobs=1):
+    """Simulate every subcommand line of batch_file in this process.
+
+    All lines share the global options given before `batch`, one font
+    registration, the open repo and the ref and ancestry indexes built over
+    it. Each line writes its own image or video. With jobs > 1 the lines are
+    spread over that many forked worker processes instead. Returns the output
+    paths.
+    """
+    global _group_ctx, _batch_file, _batch_settings
+
+    _group_ctx = ctx.parent
+    _batch_file = batch_file
+    share_indexes()
+
+    # Register a custom font once for the whole batch, not once per line
+    font_context = settings.font_context
+    settings.font_context = contextlib.nullcontext()
+    _batch_settings = dict(settings.__dict__)
+
+    lines = list(read_batch_lines(batch_file))
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    if jobs > 1 and "fork" not in multiprocessing.get_all_start_methods():
+        print("git-sim warning: --jobs requires fork(), running batch serially.")
+        jobs = 1
+
+    with font_context:
+        if jobs > 1:
+            results = run_jobs(lines, jobs)
+        else:
+            results = [run_batch_line(number, args) for number, args in lines]
+
+    settings.__dict__.update(_batch_settings)
+    if not all(ok for ok, _ in results):
+        sys.exit(1)
+    return [output_path for _, output_path in results if output_path]
+
+
+def run_jobs(lines, jobs):
+    # Scratch clones are made under tempfile.gettempdir(), so each worker
+    # gets its own temp dir to keep parallel commands from clobbering them
+    jobs_dir = tempfile.mkdtemp(prefix="git-sim-jobs-")
+    try:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=jobs,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=init_job_worker,
+            initargs=(jobs_dir,),
+        ) as executor:
+            futures = [
+                executor.submit(run_batch_line, number, args) for number, args in lines
+            ]
+            return [future.result() for future in futures]
+    finally:
+        shutil.rmtree(jobs_dir, ignore_errors=True)
+
+
+def init_job_worker(jobs_dir):
+    """Give a forked worker its own copy of the batch settings, with its own
+    media subdirectory and temp dir."""
+    from manim import config
+
+    worker_name = f"worker-{os.getpid()}"
+    tempfile.tempdir = os.path.join(jobs_dir, worker_name)
+    os.makedirs(tempfile.tempdir)
+
+    _batch_settings["media_dir"] = os.path.join(
+        _batch_settings["media_dir"], "jobs", worker_name
+    )
+    settings.__dict__.update(_batch_settings)
+    config.media_dir = settings.media_dir
+
+
+def run_batch_line(number, args):
+    """Run one batch line, returning whether it succeeded and its output path."""
+    from manim import config
+
+    settings.__dict__.update(_batch_settings)
+    if not args or args[0].startswith("-"):
+        print(
+            f"git-sim error: {_batch_file}, line {number}: Global options must be given before `batch`."
+        )
+        return False, None
+    if args[0] in NON_BATCH_COMMANDS:
+        print(
+            f"git-sim error: {_batch_file}, line {number}: `{args[0]}` can't be run from a batch file."
+        )
+        return False, None
+
+    t = get_timestamp()
+    config.output_file = f"git-sim-{args[0]}_{t}_{number}{config.movie_file_extension}"
+    group = _group_ctx.command
+    try:
+        name, command, command_args = group.resolve_command(_group_ctx, args)
+        with command.make_context(name, command_args, parent=_group_ctx) as ctx:
+            return True, command.invoke(ctx)
+    except SystemExit as e:
+        return not e.code, None
+    except Exception as e:
+        if not is_usage_error(e):
+            raise
+        print(f"git-sim error: {_batch_file}, line {number}: {e.format_message()}")
+        return False, None
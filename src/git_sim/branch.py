@@ -2,6 +2,7 @@ import manim as m
 
 from git_sim.git_sim_base_command import GitSimBaseCommand
 from git_sim.settings import settings
+from git_sim.text_cache import cached_text
 
 
 class Branch(GitSimBaseCommand):
@@ -19,7 +20,7 @@ class Branch(GitSimBaseCommand):
         self.parse_all()
         self.center_frame_on_commit(self.get_commit())
 
-        branchText = m.Text(
+        branchText = cached_text(
             self.name,
             font=self.font,
             font_size=20,
@@ -42,13 +42,13 @@ class Checkout(GitSimBaseCommand):
             self.is_descendant = False
 
             # branch being checked out is behind HEAD
-            if self.repo.active_branch.name in self.repo.git.branch(
-                "--contains", self.branch
+            if self.get_ancestry().is_ancestor(
+                self.branch, self.repo.active_branch.name
             ):
                 self.is_ancestor = True
             # HEAD is behind branch being checked out
-            elif self.branch in self.repo.git.branch(
-                "--contains", self.repo.active_branch.name
+            elif self.get_ancestry().is_ancestor(
+                self.repo.active_branch.name, self.branch
             ):
                 self.is_descendant = True
 
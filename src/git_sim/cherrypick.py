@@ -39,9 +39,7 @@ class CherryPick(GitSimBaseCommand):
         if not settings.stdout and not settings.output_only_path and not settings.quiet:
             print(f"{settings.INFO_STRING} {self.cmd}")
 
-        if self.repo.active_branch.name in self.repo.git.branch(
-            "--contains", self.commit
-        ):
+        if self.get_ancestry().is_ancestor(self.commit, self.repo.active_branch.name):
             print(
                 "git-sim error: Commit '"
                 + self.commit
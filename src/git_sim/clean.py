@@ -118,7 +118,7 @@ class Clean(GitSimBaseCommand):
         secondColumnArrowMap={},
         thirdColumnArrowMap={},
     ):
-        for z in self.repo.untracked_files:
+        for z in self.get_status().untracked:
             if "git-sim_media" not in z:
                 firstColumnFileNames.add(z)
                 thirdColumnFileNames.add(z)
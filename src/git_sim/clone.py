@@ -5,12 +5,11 @@ from argparse import Namespace
 import git
 import manim as m
 import numpy
-import tempfile
-import shutil
 import stat
 import re
 
 from git_sim.git_sim_base_command import GitSimBaseCommand
+from git_sim.scratch import clone_scratch_repo, make_scratch_dir, remove_scratch_dir
 from git_sim.settings import settings
 
 
@@ -49,11 +48,11 @@ class Clone(GitSimBaseCommand):
         if self.url == os.path.join(self.path, repo_name):
             print(f"git-sim error: Cannot clone into same path, please try again")
             sys.exit(1)
-        new_dir = os.path.join(tempfile.gettempdir(), "git_sim", repo_name)
+        new_dir = make_scratch_dir(repo_name)
 
         # Create local clone of local repo
         try:
-            self.repo = git.Repo.clone_from(self.url, new_dir, no_hardlinks=True)
+            self.repo = clone_scratch_repo(self.url, new_dir)
         except git.GitCommandError as e:
             print(
                 f"git-sim error: Invalid repo URL, please confirm repo URL and try again"
@@ -74,7 +73,7 @@ class Clone(GitSimBaseCommand):
         self.repo.git.clear_cache()
 
         # Delete the local clones
-        shutil.rmtree(new_dir, onerror=self.del_rw)
+        remove_scratch_dir(new_dir)
 
     def add_details(self, repo_name):
         text1 = m.Text(
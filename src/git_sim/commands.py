@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import pathlib
+
 import typer
 
-from typing import List, TYPE_CHECKING
+from typing import List, Optional, TYPE_CHECKING
 
 from git_sim.settings import settings
 from git_sim.enums import ResetMode, StashSubCommand, RemoteSubCommand
@@ -11,7 +13,7 @@ if TYPE_CHECKING:
     from manim import Scene
 
 
-def handle_animations(scene: Scene) -> None:
+def handle_animations(scene: Scene) -> Optional[str]:
     from git_sim.animations import handle_animations as _handle_animations
 
     with settings.font_context:
@@ -28,7 +30,28 @@ def add(
 
     settings.hide_first_tag = True
     scene = Add(files=files)
-    handle_animations(scene=scene)
+    return handle_animations(scene=scene)
+
+
+def batch(
+    ctx: typer.Context,
+    batch_file: pathlib.Path = typer.Argument(
+        ...,
+        help="File with one git-sim subcommand per line, or - to read from stdin",
+    ),
+    jobs: int = typer.Option(
+        1,
+        "--jobs",
+        "-j",
+        min=0,
+        help="Number of worker processes to render lines in parallel, 0 for one per CPU core",
+    ),
+):
+    """Simulate every subcommand listed in a file in a single process,
+    writing one image or video per line"""
+    from git_sim.batch import run_batch
+
+    return run_batch(ctx, batch_file, jobs)
 
 
 def branch(
@@ -40,7 +63,7 @@ def branch(
     from git_sim.branch import Branch
 
     scene = Branch(name=name)
-    handle_animations(scene=scene)
+    return handle_animations(scene=scene)
 
 
 def checkout(
@@ -57,7 +80,7 @@ def checkout(
     from git_sim.checkout import Checkout
 
     scene = Checkout(branch=branch, b=b)
-    handle_animations(scene=scene)
+    return handle_animations(scene=scene)
 
 
 def cherry_pick(
@@ -75,7 +98,22 @@ def cherry_pick(
     from git_sim.cherrypick import CherryPick
 
     scene = CherryPick(commit=commit, edit=edit)
-    handle_animations(scene=scene)
+    return handle_animations(scene=scene)
+
+
+def client(
+    ctx: typer.Context,
+    socket_path: pathlib.Path = typer.Option(
+        settings.server_socket,
+        "--socket",
+        help="Path of the Unix socket the git-sim server listens on",
+    ),
+):
+    """Forward a git-sim command line to a running `git-sim serve` process,
+    e.g. `git-sim client -d log`"""
+    from git_sim.server import forward
+
+    raise typer.Exit(forward(ctx.args, socket_path))
 
 
 def clean():
@@ -83,7 +121,7 @@ def clean():
 
     settings.hide_first_tag = True
     scene = Clean()
-    handle_animations(scene=scene)
+    return handle_animations(scene=scene)
 
 
 def clone(
@@ -99,7 +137,7 @@ def clone(
     from git_sim.clone import Clone
 
     scene = Clone(url=url, path=path)
-    handle_animations(scene=scene)
+    return handle_animations(scene=scene)
 
 
 def commit(
@@ -118,7 +156,7 @@ def commit(
 
     settings.hide_first_tag = True
     scene = Commit(message=message, amend=amend)
-    handle_animations(scene=scene)
+    return handle_animations(scene=scene)
 
 
 def config(
@@ -136,7 +174,7 @@ def config(
     from git_sim.config import Config
 
     scene = Config(l=l, settings=settings)
-    handle_animations(scene=scene)
+    return handle_animations(scene=scene)
 
 
 def fetch(
@@ -152,14 +190,42 @@ def fetch(
     from git_sim.fetch import Fetch
 
     scene = Fetch(remote=remote, branch=branch)
-    handle_animations(scene=scene)
+    return handle_animations(scene=scene)
+
+
+def gc(
+    max_age: float = typer.Option(
+        24,
+        "--max-age",
+        min=0,
+        help="Hours after which scratch dirs whose owner can't be checked are removed",
+    ),
+    dry_run: bool = typer.Option(
+        False,
+        "--dry-run",
+        help="List the scratch dirs and text cache entries that would be removed without removing them",
+    ),
+):
+    """Remove the scratch repos left behind by interrupted or crashed runs, and trim the text cache"""
+    from git_sim.scratch import collect_garbage
+    from git_sim.text_cache import prune
+
+    stale, size = collect_garbage(max_age=max_age * 60 * 60, dry_run=dry_run)
+    for path in stale:
+        print(path)
+    entries, entries_size = prune(dry_run=dry_run)
+    print(
+        f"git-sim gc: {'would remove' if dry_run else 'removed'} {len(stale)} "
+        f"scratch dirs, {size / 1024 / 1024:.1f} MB, and {len(entries)} text "
+        f"cache entries, {entries_size / 1024 / 1024:.1f} MB"
+    )
 
 
 def init():
     from git_sim.init import Init
 
     scene = Init()
-    handle_animations(scene=scene)
+    return handle_animations(scene=scene)
 
 
 def log(
@@ -178,7 +244,7 @@ def log(
     from git_sim.log import Log
 
     scene = Log(ctx=ctx, n=n, all=all)
-    handle_animations(scene=scene)
+    return handle_animations(scene=scene)
 
 
 def merge(
@@ -201,7 +267,7 @@ def merge(
     from git_sim.merge import Merge
 
     scene = Merge(branch=branch, no_ff=no_ff, message=message)
-    handle_animations(scene=scene)
+    return handle_animations(scene=scene)
 
 
 def mv(
@@ -218,7 +284,7 @@ def mv(
 
     settings.hide_first_tag = True
     scene = Mv(file=file, new_file=new_file)
-    handle_animations(scene=scene)
+    return handle_animations(scene=scene)
 
 
 def pull(
@@ -234,7 +300,7 @@ def pull(
     from git_sim.pull import Pull
 
     scene = Pull(remote=remote, branch=branch)
-    handle_animations(scene=scene)
+    return handle_animations(scene=scene)
 
 
 def push(
@@ -255,7 +321,7 @@ def push(
     from git_sim.push import Push
 
     scene = Push(remote=remote, branch=branch, set_upstream=set_upstream)
-    handle_animations(scene=scene)
+    return handle_animations(scene=scene)
 
 
 def rebase(
@@ -267,7 +333,7 @@ def rebase(
     from git_sim.rebase import Rebase
 
     scene = Rebase(branch=branch)
-    handle_animations(scene=scene)
+    return handle_animations(scene=scene)
 
 
 def remote(
@@ -287,7 +353,7 @@ def remote(
     from git_sim.remote import Remote
 
     scene = Remote(command=command, remote=remote, url_or_path=url_or_path)
-    handle_animations(scene=scene)
+    return handle_animations(scene=scene)
 
 
 def reset(
@@ -316,7 +382,7 @@ def reset(
 
     settings.hide_first_tag = True
     scene = Reset(commit=commit, mode=mode, soft=soft, mixed=mixed, hard=hard)
-    handle_animations(scene=scene)
+    return handle_animations(scene=scene)
 
 
 def restore(
@@ -334,7 +400,7 @@ def restore(
 
     settings.hide_first_tag = True
     scene = Restore(files=files, staged=staged)
-    handle_animations(scene=scene)
+    return handle_animations(scene=scene)
 
 
 def revert(
@@ -347,7 +413,7 @@ def revert(
 
     settings.hide_first_tag = True
     scene = Revert(commit=commit)
-    handle_animations(scene=scene)
+    return handle_animations(scene=scene)
 
 
 def rm(
@@ -360,7 +426,20 @@ def rm(
 
     settings.hide_first_tag = True
     scene = Rm(files=files)
-    handle_animations(scene=scene)
+    return handle_animations(scene=scene)
+
+
+def serve(
+    socket_path: pathlib.Path = typer.Option(
+        settings.server_socket,
+        "--socket",
+        help="Path of the Unix socket to listen on",
+    ),
+):
+    """Keep git-sim loaded and run commands sent with `git-sim client`"""
+    from git_sim.server import serve as _serve
+
+    _serve(socket_path)
 
 
 def stash(
@@ -381,7 +460,7 @@ def stash(
 
     settings.hide_first_tag = True
     scene = Stash(files=files, command=command, stash_index=stash_index)
-    handle_animations(scene=scene)
+    return handle_animations(scene=scene)
 
 
 def status():
@@ -391,7 +470,7 @@ def status():
     settings.allow_no_commits = True
 
     scene = Status()
-    handle_animations(scene=scene)
+    return handle_animations(scene=scene)
 
 
 def switch(
@@ -413,7 +492,7 @@ def switch(
     from git_sim.switch import Switch
 
     scene = Switch(branch=branch, c=c, detach=detach)
-    handle_animations(scene=scene)
+    return handle_animations(scene=scene)
 
 
 def tag(
@@ -434,4 +513,4 @@ def tag(
     from git_sim.tag import Tag
 
     scene = Tag(name=name, commit=commit, d=d)
-    handle_animations(scene=scene)
+    return handle_animations(scene=scene)
@@ -92,23 +92,13 @@ class Commit(GitSimBaseCommand):
         secondColumnArrowMap={},
         thirdColumnArrowMap={},
     ):
-        for x in self.repo.index.diff(None):
-            if "git-sim_media" not in x.a_path:
-                firstColumnFileNames.add(x.a_path)
-
-        if self.head_exists():
-            for y in self.repo.index.diff("HEAD"):
-                if "git-sim_media" not in y.a_path:
-                    secondColumnFileNames.add(y.a_path)
-                    thirdColumnFileNames.add(y.a_path)
-                    secondColumnArrowMap[y.a_path] = m.Arrow(
-                        stroke_width=3, color=self.fontColor
-                    )
-        else:
-            for y in self.repo.index.diff(None, staged=True):
-                if "git-sim_media" not in y.a_path:
-                    secondColumnFileNames.add(y.a_path)
-                    thirdColumnFileNames.add(y.a_path)
-                    secondColumnArrowMap[y.a_path] = m.Arrow(
-                        stroke_width=3, color=self.fontColor
-                    )
+        status = self.get_status()
+        for x in status.unstaged:
+            if "git-sim_media" not in x:
+                firstColumnFileNames.add(x)
+
+        for y in status.staged:
+            if "git-sim_media" not in y:
+                secondColumnFileNames.add(y)
+                thirdColumnFileNames.add(y)
+                secondColumnArrowMap[y] = m.Arrow(stroke_width=3, color=self.fontColor)
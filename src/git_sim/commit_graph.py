@@ -0,0 +1,244 @@
+import collections
+import os
+import string
+import tempfile
+
+import git
+
+Author = collections.namedtuple("Author", ["name"])
+
+HEX_DIGITS = set(string.hexdigits.lower())
+
+
+class CommitGraph:
+    """Store of the commits that parse_commits walks.
+
+    The hexsha, parents, summary line and author of each commit are kept in
+    columns, and persisted under .git/git-sim/ in append-only files bucketed
+    by the first two hex digits of the hexsha. Commits never change, so a
+    stored commit is never read from git again, and when refs move only the
+    new commits are read. A bucket is read the first time one of its commits
+    is looked up, so a run only reads the part of the store its view needs.
+
+    The ref tips of the last run are recorded next to the buckets. When refs
+    have moved since then, the commits that only the new tips reach are read
+    with one `git log` call, instead of one cat-file read each as the walk
+    reaches them.
+    """
+
+    def __init__(self, repo, path=None, persist=False):
+        self.repo = repo
+        self.path = path
+        self.persist = persist
+        self.rows = {}
+        self.hexshas = []
+        self.parents = []
+        self.summaries = []
+        self.authors = []
+        self.author_names = []
+        self.author_rows = {}
+        self.read_buckets = set()
+        self.missing = set()
+        self.commits = {}
+
+    def read_bucket(self, bucket):
+        self.read_buckets.add(bucket)
+        if not self.path:
+            return
+        try:
+            with open(
+                os.path.join(self.path, bucket), encoding="utf-8", newline="\n"
+            ) as f:
+                lines = f.read().split("\n")
+        except (OSError, ValueError):
+            return
+        # The last line is empty, or was cut short by an interrupted append
+        for line in lines[:-1]:
+            fields = line.split("\x1f")
+            if len(fields) != 4 or not fields[0].startswith(bucket):
+                continue
+            hexsha, parents, author, summary = fields
+            parents = parents.split()
+            if is_hexsha(hexsha) and all(is_hexsha(p) for p in parents):
+                self.add(hexsha, parents, author, summary)
+
+    def append(self, hexsha, parents, author, summary):
+        record = "\x1f".join(
+            [hexsha, " ".join(parents), clean_field(author), clean_field(summary)]
+        )
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            # One write per record, so concurrent runs don't interleave them
+            fd = os.open(
+                os.path.join(self.path, hexsha[:2]),
+                os.O_WRONLY | os.O_APPEND | os.O_CREAT,
+                0o644,
+            )
+            try:
+                os.write(fd, (record + "\n").encode("utf-8"))
+            finally:
+                os.close(fd)
+        except OSError:
+            # The store is only an optimization, e.g. .git may be read-only
+            pass
+
+    def read_tips(self):
+        try:
+            with open(os.path.join(self.path, "tips"), encoding="ascii") as f:
+                return {line for line in f.read().split() if is_hexsha(line)}
+        except (OSError, ValueError):
+            return set()
+
+    def write_tips(self, tips):
+        tmp_path = None
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            # Replace the file whole, so concurrent runs never read part of it
+            fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="ascii") as f:
+                f.write("".join(tip + "\n" for tip in sorted(tips)))
+            os.replace(tmp_path, os.path.join(self.path, "tips"))
+        except OSError:
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def update_tips(self, tips, limit):
+        """Store the commits reachable from the ref tips that moved since the
+        last run, and not from the tips recorded then, up to limit commits per
+        moved tip, and record the new tips. Commits past the limit are read
+        when the walk reaches them."""
+        tips = {tip for tip in tips if tip}
+        recorded = self.read_tips()
+        if tips == recorded:
+            return
+        moved = sorted(tips - recorded)
+        # A new store has nothing to compare with, so its commits are read as
+        # the walk needs them rather than reading the whole history
+        if recorded and moved:
+            self.load_range(moved, sorted(recorded), limit * len(moved))
+        self.write_tips(tips)
+
+    def load_range(self, revs, excluded, max_count):
+        try:
+            output = self.repo.git.log(
+                "-z",
+                "--format=%H%x1f%P%x1f%an%x1f%B",
+                f"--max-count={max_count}",
+                *revs,
+                "--not",
+                *excluded,
+                "--",
+            )
+        except git.exc.GitCommandError:
+            # e.g. a recorded tip was pruned since, the walk reads on demand
+            return
+        for record in output.split("\x00"):
+            fields = record.split("\x1f", 3)
+            if len(fields) != 4 or not is_hexsha(fields[0]):
+                continue
+            hexsha, parents, author, message = fields
+            if hexsha[:2] not in self.read_buckets:
+                self.read_bucket(hexsha[:2])
+            if hexsha not in self.rows:
+                summary = message.split("\n", 1)[0]
+                self.add(hexsha, parents.split(), author, summary)
+                self.append(hexsha, parents.split(), author, summary)
+
+    def add(self, hexsha, parents, author, summary):
+        if hexsha in self.rows:
+            return
+        if author not in self.author_rows:
+            self.author_rows[author] = len(self.author_names)
+            self.author_names.append(author)
+        self.rows[hexsha] = len(self.hexshas)
+        self.hexshas.append(hexsha)
+        self.parents.append(parents)
+        self.summaries.append(summary)
+        self.authors.append(self.author_rows[author])
+
+    def load(self, hexsha):
+        """Read one commit from the repo's object database, through
+        GitPython's persistent cat-file process, and add it to the store."""
+        try:
+            commit = self.repo.commit(hexsha)
+            parents = [parent.hexsha for parent in commit.parents]
+            author = commit.author.name
+            summary = commit.summary
+        except (ValueError, git.exc.BadName, git.exc.BadObject):
+            return False
+        if isinstance(summary, bytes):
+            summary = summary.decode("utf-8", "replace")
+        self.add(hexsha, parents, author, summary)
+        if self.persist:
+            self.append(hexsha, parents, author, summary)
+        return True
+
+    def get(self, hexsha):
+        """Return the GraphCommit for hexsha, loading it on a miss, or None
+        if the repo doesn't have that commit."""
+        if hexsha not in self.rows:
+            if hexsha in self.missing:
+                return None
+            if hexsha[:2] not in self.read_buckets:
+                self.read_bucket(hexsha[:2])
+            if hexsha not in self.rows and not self.load(hexsha):
+                self.missing.add(hexsha)
+                return None
+        if hexsha not in self.commits:
+            self.commits[hexsha] = GraphCommit(self, self.rows[hexsha])
+        return self.commits[hexsha]
+
+
+def is_hexsha(text):
+    return len(text) in (40, 64) and set(text) <= HEX_DIGITS
+
+
+def clean_field(text):
+    # Records are one line each, with fields separated by \x1f
+    return text.replace("\x1f", " ").replace("\r", " ").replace("\n", " ")
+
+
+class GraphCommit:
+    """Read-only stand-in for a GitPython Commit, backed by a CommitGraph row.
+    Only the message's summary line is available."""
+
+    __slots__ = ("graph", "row")
+
+    def __init__(self, graph, row):
+        self.graph = graph
+        self.row = row
+
+    @property
+    def hexsha(self):
+        return self.graph.hexshas[self.row]
+
+    @property
+    def binsha(self):
+        return bytes.fromhex(self.hexsha)
+
+    @property
+    def parents(self):
+        # Parents missing from the repo, e.g. past a shallow boundary, are skipped
+        parents = (self.graph.get(p) for p in self.graph.parents[self.row])
+        return tuple(p for p in parents if p is not None)
+
+    @property
+    def message(self):
+        return self.graph.summaries[self.row]
+
+    @property
+    def summary(self):
+        return self.graph.summaries[self.row]
+
+    @property
+    def author(self):
+        return Author(self.graph.author_names[self.graph.authors[self.row]])
+
+    def __eq__(self, other):
+        return getattr(other, "hexsha", None) == self.hexsha
+
+    def __hash__(self):
+        return hash(self.hexsha)
+
+    def __repr__(self):
+        return f'<git_sim.commit_graph.GraphCommit "{self.hexsha}">'
@@ -28,6 +28,14 @@ class VideoFormat(str, Enum):
 class ImgFormat(str, Enum):
     JPG = "jpg"
     PNG = "png"
+    SVG = "svg"
+    PDF = "pdf"
+
+
+class StreamFormat(str, Enum):
+    PNG = "png"
+    MJPEG = "mjpeg"
+    RGBA = "rgba"
 
 
 class StashSubCommand(Enum):
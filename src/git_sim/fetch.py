@@ -5,11 +5,10 @@ from argparse import Namespace
 import git
 import manim as m
 import numpy
-import tempfile
-import shutil
 import stat
 
 from git_sim.git_sim_base_command import GitSimBaseCommand
+from git_sim.scratch import clone_scratch_repo, make_scratch_dir, remove_scratch_dir
 from git_sim.settings import settings
 
 
@@ -39,10 +38,10 @@ class Fetch(GitSimBaseCommand):
 
         git_root = self.repo.git.rev_parse("--show-toplevel")
         repo_name = os.path.basename(self.repo.working_dir)
-        new_dir = os.path.join(tempfile.gettempdir(), "git_sim", repo_name)
+        new_dir = make_scratch_dir(repo_name)
 
         orig_remotes = self.repo.remotes
-        self.repo = git.Repo.clone_from(git_root, new_dir, no_hardlinks=True)
+        self.repo = clone_scratch_repo(git_root, new_dir)
         for r1 in orig_remotes:
             for r2 in self.repo.remotes:
                 if r1.name == r2.name:
@@ -58,13 +57,13 @@ class Fetch(GitSimBaseCommand):
         if self.branch not in self.repo.heads:
             start_parse_from_remote = True
         # fetched branch is ahead of local branch
-        elif (self.remote + "/" + self.branch) in self.repo.git.branch(
-            "-r", "--contains", self.branch
+        elif self.get_ancestry().is_ancestor(
+            self.branch, self.remote + "/" + self.branch
         ):
             start_parse_from_remote = True
         # fetched branch is behind local branch
-        elif self.branch in self.repo.git.branch(
-            "--contains", (self.remote + "/" + self.branch)
+        elif self.get_ancestry().is_ancestor(
+            self.remote + "/" + self.branch, self.branch
         ):
             start_parse_from_remote = False
         else:
@@ -83,4 +82,4 @@ class Fetch(GitSimBaseCommand):
         self.fadeout()
         self.show_outro()
         self.repo.git.clear_cache()
-        shutil.rmtree(new_dir, onerror=self.del_rw)
+        remove_scratch_dir(new_dir)
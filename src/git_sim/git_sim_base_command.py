@@ -1,24 +1,63 @@
+import contextlib
 import os
 import platform
-import shutil
 import stat
 import sys
-import tempfile
+from pathlib import Path
 
 import git
 import manim as m
 import numpy
 from git.exc import GitCommandError, InvalidGitRepositoryError
-from git.repo import Repo
+from manim.animation.animation import prepare_animation
 
+from git_sim.ancestry import Ancestry
+from git_sim.commit_graph import CommitGraph
 from git_sim.enums import ColorByOptions, StyleOptions
+from git_sim.layout import get_arrow_length, walk_commits
+from git_sim.output import claim_unique_path
+from git_sim.preview import PreviewFileWriter, get_preview_run_time
+from git_sim.profiling import instrument, is_running
+from git_sim.ref_index import RefIndex
+from git_sim.repos import get_shared_index, open_repo
+from git_sim.scratch import make_scratch_dir, remove_scratch_dir, sweep_in_background
 from git_sim.settings import settings
+from git_sim.spatial import CommitIndex
+from git_sim.stream import StreamingFileWriter
+from git_sim.text_cache import cached_text
+from git_sim.worktree_status import StatusSnapshot
 
 
 class GitSimBaseCommand(m.MovingCameraScene):
     def __init__(self):
-        super().__init__()
+        if is_running():
+            instrument(type(self))
+
+        # Streamed animations send each frame to stdout as it is rendered,
+        # previews are encoded as a single movie segment, and static images
+        # are drawn from the final scene state only
+        if not settings.animate:
+            renderer = StillRenderer(camera_class=m.MovingCamera, skip_animations=True)
+        elif settings.stream:
+            renderer = m.CairoRenderer(
+                file_writer_class=StreamingFileWriter,
+                camera_class=m.MovingCamera,
+                skip_animations=False,
+            )
+        elif settings.preview:
+            renderer = m.CairoRenderer(
+                file_writer_class=PreviewFileWriter,
+                camera_class=m.MovingCamera,
+                skip_animations=False,
+            )
+        else:
+            renderer = None
+
+        # Static images only need the final frame, so skip rendering animations
+        super().__init__(renderer=renderer, skip_animations=not settings.animate)
         self.cmd = "git "
+        self.animation_batch = None
+        self.snapshot_repo = None
         self.init_repo()
 
         self.font = settings.font
@@ -27,6 +66,12 @@ class GitSimBaseCommand(m.MovingCameraScene):
         self.drawnRefs = {}
         self.drawnRefsByCommit = {}
         self.drawnCommitIds = {}
+        self.expandedCommits = {}
+        self.ref_index = None
+        self.status_snapshot = None
+        self.ancestries = {}
+        self.commit_graphs = {}
+        self.commit_index = CommitIndex()
         self.toFadeOut = m.Group()
         self.prevRef = None
         self.topref = None
@@ -37,8 +82,7 @@ class GitSimBaseCommand(m.MovingCameraScene):
         self.n_dark_commits = 0
         self.selected_branches = []
         self.zone_title_offset = 2.6 if platform.system() == "Windows" else 2.6
-        self.arrow_map = []
-        self.arrows = []
+        self.arrow_map = set()
         self.all = settings.all
         self.first_parse = True
         self.author_groups = {}
@@ -79,22 +123,86 @@ class GitSimBaseCommand(m.MovingCameraScene):
 
     def init_repo(self):
         try:
-            self.repo = Repo(search_parent_directories=True)
-            repo_name = os.path.basename(self.repo.working_dir)
-            new_dir = os.path.join(tempfile.gettempdir(), "git_sim", repo_name)
-            new_dir2 = os.path.join(tempfile.gettempdir(), "git_sim", repo_name + "2")
-            try:
-                shutil.rmtree(new_dir, onerror=self.del_rw)
-            except FileNotFoundError:
-                pass
-            try:
-                shutil.rmtree(new_dir2, onerror=self.del_rw)
-            except FileNotFoundError:
-                pass
+            self.repo = open_repo()
+            self.snapshot_repo = self.repo
+            # Scratch clones are unique per run and deleted by the commands that
+            # make them, so only leftovers of interrupted runs need removing
+            sweep_in_background()
         except InvalidGitRepositoryError:
             print("git-sim error: No Git repository found at current path.")
             sys.exit(1)
 
+    def play(self, *args, **kwargs):
+        if self.animation_batch is not None:
+            animations = [prepare_animation(arg) for arg in args]
+            for animation in animations:
+                for key, value in kwargs.items():
+                    setattr(animation, key, value)
+            self.animation_batch.append(animations)
+            return
+
+        # Scene.wait() plays a Wait animation, so this shortens pauses too.
+        # Without a run_time argument, the play lasts as long as its longest
+        # animation
+        if settings.preview and settings.animate:
+            args = [prepare_animation(arg) for arg in args]
+            run_time = kwargs.get("run_time")
+            if run_time is None:
+                run_time = max(animation.run_time for animation in args)
+            kwargs["run_time"] = get_preview_run_time(run_time, self.renderer.time)
+        super().play(*args, **kwargs)
+
+    @contextlib.contextmanager
+    def batch_animations(self):
+        """Collect the play() calls made inside into one AnimationBatch that
+        is played on exit. The animations run in the same order and for as
+        long, and add their mobjects to the scene when they start, but manim
+        renders and encodes them as one segment instead of one partial movie
+        file per call. Only use it around code that doesn't read state that
+        the collected animations change."""
+        if not settings.animate or self.animation_batch is not None:
+            yield
+            return
+
+        self.animation_batch = []
+        try:
+            yield
+        finally:
+            batch, self.animation_batch = self.animation_batch, None
+        if batch:
+            self.play(AnimationBatch(batch))
+
+    def get_moving_mobjects(self, *animations):
+        # A batch isn't added to the scene itself, so look for the mobjects
+        # of the animations in it instead
+        expanded = []
+        for animation in animations:
+            if isinstance(animation, AnimationBatch):
+                expanded += [a for play in animation.plays for a in play]
+            else:
+                expanded.append(animation)
+        return super().get_moving_mobjects(*expanded)
+
+    def render(self, preview=False):
+        # Each run claims its own video file name and encodes its partial movie
+        # files in its own scratch dir, so concurrent runs don't overwrite or
+        # concatenate each other's output
+        file_writer = self.renderer.file_writer
+        if not hasattr(file_writer, "movie_file_path"):
+            return super().render(preview)
+
+        movie_file_path = claim_unique_path(str(file_writer.movie_file_path))
+        file_writer.movie_file_path = Path(movie_file_path)
+        partial_movie_dir = make_scratch_dir("partial_movie_files")
+        file_writer.partial_movie_directory = Path(partial_movie_dir)
+        try:
+            return super().render(preview)
+        finally:
+            remove_scratch_dir(partial_movie_dir)
+            # Give the name back if the run ended before writing the video
+            if os.path.exists(movie_file_path) and not os.path.getsize(movie_file_path):
+                os.remove(movie_file_path)
+
     def construct(self):
         print(f"{settings.INFO_STRING} {type(self).__name__.lower()}")
         self.show_intro()
@@ -126,64 +234,65 @@ class GitSimBaseCommand(m.MovingCameraScene):
 
         commit = commit or self.get_commit()
 
-        if commit != "dark":
-            isNewCommit = commit.hexsha not in self.drawnCommits
-        else:
-            isNewCommit = True
-
-        if i < self.n:
-            commitId, circle, arrow, hide_refs = self.draw_commit(
-                commit, i, prevCircle, shift
-            )
-
-            if commit != "dark":
-                if not hide_refs and isNewCommit:
-                    self.draw_head(commit, i, commitId)
-                    self.draw_branch(
-                        commit, i, make_branches_remote=make_branches_remote
-                    )
-                    self.draw_tag(commit, i)
-                if (
-                    not isinstance(arrow, m.CurvedArrow)
-                    and [arrow.start.tolist(), arrow.end.tolist()] not in self.arrow_map
-                ):
-                    self.draw_arrow(prevCircle, arrow)
-                    self.arrow_map.append([arrow.start.tolist(), arrow.end.tolist()])
-                elif (
-                    isinstance(arrow, m.CurvedArrow)
-                    and [arrow.get_start().tolist(), arrow.get_end().tolist()]
-                    not in self.arrow_map
-                ):
-                    self.draw_arrow(prevCircle, arrow)
-                    self.arrow_map.append(
-                        [arrow.get_start().tolist(), arrow.get_end().tolist()]
+        # Every position is decided before any mobject is created, then the
+        # commits are drawn in walk order at their final positions
+        layout = self.layout_commits(commit, i, prevCircle, shift, make_branches_remote)
+        startCircle = prevCircle
+        circles = []
+        for row, commit in enumerate(layout.commits):
+            # Each commit's animations are played and encoded as one segment
+            with self.batch_animations():
+                i = layout.depths[row]
+                prev_row = layout.prev_rows[row]
+                prevCircle = circles[prev_row] if prev_row >= 0 else startCircle
+                isNewCommit = layout.is_new[row]
+
+                if isNewCommit:
+                    commitId, circle, hide_refs = self.draw_commit(
+                        commit, i, layout.centers[row]
                     )
-                if i == 0 and len(self.drawnRefs) < 2:
-                    self.draw_dark_ref()
-
-            self.first_parse = False
-            i += 1
-            try:
-                commitParents = list(commit.parents)
-            except AttributeError:
-                if (len(self.drawnCommits) + self.n_dark_commits) < self.n_default:
-                    self.n_dark_commits += 1
-                    self.parse_commits(self.create_dark_commit(), i, circle)
-                return
-
-            if len(commitParents) > 0:
-                if settings.invert_branches:
-                    commitParents.reverse()
-
-                if settings.hide_merged_branches:
-                    self.parse_commits(commitParents[0], i, circle)
                 else:
-                    for p in range(len(commitParents)):
-                        self.parse_commits(commitParents[p], i, circle)
-            else:
-                if (len(self.drawnCommits) + self.n_dark_commits) < self.n_default:
-                    self.n_dark_commits += 1
-                    self.parse_commits(self.create_dark_commit(), i, circle)
+                    circle = self.drawnCommits[commit.hexsha]
+                circles.append(circle)
+
+                if commit != "dark":
+                    if isNewCommit and not hide_refs:
+                        self.draw_head(commit, i, commitId)
+                        self.draw_branch(
+                            commit, i, make_branches_remote=layout.remote[row]
+                        )
+                        self.draw_tag(commit, i)
+
+                    start, end = layout.starts[row], layout.ends[row]
+                    curved = bool(layout.curved[row])
+                    key = (tuple(start.tolist()), tuple(end.tolist()), curved)
+                    if key not in self.arrow_map:
+                        self.arrow_map.add(key)
+                        if prevCircle:
+                            self.draw_arrow(
+                                prevCircle, self.build_arrow(start, end, curved)
+                            )
+                    if i == 0 and len(self.drawnRefs) < 2:
+                        self.draw_dark_ref()
+
+                self.first_parse = False
+
+    def layout_commits(
+        self,
+        commit,
+        i=0,
+        prevCircle=None,
+        shift=numpy.array([0.0, 0.0, 0.0]),
+        make_branches_remote=False,
+    ):
+        """Walk the history from commit and compute where every commit and
+        arrow goes, without creating any mobjects. See walk_commits."""
+        prev_center = prevCircle.get_center() if prevCircle else None
+        return walk_commits(self, commit, i, prev_center, shift, make_branches_remote)
+
+    def get_drawn_commit(self, commit, i):
+        """The commit that is drawn for commit at depth i of the walk."""
+        return commit
 
     def parse_all(self):
         if self.all:
@@ -194,7 +303,7 @@ class GitSimBaseCommand(m.MovingCameraScene):
         if settings.animate and settings.show_intro:
             self.add(self.logo)
 
-            initialCommitText = m.Text(
+            initialCommitText = cached_text(
                 settings.title,
                 font=self.font,
                 font_size=36,
@@ -222,7 +331,7 @@ class GitSimBaseCommand(m.MovingCameraScene):
 
             self.play(self.logo.animate.scale(4).set_x(0).set_y(0))
 
-            outroTopText = m.Text(
+            outroTopText = cached_text(
                 settings.outro_top_text,
                 font=self.font,
                 font_size=36,
@@ -230,7 +339,7 @@ class GitSimBaseCommand(m.MovingCameraScene):
             ).to_edge(m.UP, buff=1)
             self.play(m.AddTextLetterByLetter(outroTopText))
 
-            outroBottomText = m.Text(
+            outroBottomText = cached_text(
                 settings.outro_bottom_text,
                 font=self.font,
                 font_size=36,
@@ -247,13 +356,7 @@ class GitSimBaseCommand(m.MovingCameraScene):
         else:
             self.wait(0.1)
 
-    def get_centers(self):
-        centers = []
-        for commit in self.drawnCommits.values():
-            centers.append(commit.get_center())
-        return centers
-
-    def draw_commit(self, commit, i, prevCircle, shift=numpy.array([0.0, 0.0, 0.0])):
+    def draw_commit(self, commit, i, center):
         if commit == "dark":
             commit_fill = m.WHITE if settings.light_mode else m.BLACK
         elif len(commit.parents) <= 1:
@@ -268,76 +371,7 @@ class GitSimBaseCommand(m.MovingCameraScene):
             fill_opacity=self.fill_opacity,
         )
         circle.height = 1
-
-        if shift.any():
-            circle.shift(shift)
-
-        if prevCircle:
-            circle.next_to(
-                prevCircle, m.RIGHT if settings.reverse else m.LEFT, buff=1.5
-            )
-
-        while any((circle.get_center() == c).all() for c in self.get_centers()):
-            circle.shift(m.DOWN * 4)
-
-        if commit != "dark":
-            isNewCommit = commit.hexsha not in self.drawnCommits
-        else:
-            isNewCommit = True
-
-        if isNewCommit:
-            start = (
-                prevCircle.get_center()
-                if prevCircle
-                else (m.LEFT if settings.reverse else m.RIGHT)
-            )
-            end = circle.get_center()
-        else:
-            circle.move_to(self.drawnCommits[commit.hexsha].get_center())
-            start = (
-                prevCircle.get_center()
-                if prevCircle
-                else (m.LEFT if settings.reverse else m.RIGHT)
-            )
-            end = self.drawnCommits[commit.hexsha].get_center()
-
-        arrow = m.Arrow(
-            start,
-            end,
-            color=self.fontColor,
-            stroke_width=self.arrow_stroke_width,
-            tip_shape=self.arrow_tip_shape,
-            max_stroke_width_to_length_ratio=1000,
-        )
-
-        if commit == "dark":
-            arrow = m.Arrow(
-                start, end, color=m.WHITE if settings.light_mode else m.BLACK
-            )
-
-        length = numpy.linalg.norm(start - end) - (1.5 if start[1] == end[1] else 3)
-        arrow.set_length(length)
-        angle = arrow.get_angle()
-        lineRect = (
-            m.Rectangle(height=0.1, width=length, color="#123456")
-            .move_to(arrow.get_center())
-            .rotate(angle)
-        )
-
-        for commitCircle in self.drawnCommits.values():
-            inter = m.Intersection(lineRect, commitCircle)
-            if inter.has_points():
-                arrow = m.CurvedArrow(
-                    start,
-                    end,
-                    color=self.fontColor,
-                    stroke_width=self.arrow_stroke_width,
-                    tip_shape=self.arrow_tip_shape,
-                )
-                if start[1] == end[1]:
-                    arrow.shift(m.UP * 1.25)
-                if start[0] < end[0] and start[1] == end[1]:
-                    arrow.flip(m.RIGHT).shift(m.UP)
+        circle.move_to(center)
 
         commitId, commitMessage, commit, hide_refs = self.build_commit_id_and_message(
             commit, i
@@ -347,7 +381,7 @@ class GitSimBaseCommand(m.MovingCameraScene):
         if commit != "dark":
             self.drawnCommitIds[commit.hexsha] = commitId
 
-        message = m.Text(
+        message = cached_text(
             "\n".join(
                 commitMessage[j : j + 20] for j in range(0, len(commitMessage), 20)
             )[:100],
@@ -360,34 +394,25 @@ class GitSimBaseCommand(m.MovingCameraScene):
             else m.NORMAL,
         ).next_to(circle, m.DOWN)
 
-        if settings.animate and commit != "dark" and isNewCommit:
+        if settings.animate and commit != "dark":
             self.play(
                 self.camera.frame.animate.move_to(circle.get_center()),
                 m.Create(circle),
-                m.Text("")
+                cached_text("")
                 if settings.highlight_commit_messages
                 else m.AddTextLetterByLetter(commitId),
                 m.AddTextLetterByLetter(message),
                 run_time=1 / settings.speed,
             )
-        elif isNewCommit:
-            self.add(
-                circle,
-                m.Text("") if settings.highlight_commit_messages else commitId,
-                message,
-            )
+        elif settings.highlight_commit_messages:
+            self.add(circle, message)
         else:
-            return (
-                m.Text("") if settings.highlight_commit_messages else commitId,
-                circle,
-                arrow,
-                hide_refs,
-            )
+            self.add(circle, commitId, message)
 
         if commit != "dark":
+            # The layout pass has already added the circle to the commit index
             self.drawnCommits[commit.hexsha] = circle
-            group = m.Group(circle, commitId, message)
-            self.add_group_to_author_groups(commit.author.name, group)
+            self.add_to_author_groups(commit.author.name, circle)
 
         self.toFadeOut.add(circle, commitId, message)
         if settings.highlight_commit_messages:
@@ -395,7 +420,34 @@ class GitSimBaseCommand(m.MovingCameraScene):
         else:
             self.prevRef = commitId
 
-        return commitId, circle, arrow, hide_refs
+        return commitId, circle, hide_refs
+
+    def build_arrow(self, start, end, curved=False):
+        if not curved:
+            arrow = m.Arrow(
+                start,
+                end,
+                color=self.fontColor,
+                stroke_width=self.arrow_stroke_width,
+                tip_shape=self.arrow_tip_shape,
+                max_stroke_width_to_length_ratio=1000,
+            )
+            arrow.set_length(get_arrow_length(start, end))
+            return arrow
+
+        # Curve the arrow if a straight one would run through another commit
+        arrow = m.CurvedArrow(
+            start,
+            end,
+            color=self.fontColor,
+            stroke_width=self.arrow_stroke_width,
+            tip_shape=self.arrow_tip_shape,
+        )
+        if start[1] == end[1]:
+            arrow.shift(m.UP * 1.25)
+        if start[0] < end[0] and start[1] == end[1]:
+            arrow.flip(m.RIGHT).shift(m.UP)
+        return arrow
 
     def get_nonparent_branch_names(self):
         branches = [b for b in self.repo.heads if not b.name.startswith("remotes/")]
@@ -403,14 +455,16 @@ class GitSimBaseCommand(m.MovingCameraScene):
         for b1 in branches:
             for b2 in branches:
                 if b1.name != b2.name:
-                    if self.repo.is_ancestor(b1.commit, b2.commit):
+                    if self.get_ancestry().is_ancestor(
+                        b1.commit.hexsha, b2.commit.hexsha
+                    ):
                         exclude.append(b1.name)
         return [b for b in branches if b.name not in exclude]
 
     def build_commit_id_and_message(self, commit, i):
         hide_refs = False
         if commit == "dark":
-            commitId = m.Text(
+            commitId = cached_text(
                 "",
                 font=self.font,
                 font_size=20,
@@ -419,7 +473,7 @@ class GitSimBaseCommand(m.MovingCameraScene):
             )
             commitMessage = ""
         else:
-            commitId = m.Text(
+            commitId = cached_text(
                 commit.hexsha[0:6],
                 font=self.font,
                 font_size=20,
@@ -430,7 +484,7 @@ class GitSimBaseCommand(m.MovingCameraScene):
         return commitId, commitMessage, commit, hide_refs
 
     def draw_head(self, commit, i, commitId):
-        if commit.hexsha == self.repo.head.commit.hexsha:
+        if commit.hexsha == self.get_ref_index().head:
             headbox = m.Rectangle(
                 color=m.BLUE, fill_color=m.BLUE, fill_opacity=self.ref_fill_opacity
             )
@@ -440,7 +494,7 @@ class GitSimBaseCommand(m.MovingCameraScene):
                 headbox.next_to(self.drawnCommits[commit.hexsha], m.UP)
             else:
                 headbox.next_to(commitId, m.UP)
-            headText = m.Text(
+            headText = cached_text(
                 "HEAD",
                 font=self.font,
                 font_size=20,
@@ -468,17 +522,16 @@ class GitSimBaseCommand(m.MovingCameraScene):
 
         remote_tracking_branches = self.get_remote_tracking_branches()
 
-        branches = [branch.name for branch in self.repo.heads] + list(
-            remote_tracking_branches.keys()
-        )
+        branches = self.get_ref_index().get_branches(commit.hexsha)
 
         for selected_branch in self.selected_branches:
-            branches.insert(0, branches.pop(branches.index(selected_branch)))
+            if selected_branch in branches:
+                branches.insert(0, branches.pop(branches.index(selected_branch)))
 
         for branch in branches:
             if (
                 branch not in remote_tracking_branches  # local branch
-                and commit.hexsha == self.repo.heads[branch].commit.hexsha
+                and commit.hexsha == self.get_ref_index().heads[branch]
             ) or (
                 branch in remote_tracking_branches  # remote tracking branch
                 and commit.hexsha == remote_tracking_branches[branch]
@@ -489,7 +542,7 @@ class GitSimBaseCommand(m.MovingCameraScene):
                     else branch
                 )
 
-                branchText = m.Text(
+                branchText = cached_text(
                     text,
                     font=self.font,
                     font_size=20,
@@ -533,51 +586,47 @@ class GitSimBaseCommand(m.MovingCameraScene):
         if self.hide_first_tag and i == 0:
             return
 
-        for tag in self.repo.tags:
-            try:
-                if commit.hexsha == tag.commit.hexsha:
-                    tagText = m.Text(
-                        tag.name,
-                        font=self.font,
-                        font_size=20,
-                        color=self.fontColor,
-                        weight=self.font_weight,
-                    )
-                    tagRec = m.Rectangle(
-                        color=m.YELLOW,
-                        fill_color=m.YELLOW,
-                        fill_opacity=self.ref_fill_opacity,
-                        height=0.4,
-                        width=tagText.width + 0.25,
-                    )
+        for tag in self.get_ref_index().get_tags(commit.hexsha):
+            tagText = cached_text(
+                tag,
+                font=self.font,
+                font_size=20,
+                color=self.fontColor,
+                weight=self.font_weight,
+            )
+            tagRec = m.Rectangle(
+                color=m.YELLOW,
+                fill_color=m.YELLOW,
+                fill_opacity=self.ref_fill_opacity,
+                height=0.4,
+                width=tagText.width + 0.25,
+            )
 
-                    tagRec.next_to(self.prevRef, m.UP)
-                    tagText.move_to(tagRec.get_center())
+            tagRec.next_to(self.prevRef, m.UP)
+            tagText.move_to(tagRec.get_center())
 
-                    fulltag = m.VGroup(tagRec, tagText)
+            fulltag = m.VGroup(tagRec, tagText)
 
-                    self.prevRef = tagRec
+            self.prevRef = tagRec
 
-                    if settings.animate:
-                        self.play(
-                            m.Create(fulltag),
-                            run_time=1 / settings.speed,
-                        )
-                    else:
-                        self.add(fulltag)
+            if settings.animate:
+                self.play(
+                    m.Create(fulltag),
+                    run_time=1 / settings.speed,
+                )
+            else:
+                self.add(fulltag)
 
-                    self.toFadeOut.add(fulltag)
-                    self.drawnRefs[tag.name] = fulltag
-                    self.add_ref_to_drawn_refs_by_commit(commit.hexsha, fulltag)
+            self.toFadeOut.add(fulltag)
+            self.drawnRefs[tag] = fulltag
+            self.add_ref_to_drawn_refs_by_commit(commit.hexsha, fulltag)
 
-                    if i == 0 and self.first_parse:
-                        self.topref = self.prevRef
+            if i == 0 and self.first_parse:
+                self.topref = self.prevRef
 
-                    x += 1
-                    if x >= settings.max_tags_per_commit:
-                        return
-            except ValueError:
-                pass
+            x += 1
+            if x >= settings.max_tags_per_commit:
+                return
 
     def draw_arrow(self, prevCircle, arrow):
         if prevCircle:
@@ -586,7 +635,6 @@ class GitSimBaseCommand(m.MovingCameraScene):
             else:
                 self.add(arrow)
 
-            self.arrows.append(arrow)
             self.toFadeOut.add(arrow)
 
     def recenter_frame(self):
@@ -707,7 +755,7 @@ class GitSimBaseCommand(m.MovingCameraScene):
 
         title_v_shift = abs(horizontal2.get_start()[1] - horizontal.get_start()[1]) / 2
         firstColumnTitle = (
-            m.Text(
+            cached_text(
                 first_column_name,
                 font=self.font,
                 font_size=28,
@@ -718,7 +766,7 @@ class GitSimBaseCommand(m.MovingCameraScene):
             .shift(m.DOWN * title_v_shift)
         )
         secondColumnTitle = (
-            m.Text(
+            cached_text(
                 second_column_name,
                 font=self.font,
                 font_size=28,
@@ -729,7 +777,7 @@ class GitSimBaseCommand(m.MovingCameraScene):
             .align_to(firstColumnTitle, m.UP)
         )
         thirdColumnTitle = (
-            m.Text(
+            cached_text(
                 third_column_name,
                 font=self.font,
                 font_size=28,
@@ -812,95 +860,97 @@ class GitSimBaseCommand(m.MovingCameraScene):
             horizontal2,
         )
 
-        if len(firstColumnFiles):
-            if settings.animate:
-                self.play(*[m.AddTextLetterByLetter(d) for d in firstColumnFiles])
-            else:
-                self.add(*[d for d in firstColumnFiles])
+        # The file names and arrows are played and encoded as one segment
+        with self.batch_animations():
+            if len(firstColumnFiles):
+                if settings.animate:
+                    self.play(*[m.AddTextLetterByLetter(d) for d in firstColumnFiles])
+                else:
+                    self.add(*[d for d in firstColumnFiles])
 
-        if len(secondColumnFiles):
-            if settings.animate:
-                self.play(*[m.AddTextLetterByLetter(w) for w in secondColumnFiles])
-            else:
-                self.add(*[w for w in secondColumnFiles])
+            if len(secondColumnFiles):
+                if settings.animate:
+                    self.play(*[m.AddTextLetterByLetter(w) for w in secondColumnFiles])
+                else:
+                    self.add(*[w for w in secondColumnFiles])
 
-        if len(thirdColumnFiles):
-            if settings.animate:
-                self.play(*[m.AddTextLetterByLetter(s) for s in thirdColumnFiles])
-            else:
-                self.add(*[s for s in thirdColumnFiles])
+            if len(thirdColumnFiles):
+                if settings.animate:
+                    self.play(*[m.AddTextLetterByLetter(s) for s in thirdColumnFiles])
+                else:
+                    self.add(*[s for s in thirdColumnFiles])
+
+            for filename in firstColumnArrowMap:
+                if reverse:
+                    firstColumnArrowMap[filename].put_start_and_end_on(
+                        (
+                            firstColumnFilesDict[filename].get_right()[0] + 0.25,
+                            firstColumnFilesDict[filename].get_right()[1],
+                            0,
+                        ),
+                        (
+                            secondColumnFilesDict[filename].get_left()[0] - 0.25,
+                            secondColumnFilesDict[filename].get_left()[1],
+                            0,
+                        ),
+                    )
+                else:
+                    firstColumnArrowMap[filename].put_start_and_end_on(
+                        (
+                            firstColumnFilesDict[filename].get_right()[0] + 0.25,
+                            firstColumnFilesDict[filename].get_right()[1],
+                            0,
+                        ),
+                        (
+                            thirdColumnFilesDict[filename].get_left()[0] - 0.25,
+                            thirdColumnFilesDict[filename].get_left()[1],
+                            0,
+                        ),
+                    )
+                if settings.animate:
+                    self.play(m.Create(firstColumnArrowMap[filename]))
+                else:
+                    self.add(firstColumnArrowMap[filename])
+                self.toFadeOut.add(firstColumnArrowMap[filename])
 
-        for filename in firstColumnArrowMap:
-            if reverse:
-                firstColumnArrowMap[filename].put_start_and_end_on(
+            for filename in secondColumnArrowMap:
+                secondColumnArrowMap[filename].put_start_and_end_on(
                     (
-                        firstColumnFilesDict[filename].get_right()[0] + 0.25,
-                        firstColumnFilesDict[filename].get_right()[1],
+                        secondColumnFilesDict[filename].get_right()[0] + 0.25,
+                        secondColumnFilesDict[filename].get_right()[1],
                         0,
                     ),
                     (
-                        secondColumnFilesDict[filename].get_left()[0] - 0.25,
-                        secondColumnFilesDict[filename].get_left()[1],
+                        thirdColumnFilesDict[filename].get_left()[0] - 0.25,
+                        thirdColumnFilesDict[filename].get_left()[1],
                         0,
                     ),
                 )
-            else:
-                firstColumnArrowMap[filename].put_start_and_end_on(
+                if settings.animate:
+                    self.play(m.Create(secondColumnArrowMap[filename]))
+                else:
+                    self.add(secondColumnArrowMap[filename])
+                self.toFadeOut.add(secondColumnArrowMap[filename])
+
+            for filename in thirdColumnArrowMap:
+                thirdColumnArrowMap[filename].put_start_and_end_on(
                     (
-                        firstColumnFilesDict[filename].get_right()[0] + 0.25,
-                        firstColumnFilesDict[filename].get_right()[1],
+                        thirdColumnFilesDict[filename].get_left()[0] - 0.25,
+                        thirdColumnFilesDict[filename].get_left()[1],
                         0,
                     ),
                     (
-                        thirdColumnFilesDict[filename].get_left()[0] - 0.25,
-                        thirdColumnFilesDict[filename].get_left()[1],
+                        firstColumnFilesDict[filename].get_right()[0] + 0.25,
+                        firstColumnFilesDict[filename].get_right()[1],
                         0,
                     ),
                 )
-            if settings.animate:
-                self.play(m.Create(firstColumnArrowMap[filename]))
-            else:
-                self.add(firstColumnArrowMap[filename])
-            self.toFadeOut.add(firstColumnArrowMap[filename])
-
-        for filename in secondColumnArrowMap:
-            secondColumnArrowMap[filename].put_start_and_end_on(
-                (
-                    secondColumnFilesDict[filename].get_right()[0] + 0.25,
-                    secondColumnFilesDict[filename].get_right()[1],
-                    0,
-                ),
-                (
-                    thirdColumnFilesDict[filename].get_left()[0] - 0.25,
-                    thirdColumnFilesDict[filename].get_left()[1],
-                    0,
-                ),
-            )
-            if settings.animate:
-                self.play(m.Create(secondColumnArrowMap[filename]))
-            else:
-                self.add(secondColumnArrowMap[filename])
-            self.toFadeOut.add(secondColumnArrowMap[filename])
-
-        for filename in thirdColumnArrowMap:
-            thirdColumnArrowMap[filename].put_start_and_end_on(
-                (
-                    thirdColumnFilesDict[filename].get_left()[0] - 0.25,
-                    thirdColumnFilesDict[filename].get_left()[1],
-                    0,
-                ),
-                (
-                    firstColumnFilesDict[filename].get_right()[0] + 0.25,
-                    firstColumnFilesDict[filename].get_right()[1],
-                    0,
-                ),
-            )
 
-            if settings.animate:
-                self.play(m.Create(thirdColumnArrowMap[filename]))
-            else:
-                self.add(thirdColumnArrowMap[filename])
-            self.toFadeOut.add(thirdColumnArrowMap[filename])
+                if settings.animate:
+                    self.play(m.Create(thirdColumnArrowMap[filename]))
+                else:
+                    self.add(thirdColumnArrowMap[filename])
+                self.toFadeOut.add(thirdColumnArrowMap[filename])
 
         self.toFadeOut.add(firstColumnFiles, secondColumnFiles, thirdColumnFiles)
 
@@ -917,20 +967,16 @@ class GitSimBaseCommand(m.MovingCameraScene):
         secondColumnArrowMap={},
         thirdColumnArrowMap={},
     ):
-        for x in self.repo.index.diff(None):
-            if "git-sim_media" not in x.a_path:
-                secondColumnFileNames.add(x.a_path)
+        status = self.get_status()
+        for x in status.unstaged:
+            if "git-sim_media" not in x:
+                secondColumnFileNames.add(x)
 
-        try:
-            for y in self.repo.index.diff("HEAD"):
-                if "git-sim_media" not in y.a_path:
-                    thirdColumnFileNames.add(y.a_path)
-        except git.exc.BadName:
-            for (y, _stage), entry in self.repo.index.entries.items():
-                if "git-sim_media" not in y:
-                    thirdColumnFileNames.add(y)
-
-        for z in self.repo.untracked_files:
+        for y in status.staged:
+            if "git-sim_media" not in y:
+                thirdColumnFileNames.add(y)
+
+        for z in status.untracked:
             if "git-sim_media" not in z:
                 firstColumnFileNames.add(z)
 
@@ -1082,7 +1128,7 @@ class GitSimBaseCommand(m.MovingCameraScene):
             length = numpy.linalg.norm(start - end) - (1.5 if start[1] == end[1] else 3)
             arrow.set_length(length)
 
-        commitId = m.Text(
+        commitId = cached_text(
             "abcdef",
             font=self.font,
             font_size=20,
@@ -1092,7 +1138,7 @@ class GitSimBaseCommand(m.MovingCameraScene):
         self.toFadeOut.add(commitId)
 
         commitMessage = commitMessage.split("\n")[0][:40].replace("\n", " ")
-        message = m.Text(
+        message = cached_text(
             "\n".join(
                 commitMessage[j : j + 20] for j in range(0, len(commitMessage), 20)
             )[:100],
@@ -1115,7 +1161,7 @@ class GitSimBaseCommand(m.MovingCameraScene):
             self.camera.frame.move_to(circle.get_center())
             self.add(circle, commitId, message)
 
-        self.drawnCommits["abcdef"] = circle
+        self.add_drawn_commit("abcdef", circle)
         self.toFadeOut.add(circle)
 
         if draw_arrow and child != "dark":
@@ -1123,7 +1169,6 @@ class GitSimBaseCommand(m.MovingCameraScene):
                 self.play(m.Create(arrow), run_time=1 / settings.speed)
             else:
                 self.add(arrow)
-            self.arrows.append(arrow)
             self.toFadeOut.add(arrow)
 
         return commitId
@@ -1147,7 +1192,7 @@ class GitSimBaseCommand(m.MovingCameraScene):
         return nondark_commits
 
     def draw_ref(self, commit, top, i=0, text="HEAD", color=m.BLUE):
-        refText = m.Text(
+        refText = cached_text(
             text,
             font=self.font,
             font_size=20,
@@ -1197,13 +1242,43 @@ class GitSimBaseCommand(m.MovingCameraScene):
         return f"{path[:length]}..." if len(path) > (length + 3) else path
 
     def get_remote_tracking_branches(self):
-        remote_refs = [remote.refs for remote in self.repo.remotes]
-        remote_tracking_branches = {}
-        for reflist in remote_refs:
-            for ref in reflist:
-                if "HEAD" not in ref.name and ref.name not in remote_tracking_branches:
-                    remote_tracking_branches[ref.name] = ref.commit.hexsha
-        return remote_tracking_branches
+        return self.get_ref_index().remote_tracking_branches
+
+    def get_ref_index(self):
+        # Rebuild when a command swaps self.repo for a scratch clone
+        if self.ref_index is None or self.ref_index.repo is not self.repo:
+            self.ref_index = get_shared_index(self.repo, RefIndex)
+        return self.ref_index
+
+    def get_status(self):
+        # Rebuild when a command swaps self.repo for a scratch clone
+        if self.status_snapshot is None or self.status_snapshot.repo is not self.repo:
+            self.status_snapshot = get_shared_index(self.repo, StatusSnapshot)
+        return self.status_snapshot
+
+    def get_ancestry(self, repo=None):
+        repo = repo or self.repo
+        if repo.git_dir not in self.ancestries:
+            self.ancestries[repo.git_dir] = get_shared_index(repo, Ancestry)
+        return self.ancestries[repo.git_dir]
+
+    def get_commit_graph(self):
+        # Scratch clones read the snapshot of the repo they were cloned from,
+        # but only that repo's own graph is written back
+        if self.repo.git_dir not in self.commit_graphs:
+            path = None
+            if self.snapshot_repo is not None:
+                path = os.path.join(self.snapshot_repo.common_dir, "git-sim", "commits")
+            graph = CommitGraph(
+                self.repo, path, persist=self.repo is self.snapshot_repo
+            )
+            if graph.persist:
+                refs = self.get_ref_index()
+                tips = [refs.head, *refs.heads.values(), *refs.tags.values()]
+                tips += refs.remote_tracking_branches.values()
+                graph.update_tips(tips, self.n)
+            self.commit_graphs[self.repo.git_dir] = graph
+        return self.commit_graphs[self.repo.git_dir]
 
     def create_zone_text(
         self,
@@ -1223,7 +1298,7 @@ class GitSimBaseCommand(m.MovingCameraScene):
     ):
         for i, f in enumerate(firstColumnFileNames):
             text = (
-                m.Text(
+                cached_text(
                     self.trim_path(f),
                     font=self.font,
                     font_size=24,
@@ -1239,7 +1314,7 @@ class GitSimBaseCommand(m.MovingCameraScene):
 
         for j, f in enumerate(secondColumnFileNames):
             text = (
-                m.Text(
+                cached_text(
                     self.trim_path(f),
                     font=self.font,
                     font_size=24,
@@ -1255,7 +1330,7 @@ class GitSimBaseCommand(m.MovingCameraScene):
 
         for h, f in enumerate(thirdColumnFileNames):
             text = (
-                m.Text(
+                cached_text(
                     self.trim_path(f),
                     font=self.font,
                     font_size=24,
@@ -1277,7 +1352,7 @@ class GitSimBaseCommand(m.MovingCameraScene):
                 reverse=True,
             )
             for i, author in enumerate(sorted_authors):
-                authorText = m.Text(
+                authorText = cached_text(
                     f"{author[:15]} ({str(len(self.author_groups[author]))})",
                     font=self.font,
                     font_size=36,
@@ -1295,8 +1370,8 @@ class GitSimBaseCommand(m.MovingCameraScene):
                     self.play(m.AddTextLetterByLetter(authorText))
                 else:
                     self.add(authorText)
-                for g in self.author_groups[author]:
-                    g[0].set_color(self.colors[int(i % 11)])
+                for circle in self.author_groups[author]:
+                    circle.set_color(self.colors[int(i % 11)])
             self.recenter_frame()
             self.scale_frame()
 
@@ -1312,18 +1387,19 @@ class GitSimBaseCommand(m.MovingCameraScene):
 
         elif settings.color_by == ColorByOptions.NOTLOCAL2:
             for commit_id in self.drawnCommits:
-                if not self.orig_repo.is_ancestor(commit_id, "HEAD"):
+                if not self.get_ancestry(self.orig_repo).is_ancestor(commit_id, "HEAD"):
                     self.drawnCommits[commit_id].set_color(m.GOLD)
 
-    def add_group_to_author_groups(self, author, group):
+    def add_to_author_groups(self, author, circle):
+        # Only the circles are recolored, so no group is made per commit
         if author not in self.author_groups:
-            self.author_groups[author] = [group]
+            self.author_groups[author] = [circle]
         else:
-            self.author_groups[author].append(group)
+            self.author_groups[author].append(circle)
 
     def show_command_as_title(self):
         if settings.show_command_as_title:
-            titleText = m.Text(
+            titleText = cached_text(
                 self.trim_cmd(self.cmd),
                 font=self.font,
                 font_size=36,
@@ -1367,6 +1443,10 @@ class GitSimBaseCommand(m.MovingCameraScene):
             return True
         return False
 
+    def add_drawn_commit(self, hexsha, circle):
+        self.drawnCommits[hexsha] = circle
+        self.commit_index.add(circle.get_center(), circle.width / 2)
+
     def add_ref_to_drawn_refs_by_commit(self, hexsha, ref):
         try:
             self.drawnRefsByCommit[hexsha].append(ref)
@@ -1376,6 +1456,42 @@ class GitSimBaseCommand(m.MovingCameraScene):
             ]
 
 
+class AnimationBatch(m.Succession):
+    """Succession of the animations of several play() calls, given as one
+    list of animations per call. Like play(), each call adds the mobjects of
+    its animations to the scene when it starts, and introducers like Create
+    add theirs as they begin, so nothing shows before it is animated."""
+
+    def __init__(self, plays, **kwargs):
+        self.plays = [[prepare_animation(a) for a in play] for play in plays]
+        super().__init__(
+            *[
+                m.AnimationGroup(*play) if len(play) > 1 else play[0]
+                for play in self.plays
+            ],
+            introducer=True,
+            **kwargs,
+        )
+        self.scene = None
+
+    def _setup_scene(self, scene):
+        self.scene = scene
+
+    def update_active_animation(self, index):
+        if self.scene is not None and index < len(self.plays):
+            self.scene.add_mobjects_from_animations(self.plays[index])
+        super().update_active_animation(index)
+
+
+class StillRenderer(m.CairoRenderer):
+    """Renderer for static images, which are drawn straight from the final
+    scene state once the command is done. Frames are never rasterized while
+    the scene is built."""
+
+    def update_frame(self, scene, *args, **kwargs):
+        pass
+
+
 class DottedLine(m.Line):
     def __init__(self, *args, dot_spacing=0.4, dot_kwargs={}, **kwargs):
         m.Line.__init__(self, *args, **kwargs)
@@ -0,0 +1,204 @@
+import numpy
+
+from git_sim.settings import settings
+
+# Commit circles are 1 unit wide with 1.5 units between a commit and its
+# child, and a commit whose slot is taken moves down by one lane
+COMMIT_RADIUS = 0.5
+COMMIT_SPACING = 2.5
+LANE_SPACING = 4.0
+ARROW_HALF_WIDTH = 0.05
+
+# Same as manim's direction constants, which this module doesn't import
+ORIGIN = numpy.array([0.0, 0.0, 0.0])
+LEFT = numpy.array([-1.0, 0.0, 0.0])
+RIGHT = numpy.array([1.0, 0.0, 0.0])
+DOWN = numpy.array([0.0, -1.0, 0.0])
+
+
+class CommitLayout:
+    """Positions of the commits and arrows of one walk of the commit graph.
+
+    Rows are commits in drawing order. prev_rows holds the row of the child
+    each commit was reached from, or -1. centers, starts and ends are (N, 3)
+    arrays, and curved flags the arrows that have to curve around a commit.
+    """
+
+    def __init__(self):
+        self.commits = []
+        self.depths = []
+        self.is_new = []
+        self.prev_rows = []
+        self.remote = []
+        self.centers = []
+        self.starts = []
+        self.ends = []
+        self.circle_counts = []
+        self.curved = None
+
+    def add(self, commit, i, is_new, prev_row, remote, center, start, circle_count):
+        self.commits.append(commit)
+        self.depths.append(i)
+        self.is_new.append(is_new)
+        self.prev_rows.append(prev_row)
+        self.remote.append(remote)
+        self.centers.append(center)
+        self.starts.append(start)
+        self.circle_counts.append(circle_count)
+
+    def finish(self, index):
+        """Convert the rows to arrays and flag curved arrows against the
+        circles in the CommitIndex."""
+        self.centers = numpy.array(self.centers, dtype=float).reshape(-1, 3)
+        self.starts = numpy.array(self.starts, dtype=float).reshape(-1, 3)
+        self.ends = self.centers
+        self.curved = find_curved_edges(
+            self.starts,
+            self.ends,
+            numpy.array(self.circle_counts, dtype=int),
+            index,
+        )
+
+
+def walk_commits(
+    scene, commit, i=0, prev_center=None, shift=ORIGIN, make_branches_remote=False
+):
+    """Walk the history from commit and compute where every commit and arrow
+    of the scene goes, without creating any mobjects.
+
+    The history is walked depth-first with an explicit stack, so large -n
+    values can't hit the recursion limit. Only the starting commit is
+    shifted and gets remote branch names. Positions of new commits are added
+    to the scene's commit index as they are decided, and a commit whose slot
+    is taken moves down a lane until it finds a free one.
+    """
+    layout = CommitLayout()
+    drawn = {h: c.get_center() for h, c in scene.drawnCommits.items()}
+    direction = RIGHT if settings.reverse else LEFT
+    default_start = LEFT if settings.reverse else RIGHT
+
+    stack = [(commit, i, -1, prev_center, shift, make_branches_remote)]
+    while stack:
+        commit, i, prev_row, prev_center, shift, remote = stack.pop()
+        if i >= scene.n:
+            continue
+
+        if commit != "dark":
+            commit = scene.get_commit_graph().get(commit.hexsha) or commit
+            isNewCommit = commit.hexsha not in drawn
+        else:
+            isNewCommit = True
+
+        if prev_center is not None:
+            center = prev_center + direction * COMMIT_SPACING
+        else:
+            center = numpy.array(shift, dtype=float)
+        while scene.commit_index.is_occupied(center):
+            center = center + DOWN * LANE_SPACING
+        if not isNewCommit:
+            center = drawn[commit.hexsha]
+
+        start = prev_center if prev_center is not None else default_start
+        layout.add(
+            commit,
+            i,
+            isNewCommit,
+            prev_row,
+            remote,
+            center,
+            start,
+            len(scene.commit_index.circles),
+        )
+        row = len(layout.commits) - 1
+        if isNewCommit and commit != "dark":
+            drawn_commit = scene.get_drawn_commit(commit, i)
+            drawn[drawn_commit.hexsha] = center
+            scene.commit_index.add(center, COMMIT_RADIUS)
+
+        i += 1
+        try:
+            commitParents = list(commit.parents)
+        except AttributeError:
+            if (len(drawn) + scene.n_dark_commits) < scene.n_default:
+                scene.n_dark_commits += 1
+                stack.append((scene.create_dark_commit(), i, row, center, None, False))
+            continue
+
+        # A commit that was already expanded with at least as many
+        # levels left has had its whole visible history laid out, so
+        # walking it again would only redraw the same sub-graph.
+        if scene.expandedCommits.get(commit.hexsha, -1) >= scene.n - i:
+            continue
+        scene.expandedCommits[commit.hexsha] = scene.n - i
+
+        if len(commitParents) > 0:
+            if settings.invert_branches:
+                commitParents.reverse()
+
+            if settings.hide_merged_branches:
+                commitParents = commitParents[:1]
+
+            for parent in reversed(commitParents):
+                stack.append((parent, i, row, center, None, False))
+        else:
+            if (len(drawn) + scene.n_dark_commits) < scene.n_default:
+                scene.n_dark_commits += 1
+                stack.append((scene.create_dark_commit(), i, row, center, None, False))
+
+    layout.finish(scene.commit_index)
+    return layout
+
+
+def get_arrow_length(start, end):
+    """Length that arrows between commits are set to, leaving room for the
+    circles at both ends."""
+    return numpy.linalg.norm(start - end) - (1.5 if start[1] == end[1] else 3)
+
+
+def find_curved_edges(starts, ends, circle_counts, index):
+    """Flag the edges whose straight arrow would run through a commit.
+
+    Each arrow is a bar of get_arrow_length() centered between its ends.
+    Edge k is only tested against the first circle_counts[k] circles of the
+    index, the ones that were drawn before its arrow, and only against those
+    in the grid cells around the arrow.
+    """
+    curved = numpy.zeros(len(starts), dtype=bool)
+    if not len(starts) or not index.circles:
+        return curved
+
+    vectors = ends[:, :2] - starts[:, :2]
+    distances = numpy.linalg.norm(vectors, axis=1)
+    lengths = distances - numpy.where(starts[:, 1] == ends[:, 1], 1.5, 3)
+    units = numpy.divide(
+        vectors,
+        distances[:, None],
+        out=numpy.zeros_like(vectors),
+        where=distances[:, None] > 0,
+    )
+    mids = (starts[:, :2] + ends[:, :2]) / 2
+    p0 = mids - units * lengths[:, None] / 2
+    p1 = p0 + units * lengths[:, None]
+
+    edges, candidates = index.find_candidates(
+        numpy.minimum(p0, p1), numpy.maximum(p0, p1), ARROW_HALF_WIDTH
+    )
+    drawn = candidates < circle_counts[edges]
+    edges, candidates = edges[drawn], candidates[drawn]
+    if not len(edges):
+        return curved
+
+    circles = numpy.array(index.circles, dtype=float)[candidates]
+    segments = (p1 - p0)[edges]
+    segments_sq = numpy.einsum("ij,ij->i", segments, segments)
+    offsets = circles[:, :2] - p0[edges]
+    t = numpy.divide(
+        numpy.einsum("ij,ij->i", offsets, segments),
+        segments_sq,
+        out=numpy.zeros(len(edges)),
+        where=segments_sq > 0,
+    ).clip(0, 1)
+    nearest = offsets - t[:, None] * segments
+    hits = numpy.linalg.norm(nearest, axis=1) < circles[:, 2] + ARROW_HALF_WIDTH
+    curved[edges[hits]] = True
+    return curved
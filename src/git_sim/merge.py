@@ -4,11 +4,10 @@ import os
 import git
 import manim as m
 import numpy
-import tempfile
-import shutil
 import stat
 
 from git_sim.git_sim_base_command import GitSimBaseCommand
+from git_sim.scratch import clone_scratch_repo, make_scratch_dir, remove_scratch_dir
 from git_sim.settings import settings
 
 
@@ -44,9 +43,7 @@ class Merge(GitSimBaseCommand):
         if not settings.stdout and not settings.output_only_path and not settings.quiet:
             print(f"{settings.INFO_STRING} {self.cmd}")
 
-        if self.repo.active_branch.name in self.repo.git.branch(
-            "--contains", self.branch
-        ):
+        if self.get_ancestry().is_ancestor(self.branch, self.repo.active_branch.name):
             print(
                 "git-sim error: Branch '"
                 + self.branch
@@ -60,14 +57,8 @@ class Merge(GitSimBaseCommand):
         head_commit = self.get_commit()
         branch_commit = self.get_commit(self.branch)
 
-        if self.branch not in self.get_remote_tracking_branches():
-            if self.branch in self.repo.git.branch("--contains", head_commit.hexsha):
-                self.ff = True
-        else:
-            if self.branch in self.repo.git.branch(
-                "-r", "--contains", head_commit.hexsha
-            ):
-                self.ff = True
+        if self.get_ancestry().is_ancestor(head_commit.hexsha, self.branch):
+            self.ff = True
 
         if self.ff:
             self.parse_commits(branch_commit)
@@ -160,18 +151,18 @@ class Merge(GitSimBaseCommand):
 
         # Delete the local clone
         try:
-            shutil.rmtree(new_dir, onerror=self.del_rw)
+            remove_scratch_dir(new_dir)
         except (FileNotFoundError, UnboundLocalError):
             pass
 
     def check_merge_conflict(self, branch1, branch2):
         git_root = self.repo.git.rev_parse("--show-toplevel")
         repo_name = os.path.basename(self.repo.working_dir)
-        new_dir = os.path.join(tempfile.gettempdir(), "git_sim", repo_name)
+        new_dir = make_scratch_dir(repo_name)
 
         orig_repo = self.repo
         orig_remotes = self.repo.remotes
-        self.repo = git.Repo.clone_from(git_root, new_dir, no_hardlinks=True)
+        self.repo = clone_scratch_repo(git_root, new_dir)
         self.repo.git.checkout(branch2)
         self.repo.git.checkout(branch1)
 
@@ -6,6 +6,7 @@ from typing import List
 
 from git_sim.git_sim_base_command import GitSimBaseCommand
 from git_sim.settings import settings
+from git_sim.text_cache import cached_text
 
 
 class Mv(GitSimBaseCommand):
@@ -59,7 +60,7 @@ class Mv(GitSimBaseCommand):
         secondColumnArrowMap={},
         thirdColumnArrowMap={},
     ):
-        if self.file in [x.a_path for x in self.repo.index.diff("HEAD")]:
+        if self.file in self.get_status().staged:
             secondColumnFileNames.add(self.file)
             secondColumnArrowMap[self.file] = m.Arrow(
                 stroke_width=3, color=self.fontColor
@@ -74,7 +75,7 @@ class Mv(GitSimBaseCommand):
 
     def rename_moved_file(self):
         for file in self.thirdColumnFiles:
-            new_file = m.Text(
+            new_file = cached_text(
                 self.trim_path(self.new_file),
                 font=self.font,
                 font_size=24,
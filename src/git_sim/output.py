@@ -0,0 +1,43 @@
+import datetime
+import os
+
+
+def get_timestamp():
+    """Creation time that output file names end with, down to the
+    millisecond so that runs started within the same second differ."""
+    now = datetime.datetime.now()
+    return now.strftime("%m-%d-%y_%H-%M-%S_") + f"{now.microsecond // 1000:03d}"
+
+
+def claim_unique_path(path):
+    """Create an empty file at path, or at path with a counter appended if a
+    file with that name exists, and return the path of the created file.
+
+    The file is created exclusively, so concurrent runs never claim the same
+    name and overwrite each other's output.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    root, ext = os.path.splitext(path)
+    i = 2
+    while True:
+        try:
+            with open(path, "x"):
+                return path
+        except FileExistsError:
+            path = f"{root}_{i}{ext}"
+            i += 1
+
+
+def claim_unique_dir(path):
+    """Create an empty directory at path, or at path with a counter appended
+    if that name is taken, and return its path."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    root = path
+    i = 2
+    while True:
+        try:
+            os.mkdir(path)
+            return path
+        except FileExistsError:
+            path = f"{root}_{i}"
+            i += 1
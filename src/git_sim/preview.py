@@ -0,0 +1,58 @@
+import manim
+from manim import config
+from manim.scene.scene_file_writer import SceneFileWriter
+
+# Fast previews are rendered small and choppy, with every animation and pause
+# shortened, and down to a single frame each once the frame budget is used up
+PREVIEW_PIXEL_WIDTH = 480
+PREVIEW_PIXEL_HEIGHT = 270
+PREVIEW_FRAME_RATE = 10
+PREVIEW_MAX_RUN_TIME = 0.3
+PREVIEW_FRAME_BUDGET = 300
+
+# manim 0.19 replaced the ffmpeg pipe of each partial movie file with a PyAV
+# stream
+MANIM_PYAV = tuple(int(part) for part in manim.__version__.split(".")[:2]) >= (0, 19)
+
+
+def configure_preview():
+    config.pixel_width = PREVIEW_PIXEL_WIDTH
+    config.pixel_height = PREVIEW_PIXEL_HEIGHT
+    config.frame_rate = PREVIEW_FRAME_RATE
+    # Every play call is written to the same movie stream, see PreviewFileWriter
+    config.disable_caching = True
+
+
+def get_preview_run_time(run_time, elapsed):
+    """Shorten an animation of run_time seconds that starts elapsed seconds
+    into the preview. Animations are never made longer."""
+    if elapsed * config.frame_rate >= PREVIEW_FRAME_BUDGET:
+        return min(run_time, 1 / config.frame_rate)
+    return min(run_time, PREVIEW_MAX_RUN_TIME)
+
+
+class PreviewFileWriter(SceneFileWriter):
+    """File writer that encodes all the animations of a scene as one movie
+    segment, instead of one partial movie file per play call that has to be
+    concatenated at the end."""
+
+    segment_file_path = None
+
+    def begin_animation(self, allow_write=False, *args, **kwargs):
+        if self.segment_file_path is None:
+            super().begin_animation(allow_write, *args, **kwargs)
+            # Only set once a segment was opened, plays that aren't written
+            # don't open one
+            self.segment_file_path = getattr(self, "partial_movie_file_path", None)
+
+    def end_animation(self, allow_write=False):
+        pass
+
+    def finish(self):
+        if self.segment_file_path is not None:
+            if MANIM_PYAV:
+                self.close_partial_movie_stream()
+            else:
+                self.close_movie_pipe()
+            self.partial_movie_files = [self.segment_file_path]
+        super().finish()
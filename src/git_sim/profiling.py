@@ -0,0 +1,220 @@
+import cProfile
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+from git_sim.settings import settings
+
+# Phase of each instrumented GitSimBaseCommand method, besides draw_* methods
+# which are all layout
+METHOD_PHASES = {
+    "init_repo": "repo",
+    "parse_commits": "parse",
+    "parse_all": "parse",
+    "layout_commits": "layout",
+    "build_arrow": "layout",
+    "recenter_frame": "layout",
+    "scale_frame": "layout",
+    "vsplit_frame": "layout",
+    "center_frame_on_commit": "layout",
+    "setup_and_draw_zones": "zones",
+    "populate_zones": "zones",
+}
+
+# Phase of each instrumented module level function or rendering method, as
+# (module, attribute path)
+RENDER_PHASES = {
+    ("git_sim.animations", "handle_animations"): "render",
+    ("git_sim.animations", "capture_final_frame"): "rasterize",
+    ("git_sim.tiles", "write_tiles"): "rasterize",
+    ("git_sim.vector", "write_vector_image"): "encode",
+    ("manim.renderer.cairo_renderer", "CairoRenderer.update_frame"): "rasterize",
+    ("cv2", "imwrite"): "encode",
+    ("manim.scene.scene_file_writer", "SceneFileWriter.write_frame"): "encode",
+    ("manim.scene.scene_file_writer", "SceneFileWriter.finish"): "encode",
+}
+
+_profile = None
+
+
+class Profile:
+    """Wall and CPU time spent in each phase and instrumented method.
+
+    Phase times are exclusive: time spent in a nested instrumented call is
+    counted towards the nested call's phase only, so the phases add up to
+    the total. Method times are inclusive.
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self.methods = {}
+        self.events = []
+        self.stack = []
+        self.pid = os.getpid()
+        self.cprofile = None
+        self.start_wall = time.perf_counter()
+        self.start_cpu = time.process_time()
+        self.total_wall = None
+        self.total_cpu = None
+
+    def enter(self, name, phase):
+        self.stack.append([name, phase, time.perf_counter(), time.process_time(), 0, 0])
+
+    def exit(self):
+        name, phase, start_wall, start_cpu, child_wall, child_cpu = self.stack.pop()
+        wall = time.perf_counter() - start_wall
+        cpu = time.process_time() - start_cpu
+        if self.stack:
+            self.stack[-1][4] += wall
+            self.stack[-1][5] += cpu
+
+        phase_times = self.phases.setdefault(phase, [0.0, 0.0])
+        phase_times[0] += wall - child_wall
+        phase_times[1] += cpu - child_cpu
+
+        # Count overrides calling super() and other recursive calls once
+        if not any(frame[0] == name for frame in self.stack):
+            method_times = self.methods.setdefault(name, [0, 0.0, 0.0])
+            method_times[0] += 1
+            method_times[1] += wall
+            method_times[2] += cpu
+
+        self.events.append(
+            {
+                "name": name,
+                "cat": phase,
+                "ph": "X",
+                "ts": (start_wall - self.start_wall) * 1e6,
+                "dur": wall * 1e6,
+                "pid": self.pid,
+                "tid": threading.get_ident(),
+            }
+        )
+
+    def stop(self):
+        self.total_wall = time.perf_counter() - self.start_wall
+        self.total_cpu = time.process_time() - self.start_cpu
+        if self.cprofile:
+            self.cprofile.disable()
+
+    def format_summary(self):
+        total_wall = self.total_wall or 0.0
+        total_cpu = self.total_cpu or 0.0
+        other_wall = total_wall - sum(wall for wall, _ in self.phases.values())
+        other_cpu = total_cpu - sum(cpu for _, cpu in self.phases.values())
+
+        lines = [f"{'phase':<24} {'wall (s)':>10} {'cpu (s)':>10} {'wall %':>7}"]
+        rows = sorted(self.phases.items(), key=lambda item: -item[1][0])
+        rows += [("other", (other_wall, other_cpu)), ("total", (total_wall, total_cpu))]
+        for phase, (wall, cpu) in rows:
+            percent = 100 * wall / total_wall if total_wall else 0.0
+            lines.append(f"{phase:<24} {wall:>10.3f} {cpu:>10.3f} {percent:>6.1f}%")
+
+        lines.append("")
+        lines.append(f"{'method':<24} {'calls':>10} {'wall (s)':>10} {'cpu (s)':>10}")
+        methods = sorted(self.methods.items(), key=lambda item: -item[1][1])
+        for name, (calls, wall, cpu) in methods:
+            lines.append(f"{name:<24} {calls:>10} {wall:>10.3f} {cpu:>10.3f}")
+        return "\n".join(lines)
+
+    def write(self, path):
+        """Write a Chrome trace if path ends with .json, cProfile stats
+        otherwise."""
+        if str(path).endswith(".json"):
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"traceEvents": self.events}, f)
+        elif self.cprofile:
+            self.cprofile.dump_stats(path)
+
+
+def timed(name, phase, func):
+    """Wrap func so that calls are recorded under name and phase while a
+    profile is running."""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profile = _profile
+        if profile is None:
+            return func(*args, **kwargs)
+        profile.enter(name, phase)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profile.exit()
+
+    wrapper._git_sim_profiled = True
+    return wrapper
+
+
+def get_method_phase(name):
+    if name.startswith("draw_"):
+        return "layout"
+    return METHOD_PHASES.get(name)
+
+
+def instrument(cls):
+    """Time the phase methods of a command class and the command classes it
+    inherits from, including overrides."""
+    for klass in cls.__mro__:
+        if not klass.__module__.startswith("git_sim."):
+            continue
+        for name, func in list(vars(klass).items()):
+            phase = get_method_phase(name)
+            if phase and callable(func) and not hasattr(func, "_git_sim_profiled"):
+                setattr(klass, name, timed(name, phase, func))
+
+
+def instrument_rendering():
+    import importlib
+
+    for (module_name, attr_path), phase in RENDER_PHASES.items():
+        owner = importlib.import_module(module_name)
+        *owner_path, name = attr_path.split(".")
+        for part in owner_path:
+            owner = getattr(owner, part)
+        func = getattr(owner, name)
+        if not hasattr(func, "_git_sim_profiled"):
+            setattr(owner, name, timed(name, phase, func))
+
+
+def is_running():
+    return _profile is not None
+
+
+def start():
+    """Start recording a profile, with cProfile too if a non-JSON profile
+    output file is set."""
+    global _profile
+
+    instrument_rendering()
+    _profile = Profile()
+    output = settings.profile_output
+    if output and not str(output).endswith(".json"):
+        _profile.cprofile = cProfile.Profile()
+        _profile.cprofile.enable()
+    return _profile
+
+
+def stop():
+    """Stop recording and return the profile."""
+    global _profile
+
+    profile, _profile = _profile, None
+    if profile:
+        profile.stop()
+    return profile
+
+
+def finish():
+    """Stop recording, print the summary table to stderr and write the
+    profile output file, if any."""
+    profile = stop()
+    if profile is None:
+        return
+    print("git-sim profile:", file=sys.stderr)
+    print(profile.format_summary(), file=sys.stderr)
+    if settings.profile_output:
+        profile.write(settings.profile_output)
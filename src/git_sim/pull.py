@@ -5,12 +5,11 @@ from argparse import Namespace
 import git
 import manim as m
 import numpy
-import tempfile
-import shutil
 import stat
 import re
 
 from git_sim.git_sim_base_command import GitSimBaseCommand
+from git_sim.scratch import clone_scratch_repo, make_scratch_dir, remove_scratch_dir
 from git_sim.settings import settings
 
 
@@ -36,11 +35,11 @@ class Pull(GitSimBaseCommand):
         # Configure paths to make local clone to run networked commands in
         git_root = self.repo.git.rev_parse("--show-toplevel")
         repo_name = os.path.basename(self.repo.working_dir)
-        new_dir = os.path.join(tempfile.gettempdir(), "git_sim", repo_name)
+        new_dir = make_scratch_dir(repo_name)
 
         # Save remotes and create the local clone
         orig_remotes = self.repo.remotes
-        self.repo = git.Repo.clone_from(git_root, new_dir, no_hardlinks=True)
+        self.repo = clone_scratch_repo(git_root, new_dir)
 
         # Reset the remotes in the local clone to the original remotes
         for r1 in orig_remotes:
@@ -83,7 +82,7 @@ class Pull(GitSimBaseCommand):
                     f"git-sim error: git pull failed for unhandled reason: {e.stdout}"
                 )
                 self.repo.git.clear_cache()
-                shutil.rmtree(new_dir, onerror=self.del_rw)
+                remove_scratch_dir(new_dir)
                 sys.exit(1)
 
         self.color_by()
@@ -95,7 +94,7 @@ class Pull(GitSimBaseCommand):
         self.repo.git.clear_cache()
 
         # Delete the local clone
-        shutil.rmtree(new_dir, onerror=self.del_rw)
+        remove_scratch_dir(new_dir)
 
     # Override to display conflicted filenames
     def populate_zones(
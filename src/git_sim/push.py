@@ -5,12 +5,11 @@ from argparse import Namespace
 import git
 import manim as m
 import numpy
-import tempfile
-import shutil
 import stat
 import re
 
 from git_sim.git_sim_base_command import GitSimBaseCommand
+from git_sim.scratch import clone_scratch_repo, make_scratch_dir, remove_scratch_dir
 from git_sim.settings import settings
 from git_sim.enums import ColorByOptions
 
@@ -40,14 +39,14 @@ class Push(GitSimBaseCommand):
         # Configure paths to make local clone to run networked commands in
         git_root = self.repo.git.rev_parse("--show-toplevel")
         repo_name = os.path.basename(self.repo.working_dir)
-        new_dir = os.path.join(tempfile.gettempdir(), "git_sim", repo_name)
-        new_dir2 = os.path.join(tempfile.gettempdir(), "git_sim", repo_name + "2")
+        new_dir = make_scratch_dir(repo_name)
+        new_dir2 = make_scratch_dir(repo_name + "-remote")
 
         # Save remotes
         orig_remotes = self.repo.remotes
 
         # Create local clone of local repo
-        self.repo = git.Repo.clone_from(git_root, new_dir, no_hardlinks=True)
+        self.repo = clone_scratch_repo(git_root, new_dir)
         if self.remote:
             for r in orig_remotes:
                 if self.remote == r.name:
@@ -57,8 +56,8 @@ class Push(GitSimBaseCommand):
             remote_url = orig_remotes[0].url
 
         # Create local clone of remote repo to simulate push to so we don't touch the real remote
-        self.remote_repo = git.Repo.clone_from(
-            remote_url, new_dir2, no_hardlinks=True, bare=True
+        self.remote_repo = clone_scratch_repo(
+            remote_url, new_dir2, bare=True, reference=git_root
         )
 
         # Reset local clone remote to the local clone of remote repo
@@ -115,8 +114,8 @@ class Push(GitSimBaseCommand):
             self.orig_repo.git.clear_cache()
 
         # Delete the local clones
-        shutil.rmtree(new_dir, onerror=self.del_rw)
-        shutil.rmtree(new_dir2, onerror=self.del_rw)
+        remove_scratch_dir(new_dir)
+        remove_scratch_dir(new_dir2)
 
     def failed_push(self, push_result):
         texts = []
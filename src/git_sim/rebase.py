@@ -6,6 +6,7 @@ import numpy
 
 from git_sim.git_sim_base_command import GitSimBaseCommand
 from git_sim.settings import settings
+from git_sim.text_cache import cached_text
 
 
 class Rebase(GitSimBaseCommand):
@@ -37,9 +38,7 @@ class Rebase(GitSimBaseCommand):
         if not settings.stdout and not settings.output_only_path and not settings.quiet:
             print(f"{settings.INFO_STRING} {self.cmd}")
 
-        if self.branch in self.repo.git.branch(
-            "--contains", self.repo.active_branch.name
-        ):
+        if self.get_ancestry().is_ancestor(self.repo.active_branch.name, self.branch):
             print(
                 "git-sim error: Branch '"
                 + self.repo.active_branch.name
@@ -49,9 +48,7 @@ class Rebase(GitSimBaseCommand):
             )
             sys.exit(1)
 
-        if self.repo.active_branch.name in self.repo.git.branch(
-            "--contains", self.branch
-        ):
+        if self.get_ancestry().is_ancestor(self.branch, self.repo.active_branch.name):
             print(
                 "git-sim error: Branch '"
                 + self.branch
@@ -68,8 +65,8 @@ class Rebase(GitSimBaseCommand):
 
         reached_base = False
         for commit in self.get_default_commits():
-            if commit != "dark" and self.branch in self.repo.git.branch(
-                "--contains", commit
+            if commit != "dark" and self.get_ancestry().is_ancestor(
+                commit.hexsha, self.branch
             ):
                 reached_base = True
 
@@ -80,7 +77,7 @@ class Rebase(GitSimBaseCommand):
         to_rebase = []
         i = 0
         current = head_commit
-        while self.branch not in self.repo.git.branch("--contains", current):
+        while not self.get_ancestry().is_ancestor(current.hexsha, self.branch):
             to_rebase.append(current)
             i += 1
             if i >= self.n:
@@ -148,7 +145,7 @@ class Rebase(GitSimBaseCommand):
             else letter
             for letter in child[:6]
         )
-        commitId = m.Text(
+        commitId = cached_text(
             sha if commitMessage != "..." else "...",
             font=self.font,
             font_size=20,
@@ -157,7 +154,7 @@ class Rebase(GitSimBaseCommand):
         self.toFadeOut.add(commitId)
 
         commitMessage = commitMessage[:40].replace("\n", " ")
-        message = m.Text(
+        message = cached_text(
             "\n".join(
                 commitMessage[j : j + 20] for j in range(0, len(commitMessage), 20)
             )[:100],
@@ -179,7 +176,7 @@ class Rebase(GitSimBaseCommand):
             self.camera.frame.move_to(circle.get_center())
             self.add(circle, commitId, message)
 
-        self.drawnCommits[sha] = circle
+        self.add_drawn_commit(sha, circle)
         self.toFadeOut.add(circle)
 
         if draw_arrow:
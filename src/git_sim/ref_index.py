@@ -0,0 +1,70 @@
+class RefIndex:
+    """Index of the refs that point at each commit, built from a single
+    `git for-each-ref` call instead of loading every ref per drawn commit.
+    """
+
+    def __init__(self, repo):
+        self.repo = repo
+        self.heads = {}
+        self.remote_tracking_branches = {}
+        self.tags = {}
+        self.branches_by_commit = {}
+        self.tags_by_commit = {}
+
+        try:
+            self.head = repo.head.commit.hexsha
+        except ValueError:
+            self.head = None
+
+        remote_names = [remote.name for remote in repo.remotes]
+        remote_refs = {name: [] for name in remote_names}
+
+        output = repo.git.for_each_ref(
+            "--format=%(refname)%00%(objectname)%00%(objecttype)%00%(*objectname)%00%(*objecttype)",
+            "refs/heads",
+            "refs/remotes",
+            "refs/tags",
+        )
+        for line in output.splitlines():
+            refname, hexsha, objtype, peeled_hexsha, peeled_objtype = line.split("\x00")
+            if refname.startswith("refs/heads/"):
+                self.heads[refname[len("refs/heads/") :]] = hexsha
+            elif refname.startswith("refs/remotes/"):
+                name = refname[len("refs/remotes/") :]
+                remote = self.get_remote_name(name, remote_names)
+                if remote and "HEAD" not in name:
+                    remote_refs[remote].append((name, hexsha))
+            elif refname.startswith("refs/tags/"):
+                name = refname[len("refs/tags/") :]
+                if objtype == "commit":
+                    self.tags[name] = hexsha
+                elif objtype == "tag" and peeled_objtype == "commit":
+                    self.tags[name] = peeled_hexsha
+                elif objtype == "tag" and peeled_objtype == "tag":
+                    try:
+                        self.tags[name] = repo.tags[name].commit.hexsha
+                    except ValueError:
+                        pass
+
+        # Keep remotes in config order, like iterating repo.remotes does
+        for remote in remote_names:
+            for name, hexsha in remote_refs[remote]:
+                if name not in self.remote_tracking_branches:
+                    self.remote_tracking_branches[name] = hexsha
+
+        for name, hexsha in self.heads.items():
+            self.branches_by_commit.setdefault(hexsha, []).append(name)
+        for name, hexsha in self.remote_tracking_branches.items():
+            self.branches_by_commit.setdefault(hexsha, []).append(name)
+        for name, hexsha in self.tags.items():
+            self.tags_by_commit.setdefault(hexsha, []).append(name)
+
+    def get_remote_name(self, name, remote_names):
+        matches = [r for r in remote_names if name.startswith(r + "/")]
+        return max(matches, key=len) if matches else None
+
+    def get_branches(self, hexsha):
+        return list(self.branches_by_commit.get(hexsha, []))
+
+    def get_tags(self, hexsha):
+        return list(self.tags_by_commit.get(hexsha, []))
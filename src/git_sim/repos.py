@@ -0,0 +1,49 @@
+import os
+
+from git.repo import Repo
+
+_repos = {}
+_keep_open = False
+_shared_indexes = None
+
+
+def keep_repos_open():
+    """Reuse Repo objects, and the git processes behind them, across the
+    commands run by a long-lived process like `git-sim serve`."""
+    global _keep_open
+    _keep_open = True
+
+
+def open_repo():
+    """Open the repo containing the current directory."""
+    if not _keep_open:
+        return Repo(search_parent_directories=True)
+
+    cwd = os.getcwd()
+    repo = _repos.get(cwd)
+    if repo is None or not os.path.isdir(repo.git_dir):
+        repo = _repos[cwd] = Repo(search_parent_directories=True)
+    return repo
+
+
+def share_indexes():
+    """Let consecutive commands reuse the indexes built over an open repo.
+
+    Only valid while the repo itself doesn't change, e.g. for the commands of
+    one `git-sim batch` run, which simulate without touching the repo.
+    """
+    global _shared_indexes
+    keep_repos_open()
+    _shared_indexes = {}
+
+
+def get_shared_index(repo, index_class):
+    """Build index_class(repo), or reuse the one built by an earlier command.
+    Scratch clones are never shared since their contents vary per command."""
+    if _shared_indexes is None or not any(repo is r for r in _repos.values()):
+        return index_class(repo)
+
+    key = (repo.git_dir, index_class)
+    if key not in _shared_indexes:
+        _shared_indexes[key] = index_class(repo)
+    return _shared_indexes[key]
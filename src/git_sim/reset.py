@@ -7,6 +7,7 @@ import manim as m
 from git_sim.enums import ResetMode
 from git_sim.git_sim_base_command import GitSimBaseCommand
 from git_sim.settings import settings
+from git_sim.text_cache import cached_text
 
 
 class Reset(GitSimBaseCommand):
@@ -58,21 +59,32 @@ class Reset(GitSimBaseCommand):
         self.fadeout()
         self.show_outro()
 
+    def get_drawn_commit(self, commit, i):
+        if i == 4 and self.resetTo.hexsha not in [
+            c.hexsha for c in self.get_default_commits()
+        ]:
+            return self.resetTo
+        return commit
+
     def build_commit_id_and_message(self, commit, i):
         hide_refs = False
         if commit == "dark":
-            commitId = m.Text("", font=self.font, font_size=20, color=self.fontColor)
+            commitId = cached_text(
+                "", font=self.font, font_size=20, color=self.fontColor
+            )
             commitMessage = ""
         elif i == 3 and self.resetTo.hexsha not in [
             c.hexsha for c in self.get_default_commits()
         ]:
-            commitId = m.Text("...", font=self.font, font_size=20, color=self.fontColor)
+            commitId = cached_text(
+                "...", font=self.font, font_size=20, color=self.fontColor
+            )
             commitMessage = "..."
             hide_refs = True
         elif i == 4 and self.resetTo.hexsha not in [
             c.hexsha for c in self.get_default_commits()
         ]:
-            commitId = m.Text(
+            commitId = cached_text(
                 self.resetTo.hexsha[:6],
                 font=self.font,
                 font_size=20,
@@ -82,7 +94,7 @@ class Reset(GitSimBaseCommand):
             commit = self.resetTo
             hide_refs = True
         else:
-            commitId = m.Text(
+            commitId = cached_text(
                 commit.hexsha[:6],
                 font=self.font,
                 font_size=20,
@@ -119,20 +131,21 @@ class Reset(GitSimBaseCommand):
                 elif self.mode == ResetMode.HARD:
                     firstColumnFileNames.add(filename)
 
-        for x in self.repo.index.diff(None):
-            if "git-sim_media" not in x.a_path:
+        status = self.get_status()
+        for x in status.unstaged:
+            if "git-sim_media" not in x:
                 if self.mode == ResetMode.SOFT:
-                    secondColumnFileNames.add(x.a_path)
+                    secondColumnFileNames.add(x)
                 elif self.mode in (ResetMode.MIXED, ResetMode.DEFAULT):
-                    secondColumnFileNames.add(x.a_path)
+                    secondColumnFileNames.add(x)
                 elif self.mode == ResetMode.HARD:
-                    firstColumnFileNames.add(x.a_path)
+                    firstColumnFileNames.add(x)
 
-        for y in self.repo.index.diff("HEAD"):
-            if "git-sim_media" not in y.a_path:
+        for y in status.staged:
+            if "git-sim_media" not in y:
                 if self.mode == ResetMode.SOFT:
-                    thirdColumnFileNames.add(y.a_path)
+                    thirdColumnFileNames.add(y)
                 elif self.mode in (ResetMode.MIXED, ResetMode.DEFAULT):
-                    secondColumnFileNames.add(y.a_path)
+                    secondColumnFileNames.add(y)
                 elif self.mode == ResetMode.HARD:
-                    firstColumnFileNames.add(y.a_path)
+                    firstColumnFileNames.add(y)
@@ -20,14 +20,15 @@ class Restore(GitSimBaseCommand):
         except TypeError:
             pass
 
+        status = self.get_status()
         if not self.staged:
             for file in self.files:
-                if file not in [x.a_path for x in self.repo.index.diff(None)]:
+                if file not in status.unstaged:
                     print(f"git-sim error: No modified file with name: '{file}'")
                     sys.exit()
         else:
             for file in self.files:
-                if file not in [y.a_path for y in self.repo.index.diff("HEAD")]:
+                if file not in status.staged:
                     print(
                         f"git-sim error: No modified or staged file with name: '{file}'"
                     )
@@ -58,22 +59,23 @@ class Restore(GitSimBaseCommand):
         secondColumnArrowMap={},
         thirdColumnArrowMap={},
     ):
-        for x in self.repo.index.diff(None):
-            if "git-sim_media" not in x.a_path:
-                secondColumnFileNames.add(x.a_path)
+        status = self.get_status()
+        for x in status.unstaged:
+            if "git-sim_media" not in x:
+                secondColumnFileNames.add(x)
                 for file in self.files:
-                    if file == x.a_path:
-                        thirdColumnFileNames.add(x.a_path)
-                        secondColumnArrowMap[x.a_path] = m.Arrow(
+                    if file == x:
+                        thirdColumnFileNames.add(x)
+                        secondColumnArrowMap[x] = m.Arrow(
                             stroke_width=3, color=self.fontColor
                         )
 
-        for y in self.repo.index.diff("HEAD"):
-            if "git-sim_media" not in y.a_path:
-                firstColumnFileNames.add(y.a_path)
+        for y in status.staged:
+            if "git-sim_media" not in y:
+                firstColumnFileNames.add(y)
                 for file in self.files:
-                    if file == y.a_path:
-                        secondColumnFileNames.add(y.a_path)
-                        firstColumnArrowMap[y.a_path] = m.Arrow(
+                    if file == y:
+                        secondColumnFileNames.add(y)
+                        firstColumnArrowMap[y] = m.Arrow(
                             stroke_width=3, color=self.fontColor
                         )
@@ -6,6 +6,7 @@ import numpy
 
 from git_sim.git_sim_base_command import GitSimBaseCommand
 from git_sim.settings import settings
+from git_sim.text_cache import cached_text
 
 
 class Revert(GitSimBaseCommand):
@@ -60,18 +61,22 @@ class Revert(GitSimBaseCommand):
     def build_commit_id_and_message(self, commit, i):
         hide_refs = False
         if commit == "dark":
-            commitId = m.Text("", font=self.font, font_size=20, color=self.fontColor)
+            commitId = cached_text(
+                "", font=self.font, font_size=20, color=self.fontColor
+            )
             commitMessage = ""
         elif i == 2 and self.revert.hexsha not in [
             commit.hexsha for commit in self.get_default_commits()
         ]:
-            commitId = m.Text("...", font=self.font, font_size=20, color=self.fontColor)
+            commitId = cached_text(
+                "...", font=self.font, font_size=20, color=self.fontColor
+            )
             commitMessage = "..."
             hide_refs = True
         elif i == 3 and self.revert.hexsha not in [
             commit.hexsha for commit in self.get_default_commits()
         ]:
-            commitId = m.Text(
+            commitId = cached_text(
                 self.revert.hexsha[:6],
                 font=self.font,
                 font_size=20,
@@ -80,7 +85,7 @@ class Revert(GitSimBaseCommand):
             commitMessage = self.revert.message.split("\n")[0][:40].replace("\n", " ")
             hide_refs = True
         else:
-            commitId = m.Text(
+            commitId = cached_text(
                 commit.hexsha[:6],
                 font=self.font,
                 font_size=20,
@@ -116,14 +121,14 @@ class Revert(GitSimBaseCommand):
         length = numpy.linalg.norm(start - end) - (1.5 if start[1] == end[1] else 3)
         arrow.set_length(length)
 
-        commitId = m.Text(
+        commitId = cached_text(
             "abcdef", font=self.font, font_size=20, color=self.fontColor
         ).next_to(circle, m.UP)
         self.toFadeOut.add(commitId)
 
         commitMessage = "Revert " + self.revert.hexsha[0:6]
         commitMessage = commitMessage[:40].replace("\n", " ")
-        message = m.Text(
+        message = cached_text(
             "\n".join(
                 commitMessage[j : j + 20] for j in range(0, len(commitMessage), 20)
             )[:100],
@@ -145,7 +150,7 @@ class Revert(GitSimBaseCommand):
             self.camera.frame.move_to(circle.get_center())
             self.add(circle, commitId, message)
 
-        self.drawnCommits["abcdef"] = circle
+        self.add_drawn_commit("abcdef", circle)
         self.toFadeOut.add(circle)
 
         if settings.animate:
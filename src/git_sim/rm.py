@@ -126,8 +126,9 @@ class Rm(GitSimBaseCommand):
         secondColumnArrowMap={},
         thirdColumnArrowMap={},
     ):
+        staged = self.get_status().staged
         for file in self.files:
-            if file in [x.a_path for x in self.repo.index.diff("HEAD")]:
+            if file in staged:
                 secondColumnFileNames.add(file)
                 secondColumnArrowMap[file] = m.Arrow(
                     stroke_width=3, color=self.fontColor
@@ -0,0 +1,107 @@
+import contextlib
+import enum
+import os
+import traceback
+
+from git_sim.settings import reset_settings, settings
+
+
+def run_command(args, cwd=None, env=None):
+    """Run one git-sim command line, e.g. ["-d", "log"], in this process.
+
+    Settings and the manim config are reset around the command so that
+    consecutive commands don't leak state into each other. If env is given,
+    its git_sim_* variables replace this process's while the settings are
+    read, like the environment of the client a server runs the command
+    for. Returns a tuple of the exit code and the path of the generated
+    image or video, if any.
+    """
+    from manim import tempconfig
+
+    from git_sim.__main__ import app
+
+    orig_cwd = os.getcwd()
+    try:
+        if cwd:
+            os.chdir(cwd)
+        with settings_environ(env):
+            reset_settings()
+        with tempconfig({}):
+            result = app(
+                args=list(args),
+                prog_name="git-sim",
+                standalone_mode=False,
+                default_map=get_default_map(app),
+            )
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0, None
+        print(e.code)
+        return 1, None
+    except Exception as e:
+        if is_usage_error(e):
+            e.show()
+            return e.exit_code, None
+        traceback.print_exc()
+        return 1, None
+    finally:
+        os.chdir(orig_cwd)
+
+    # Eager options like --version exit with a code instead of a result
+    if result is None or isinstance(result, int):
+        return result or 0, None
+    return 0, result
+
+
+def is_usage_error(e):
+    """Check for a click usage error. Newer typer releases raise these from a
+    vendored copy of click, so match on the interface instead of the class."""
+    return hasattr(e, "exit_code") and hasattr(e, "format_message")
+
+
+def get_default_map(app):
+    """Defaults for the global options, from the current settings.
+
+    The options read their defaults from the settings once, when
+    git_sim.__main__ was imported, so later changes to the environment or
+    the working directory wouldn't reach them otherwise.
+    """
+    import typer
+
+    defaults = {}
+    for param in typer.main.get_command(app).params:
+        if param.name in type(settings).model_fields:
+            value = getattr(settings, param.name)
+            defaults[param.name] = (
+                value.value if isinstance(value, enum.Enum) else value
+            )
+    return defaults
+
+
+def get_settings_environ(env=None):
+    """The git_sim_* variables of env, or of this process's environment."""
+    env = os.environ if env is None else env
+    return {
+        name: value
+        for name, value in env.items()
+        if name.lower().startswith("git_sim_")
+    }
+
+
+@contextlib.contextmanager
+def settings_environ(env=None):
+    """Replace the git_sim_* variables of os.environ with env's until exit.
+    Does nothing if env is None."""
+    if env is None:
+        yield
+        return
+    orig = get_settings_environ()
+    for name in orig:
+        del os.environ[name]
+    os.environ.update(get_settings_environ(env))
+    try:
+        yield
+    finally:
+        for name in get_settings_environ():
+            del os.environ[name]
+        os.environ.update(orig)
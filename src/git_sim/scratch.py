@@ -0,0 +1,183 @@
+import os
+import shutil
+import stat
+import tempfile
+import threading
+import time
+
+import git
+
+TRASH_DIR_NAME = ".trash"
+
+# Scratch dirs whose owner can't be checked (on Windows, or without a pid in
+# their name) are only removed once they are this old
+STALE_AGE = 24 * 60 * 60
+
+_sweep_thread = None
+_remove_threads = []
+
+
+def clone_scratch_repo(source, new_dir, bare=False, reference=None):
+    """Create a throwaway clone of source without copying its object store.
+
+    Local sources are cloned with --shared so the scratch repo reads objects
+    from the original repo through alternates. Other sources (e.g. network
+    remotes) borrow whatever objects already exist in the optional local
+    reference repo, so only missing objects are transferred.
+    """
+    if os.path.isdir(source):
+        return git.Repo.clone_from(source, new_dir, shared=True, bare=bare)
+    if reference:
+        return git.Repo.clone_from(source, new_dir, reference=reference, bare=bare)
+    return git.Repo.clone_from(source, new_dir, bare=bare)
+
+
+def get_scratch_root():
+    return os.path.join(tempfile.gettempdir(), "git_sim")
+
+
+def make_scratch_dir(name):
+    """Create an empty scratch dir that belongs to this run only, named
+    <name>-<pid>-<random>."""
+    root = get_scratch_root()
+    os.makedirs(root, exist_ok=True)
+    return tempfile.mkdtemp(prefix=f"{name}-{os.getpid()}-", dir=root)
+
+
+def get_owner_pid(path):
+    try:
+        return int(os.path.basename(path).rsplit("-", 2)[-2])
+    except (IndexError, ValueError):
+        return None
+
+
+def is_process_running(pid):
+    # os.kill(pid, 0) would terminate the process on Windows
+    if os.name == "nt":
+        return None
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def is_stale(path, max_age=STALE_AGE):
+    pid = get_owner_pid(path)
+    running = is_process_running(pid) if pid is not None else None
+    if running is not None:
+        return not running
+    try:
+        return time.time() - os.path.getmtime(path) > max_age
+    except OSError:
+        return False
+
+
+def find_stale_dirs(max_age=STALE_AGE):
+    """Scratch dirs left behind by runs that have ended, including the ones
+    that were moved to the trash but not deleted yet."""
+    root = get_scratch_root()
+    trash = os.path.join(root, TRASH_DIR_NAME)
+    stale = []
+    for parent in (trash, root):
+        try:
+            entries = list(os.scandir(parent))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.path == trash or not entry.is_dir(follow_symlinks=False):
+                continue
+            if parent == trash or is_stale(entry.path, max_age):
+                stale.append(entry.path)
+    return stale
+
+
+def remove_tree(path):
+    def remove_read_only(func, name, exc):
+        # Git makes its object files read-only, which Windows won't delete
+        try:
+            os.chmod(name, stat.S_IWRITE)
+            func(name)
+        except OSError:
+            pass
+
+    shutil.rmtree(path, onerror=remove_read_only)
+
+
+def remove_scratch_dir(path):
+    """Delete a scratch dir in a background thread.
+
+    The dir is first renamed into the trash, which is instant, so that
+    nothing else sees it half deleted. If the process exits before the
+    thread is done, the rest is deleted by the next sweep.
+    """
+    trash = os.path.join(get_scratch_root(), TRASH_DIR_NAME)
+    target = os.path.join(trash, os.path.basename(path))
+    try:
+        os.makedirs(trash, exist_ok=True)
+        os.rename(path, target)
+    except FileNotFoundError:
+        return
+    except OSError:
+        # e.g. files still open on Windows
+        target = path
+    thread = threading.Thread(target=remove_tree, args=(target,), daemon=True)
+    thread.start()
+    _remove_threads[:] = [t for t in _remove_threads if t.is_alive()] + [thread]
+
+
+def remove_stale_dirs(max_age=STALE_AGE):
+    stale = find_stale_dirs(max_age)
+    for path in stale:
+        remove_tree(path)
+    return stale
+
+
+def sweep_in_background():
+    """Remove the scratch dirs left behind by earlier runs without making
+    the command wait."""
+    global _sweep_thread
+
+    if _sweep_thread and _sweep_thread.is_alive():
+        return
+    _sweep_thread = threading.Thread(target=remove_stale_dirs, daemon=True)
+    _sweep_thread.start()
+
+
+def join_background_threads(timeout=None):
+    """Wait up to timeout seconds in total for the sweep and scratch dir
+    deletions running in the background, e.g. before forking. Return whether
+    they all finished."""
+    deadline = None if timeout is None else time.monotonic() + timeout
+    for thread in [_sweep_thread, *_remove_threads]:
+        if thread is None:
+            continue
+        thread.join(None if deadline is None else max(deadline - time.monotonic(), 0))
+        if thread.is_alive():
+            return False
+    _remove_threads.clear()
+    return True
+
+
+def collect_garbage(max_age=STALE_AGE, dry_run=False):
+    """Remove stale scratch dirs right away, returning their paths and the
+    number of bytes they took up."""
+    stale = find_stale_dirs(max_age)
+    size = sum(get_tree_size(path) for path in stale)
+    if not dry_run:
+        for path in stale:
+            remove_tree(path)
+    return stale, size
+
+
+def get_tree_size(path):
+    size = 0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            try:
+                size += os.lstat(os.path.join(dirpath, filename)).st_size
+            except OSError:
+                pass
+    return size
@@ -0,0 +1,173 @@
+import base64
+import contextlib
+import io
+import json
+import os
+import socket
+import stat
+import sys
+import tempfile
+
+SOCKET_NAME = "git-sim.sock"
+
+
+def serve(socket_path):
+    """Run git-sim commands sent by clients over a Unix socket.
+
+    The interpreter, manim, registered fonts, cached text and open repos stay
+    warm between requests, so each request only pays for layout and
+    rasterization. Requests are handled one at a time.
+    """
+    from git_sim.repos import keep_repos_open
+
+    if not hasattr(socket, "AF_UNIX"):
+        print("git-sim error: git-sim serve requires Unix domain sockets.")
+        sys.exit(1)
+    socket_path = get_socket_path(socket_path)
+    if os.path.lexists(socket_path):
+        if not is_owned(socket_path):
+            print(f"git-sim error: {socket_path} belongs to another user.")
+            sys.exit(1)
+        if is_listening(socket_path):
+            print(
+                f"git-sim error: A git-sim server is already listening on {socket_path}."
+            )
+            sys.exit(1)
+        os.remove(socket_path)
+
+    keep_repos_open()
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # Create the socket with no access for other users from the start
+    orig_umask = os.umask(0o177)
+    try:
+        server.bind(socket_path)
+    finally:
+        os.umask(orig_umask)
+    server.listen()
+    print(f"git-sim server listening on {socket_path}")
+
+    try:
+        while True:
+            conn, _ = server.accept()
+            with conn:
+                handle_request(conn)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        os.remove(socket_path)
+
+
+def handle_request(conn):
+    from git_sim.runner import run_command
+
+    with conn.makefile("rb") as f:
+        line = f.readline()
+    try:
+        request = json.loads(line)
+        args, cwd, env = request["args"], request["cwd"], request["env"]
+    except (ValueError, KeyError, TypeError):
+        return
+
+    # The command may write images to sys.stdout.buffer, so capture bytes
+    stdout = io.TextIOWrapper(io.BytesIO(), encoding="utf-8", write_through=True)
+    stderr = io.TextIOWrapper(io.BytesIO(), encoding="utf-8", write_through=True)
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        exit_code, output_path = run_command(args, cwd, env)
+
+    response = {
+        "exit_code": exit_code,
+        "output_path": output_path,
+        "stdout": base64.b64encode(stdout.buffer.getvalue()).decode("ascii"),
+        "stderr": base64.b64encode(stderr.buffer.getvalue()).decode("ascii"),
+    }
+    try:
+        conn.sendall(json.dumps(response).encode("utf-8") + b"\n")
+    except OSError:
+        pass
+
+
+def forward(args, socket_path):
+    """Send a command line to a running git-sim server, replay its output
+    and return its exit code."""
+    if not hasattr(socket, "AF_UNIX"):
+        print("git-sim error: git-sim client requires Unix domain sockets.")
+        return 1
+    socket_path = get_socket_path(socket_path)
+    # Never send the command line and cwd to a server run by someone else
+    if os.path.lexists(socket_path) and not is_owned(socket_path):
+        print(f"git-sim error: {socket_path} belongs to another user.")
+        return 1
+
+    from git_sim.runner import get_settings_environ
+
+    # Settings the client sets through git_sim_* variables apply as well
+    request = {
+        "args": list(args),
+        "cwd": os.getcwd(),
+        "env": get_settings_environ(),
+    }
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(socket_path)
+            client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            with client.makefile("rb") as f:
+                line = f.readline()
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(
+            f"git-sim error: No git-sim server is listening on {socket_path}, start one with `git-sim serve`."
+        )
+        return 1
+
+    if not line:
+        print("git-sim error: The git-sim server closed the connection.")
+        return 1
+
+    response = json.loads(line)
+    sys.stdout.flush()
+    sys.stdout.buffer.write(base64.b64decode(response["stdout"]))
+    sys.stdout.buffer.flush()
+    sys.stderr.flush()
+    sys.stderr.buffer.write(base64.b64decode(response["stderr"]))
+    sys.stderr.buffer.flush()
+    return response["exit_code"]
+
+
+def get_socket_path(socket_path=None):
+    """The socket given with --socket, or git-sim.sock in $XDG_RUNTIME_DIR,
+    or else in a git-sim-<uid> dir under the temp dir that only the current
+    user can access."""
+    if socket_path:
+        return str(socket_path)
+
+    directory = os.environ.get("XDG_RUNTIME_DIR")
+    if not directory:
+        directory = os.path.join(tempfile.gettempdir(), f"git-sim-{os.getuid()}")
+        try:
+            os.mkdir(directory, 0o700)
+        except FileExistsError:
+            pass
+    # Another user could have created the dir first to take over the socket
+    if not is_owned(directory) or not is_private_dir(directory):
+        print(f"git-sim error: {directory} is not a private directory of yours.")
+        sys.exit(1)
+    return os.path.join(directory, SOCKET_NAME)
+
+
+def is_owned(path):
+    return os.lstat(path).st_uid == os.getuid()
+
+
+def is_private_dir(path):
+    mode = os.lstat(path).st_mode
+    return stat.S_ISDIR(mode) and not mode & 0o077
+
+
+def is_listening(socket_path):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(socket_path)
+        except OSError:
+            return False
+    return True
@@ -1,9 +1,16 @@
 import pathlib
 from typing import List, Union
 
+from pydantic import Field
 from pydantic_settings import BaseSettings
 
-from git_sim.enums import StyleOptions, ColorByOptions, ImgFormat, VideoFormat
+from git_sim.enums import (
+    StyleOptions,
+    ColorByOptions,
+    ImgFormat,
+    StreamFormat,
+    VideoFormat,
+)
 
 
 class Settings(BaseSettings):
@@ -20,9 +27,12 @@ class Settings(BaseSettings):
     transparent_bg: bool = False
     logo: pathlib.Path = pathlib.Path(__file__).parent.resolve() / "logo.png"
     low_quality: bool = False
+    preview: bool = False
+    tiles: bool = False
     max_branches_per_commit: int = 1
     max_tags_per_commit: int = 1
-    media_dir: pathlib.Path = pathlib.Path().cwd()
+    # Read when the settings are reset, so each command gets its own cwd
+    media_dir: pathlib.Path = Field(default_factory=pathlib.Path.cwd)
     outro_bottom_text: str = "Learn more at initialcommit.com"
     outro_top_text: str = "Thanks for using Initial Commit!"
     reverse: bool = False
@@ -32,6 +42,7 @@ class Settings(BaseSettings):
     title: str = "Git-Sim, by initialcommit.com"
     video_format: VideoFormat = VideoFormat.MP4
     stdout: bool = False
+    stream: Union[StreamFormat, None] = None
     output_only_path: bool = False
     quiet: bool = False
     invert_branches: bool = False
@@ -42,10 +53,21 @@ class Settings(BaseSettings):
     style: Union[StyleOptions, None] = StyleOptions.CLEAN
     font: str = "Monospace"
     font_context: bool = False
+    font_path: Union[pathlib.Path, None] = None
     show_command_as_title: bool = True
+    text_cache_dir: Union[pathlib.Path, None] = None
+    profile: bool = False
+    profile_output: Union[pathlib.Path, None] = None
+    server_socket: Union[pathlib.Path, None] = None
 
     class Config:
         env_prefix = "git_sim_"
 
 
 settings = Settings()
+
+
+def reset_settings():
+    """Restore every setting to its default. Commands adjust settings while
+    they run, so processes that run several commands reset in between."""
+    settings.__init__()
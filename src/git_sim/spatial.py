@@ -0,0 +1,55 @@
+import math
+
+import numpy
+
+
+class CommitIndex:
+    """Uniform grid over the circles of drawn commits.
+
+    Answers "is this slot taken?" with a set lookup, and finds the circles an
+    arrow could run through by looking only in the grid cells that the
+    arrow's bounding box covers, instead of scanning every drawn commit.
+    Circles are also kept as (x, y, radius) in the order they were added.
+    """
+
+    def __init__(self, cell_size=2.5):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.slots = set()
+        self.circles = []
+        self.max_radius = 0.0
+
+    def slot(self, point):
+        return (round(float(point[0]), 6), round(float(point[1]), 6))
+
+    def cell(self, x, y):
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def add(self, center, radius):
+        x, y = float(center[0]), float(center[1])
+        self.slots.add(self.slot(center))
+        self.cells.setdefault(self.cell(x, y), []).append(len(self.circles))
+        self.circles.append((x, y, radius))
+        self.max_radius = max(self.max_radius, radius)
+
+    def is_occupied(self, center):
+        return self.slot(center) in self.slots
+
+    def find_candidates(self, lows, highs, half_width):
+        """For boxes given by their (N, 2) lower left and upper right corners,
+        return the pairs of box and circle indexes, as two arrays, of the
+        circles in the grid cells each box covers, grown by the largest
+        radius plus half_width."""
+        reach = self.max_radius + half_width
+        min_cells = numpy.floor((lows - reach) / self.cell_size).astype(int)
+        max_cells = numpy.floor((highs + reach) / self.cell_size).astype(int)
+
+        boxes, circles = [], []
+        for k in range(len(lows)):
+            for cx in range(min_cells[k, 0], max_cells[k, 0] + 1):
+                for cy in range(min_cells[k, 1], max_cells[k, 1] + 1):
+                    found = self.cells.get((cx, cy))
+                    if found:
+                        boxes.extend([k] * len(found))
+                        circles.extend(found)
+        return numpy.array(boxes, dtype=int), numpy.array(circles, dtype=int)
@@ -30,19 +30,16 @@ class Stash(GitSimBaseCommand):
             pass
 
         if self.command in [StashSubCommand.PUSH, None]:
+            status = self.get_status()
             for file in self.files:
-                if file not in [x.a_path for x in self.repo.index.diff(None)] + [
-                    y.a_path for y in self.repo.index.diff("HEAD")
-                ]:
+                if file not in status.unstaged + status.staged:
                     print(
                         f"git-sim error: No modified or staged file with name: '{file}'"
                     )
                     sys.exit()
 
             if not self.files:
-                self.files = [x.a_path for x in self.repo.index.diff(None)] + [
-                    y.a_path for y in self.repo.index.diff("HEAD")
-                ]
+                self.files = status.unstaged + status.staged
         elif self.files:
             if (
                 not settings.stdout
@@ -172,21 +169,22 @@ class Stash(GitSimBaseCommand):
                 thirdColumnArrowMap[s] = m.Arrow(stroke_width=3, color=self.fontColor)
 
         else:
-            for x in self.repo.index.diff(None):
-                firstColumnFileNames.add(x.a_path)
+            status = self.get_status()
+            for x in status.unstaged:
+                firstColumnFileNames.add(x)
                 for file in self.files:
-                    if file == x.a_path:
-                        thirdColumnFileNames.add(x.a_path)
-                        firstColumnArrowMap[x.a_path] = m.Arrow(
+                    if file == x:
+                        thirdColumnFileNames.add(x)
+                        firstColumnArrowMap[x] = m.Arrow(
                             stroke_width=3, color=self.fontColor
                         )
 
-            for y in self.repo.index.diff("HEAD"):
-                secondColumnFileNames.add(y.a_path)
+            for y in status.staged:
+                secondColumnFileNames.add(y)
                 for file in self.files:
-                    if file == y.a_path:
-                        thirdColumnFileNames.add(y.a_path)
-                        secondColumnArrowMap[y.a_path] = m.Arrow(
+                    if file == y:
+                        thirdColumnFileNames.add(y)
+                        secondColumnArrowMap[y] = m.Arrow(
                             stroke_width=3, color=self.fontColor
                         )
 
@@ -0,0 +1,46 @@
+import struct
+import sys
+
+import cv2
+from manim.scene.scene_file_writer import SceneFileWriter
+
+from git_sim.enums import StreamFormat
+from git_sim.settings import settings
+
+RGBA_MAGIC = b"GSIM"
+
+
+def encode_frame(frame, stream_format):
+    """Encode an RGBA pixel array for streaming.
+
+    png and mjpeg frames are complete image files back to back, which tools
+    like ffmpeg read as image2pipe or mjpeg input. rgba frames are prefixed
+    with a 12-byte header: the magic bytes GSIM followed by the width and
+    height as big-endian 32-bit unsigned integers.
+    """
+    if stream_format == StreamFormat.RGBA:
+        height, width = frame.shape[:2]
+        return RGBA_MAGIC + struct.pack(">II", width, height) + frame.tobytes()
+    if stream_format == StreamFormat.PNG:
+        _, data = cv2.imencode(".png", cv2.cvtColor(frame, cv2.COLOR_RGBA2BGRA))
+    else:
+        _, data = cv2.imencode(".jpg", cv2.cvtColor(frame, cv2.COLOR_RGBA2BGR))
+    return data.tobytes()
+
+
+def write_frame(frame):
+    sys.stdout.buffer.write(encode_frame(frame, settings.stream))
+    sys.stdout.buffer.flush()
+
+
+class StreamingFileWriter(SceneFileWriter):
+    """File writer that sends every rendered frame to stdout as soon as it is
+    produced, instead of encoding a video on disk."""
+
+    def write_frame(self, frame_or_renderer, *args, **kwargs):
+        super().write_frame(frame_or_renderer, *args, **kwargs)
+        # manim 0.19 and later pass the number of times to repeat the frame,
+        # instead of writing it once per call
+        repeat = kwargs.get("repeat", kwargs.get("num_frames", args[0] if args else 1))
+        for _ in range(repeat):
+            write_frame(frame_or_renderer)
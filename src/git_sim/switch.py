@@ -54,20 +54,14 @@ class Switch(GitSimBaseCommand):
             self.is_descendant = False
 
             # branch being switched to is behind HEAD
-            branch_names = self.repo.git.branch("--contains", self.branch)
-            branch_names = branch_names.split("\n")
-            for i, bn in enumerate(branch_names):
-                branch_names[i] = bn.strip("*").strip()
-            branch_hexshas = [
-                self.repo.branches[branch].commit.hexsha for branch in branch_names
-            ]
-            if self.repo.head.commit.hexsha in branch_hexshas:
+            head_hexsha = self.repo.head.commit.hexsha
+            if head_hexsha in self.get_ref_index().heads.values() and (
+                self.get_ancestry().is_ancestor(self.branch, head_hexsha)
+            ):
                 self.is_ancestor = True
 
             # HEAD is behind branch being switched to
-            elif self.branch in self.repo.git.branch(
-                "--contains", self.repo.head.commit.hexsha
-            ):
+            elif self.get_ancestry().is_ancestor(head_hexsha, self.branch):
                 self.is_descendant = True
 
         if self.branch in [branch.name for branch in self.repo.heads]:
@@ -0,0 +1,260 @@
+import collections
+import hashlib
+import os
+import subprocess
+import tempfile
+import zipfile
+
+import manim as m
+import numpy as np
+
+from git_sim.settings import settings
+
+# Glyph arrays kept in memory. Labels like HEAD and branch names are looked
+# up again and again, while most commit SHAs and messages are only drawn once,
+# so keeping every entry would hold a second copy of each commit's text
+MEMORY_CACHE_SIZE = 256
+
+# Bound on the size of the on-disk cache. Past it, the entries used least
+# recently are removed until it's down to three quarters of the bound. The
+# size is checked on the first store of a process and every PRUNE_INTERVAL
+# stores after that
+DISK_CACHE_SIZE = 64 * 1024 * 1024
+PRUNE_INTERVAL = 256
+
+# Arrays stored for each entry, one row per glyph except for points, which
+# holds the points of all glyphs back to back
+GLYPH_FIELDS = ("points", "counts", "fill", "stroke", "stroke_width")
+
+_memory = collections.OrderedDict()
+_font_digests = {}
+_stores = 0
+
+
+def cached_text(text, **kwargs):
+    """Drop-in replacement for m.Text that reuses previously built glyphs.
+
+    Text mobjects are deterministic for a given text, font, size, weight and
+    color, so the glyph paths of the result are stored as plain arrays in a
+    content-addressed cache in the user's cache dir. Labels like HEAD, branch
+    names and short SHAs then skip Pango layout and SVG parsing on later runs
+    and later commands. Text in fonts whose file can't be found is only
+    cached in memory, since the key couldn't tell font versions apart.
+
+    Unless the scene is animated, where texts are added letter by letter,
+    a text is built as one VMobject holding the outlines of all its glyphs.
+    The glyphs of a commit's SHA and message would otherwise be dozens of
+    mobjects per commit, which is what most of the memory of large -n
+    values went to.
+    """
+    font_digest = get_font_digest(
+        kwargs.get("font", ""), kwargs.get("weight", m.NORMAL)
+    )
+    key = get_cache_key(text, kwargs, font_digest)
+    glyphs = _memory.get(key)
+    if glyphs is None:
+        path = None
+        if font_digest is not None:
+            path = os.path.join(get_cache_dir(), key + ".npz")
+        glyphs = load(path) if path else None
+        if glyphs is None:
+            glyphs = get_glyphs(m.Text(text, **kwargs))
+            if path:
+                store(path, glyphs)
+        _memory[key] = glyphs
+        if len(_memory) > MEMORY_CACHE_SIZE:
+            _memory.popitem(last=False)
+    else:
+        _memory.move_to_end(key)
+    return build_text(glyphs, merge=not settings.animate)
+
+
+def get_cache_key(text, kwargs, font_digest=None):
+    options = []
+    for name, value in sorted(kwargs.items()):
+        if name == "color" and value is not None:
+            value = m.ManimColor(value).to_hex()
+        options.append((name, str(value)))
+    content = repr((m.__version__, text, options, font_digest))
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def get_cache_dir():
+    if settings.text_cache_dir:
+        return settings.text_cache_dir
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "git-sim", "text_cache")
+
+
+def get_font_digest(font, weight):
+    """SHA-256 of the font file Pango will use for font and weight, or None
+    if it can't be found."""
+    if (font, weight) not in _font_digests:
+        digest = None
+        path = find_font_file(font, weight)
+        if path:
+            try:
+                with open(path, "rb") as f:
+                    digest = hashlib.sha256(f.read()).hexdigest()
+            except OSError:
+                pass
+        _font_digests[(font, weight)] = digest
+    return _font_digests[(font, weight)]
+
+
+def find_font_file(font, weight):
+    if settings.font_path and font == settings.font:
+        return settings.font_path
+    try:
+        result = subprocess.run(
+            ["fc-match", "--format=%{file}", f"{font}:weight={weight.lower()}"],
+            capture_output=True,
+            text=True,
+        )
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip() or None
+
+
+def get_glyphs(text):
+    glyphs = text.submobjects
+    points = [glyph.points for glyph in glyphs]
+    return {
+        "points": np.concatenate(points) if points else np.zeros((0, 3)),
+        "counts": np.array([len(p) for p in points], dtype=np.int64),
+        "fill": np.array([glyph.get_fill_rgbas()[0] for glyph in glyphs]),
+        "stroke": np.array([glyph.get_stroke_rgbas()[0] for glyph in glyphs]),
+        "stroke_width": np.array(
+            [glyph.get_stroke_width() for glyph in glyphs], dtype=float
+        ),
+    }
+
+
+def build_text(glyphs, merge=False):
+    """VGroup with a VMobject per glyph or, with merge and glyphs that are
+    all styled the same, a single VMobject with every glyph's outline."""
+    if merge and len(glyphs["counts"]) and is_uniform(glyphs):
+        return build_glyph(
+            glyphs["points"],
+            glyphs["fill"][0],
+            glyphs["stroke"][0],
+            glyphs["stroke_width"][0],
+        )
+
+    text = m.VGroup()
+    start = 0
+    for count, fill, stroke, stroke_width in zip(
+        glyphs["counts"], glyphs["fill"], glyphs["stroke"], glyphs["stroke_width"]
+    ):
+        text.add(
+            build_glyph(
+                glyphs["points"][start : start + count], fill, stroke, stroke_width
+            )
+        )
+        start += count
+    return text
+
+
+def build_glyph(points, fill, stroke, stroke_width):
+    glyph = m.VMobject()
+    glyph.set_points(points)
+    glyph.set_fill(m.ManimColor.from_rgb(fill[:3]), opacity=fill[3])
+    glyph.set_stroke(
+        m.ManimColor.from_rgb(stroke[:3]), width=stroke_width, opacity=stroke[3]
+    )
+    return glyph
+
+
+def is_uniform(glyphs):
+    return all(
+        (glyphs[name] == glyphs[name][0]).all()
+        for name in ("fill", "stroke", "stroke_width")
+    )
+
+
+def load(path):
+    # Plain arrays only, entries are never unpickled
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            glyphs = {name: data[name] for name in GLYPH_FIELDS}
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+        return None
+    if not is_valid(glyphs):
+        return None
+    # Entries are pruned by the time they were last used
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return glyphs
+
+
+def is_valid(glyphs):
+    n = len(glyphs["counts"])
+    return (
+        glyphs["points"].ndim == 2
+        and glyphs["points"].shape[1] == 3
+        and glyphs["counts"].ndim == 1
+        and glyphs["counts"].dtype.kind == "i"
+        and (glyphs["counts"] >= 0).all()
+        and glyphs["counts"].sum() == len(glyphs["points"])
+        and glyphs["fill"].shape == (n, 4)
+        and glyphs["stroke"].shape == (n, 4)
+        and glyphs["stroke_width"].shape == (n,)
+    )
+
+
+def store(path, glyphs):
+    global _stores
+    cache_dir = os.path.dirname(path)
+    tmp_path = None
+    try:
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        # Write to a temp file first so concurrent runs never read a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **glyphs)
+        os.replace(tmp_path, path)
+    except OSError:
+        # Caching is best effort, the text was already built
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    if _stores % PRUNE_INTERVAL == 0:
+        prune(cache_dir)
+    _stores += 1
+
+
+def prune(cache_dir=None, max_size=DISK_CACHE_SIZE, dry_run=False):
+    """Remove the least recently used entries if the cache takes up more
+    than max_size bytes, returning their paths and their size in bytes."""
+    cache_dir = cache_dir or get_cache_dir()
+    entries = []
+    try:
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".npz") and entry.is_file():
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+    except OSError:
+        return [], 0
+
+    total = sum(size for _, size, _ in entries)
+    if total <= max_size:
+        return [], 0
+    removed, removed_size = [], 0
+    for _, size, path in sorted(entries):
+        if total - removed_size <= max_size * 3 // 4:
+            break
+        if not dry_run:
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+        removed.append(path)
+        removed_size += size
+    return removed, removed_size
@@ -0,0 +1,189 @@
+import concurrent.futures
+import json
+import math
+import multiprocessing
+import os
+import threading
+
+import cv2
+import numpy
+from manim import config
+from manim.utils.iterables import list_update
+
+from git_sim.scratch import join_background_threads
+from git_sim.settings import settings
+from git_sim.vector import VECTOR_FORMATS, write_vector_image
+
+# Mobjects are kept for a tile if their points come this close to it, so that
+# stroke widths and arrow tips crossing the edge are still drawn
+TILE_MARGIN = 0.25
+
+# How long to wait for background scratch dir deletions before forking
+THREAD_JOIN_TIMEOUT = 5
+
+# Set before forking the tile workers, which inherit the laid out scene
+_scene = None
+_tiles = None
+
+
+class Tile:
+    """One page of a tiled image: its place in the grid, the scene area it
+    shows and the indexes of the mobjects to draw in it."""
+
+    __slots__ = ("row", "column", "center", "mobjects", "file_name")
+
+    def __init__(self, row, column, center, mobjects):
+        self.row = row
+        self.column = column
+        self.center = center
+        self.mobjects = mobjects
+        self.file_name = None
+
+
+def get_bounding_boxes(mobjects):
+    """(N, 4) array of the left, bottom, right and top of each mobject, NaN
+    for mobjects without any points."""
+    boxes = numpy.full((len(mobjects), 4), numpy.nan)
+    for i, mobject in enumerate(mobjects):
+        points = mobject.get_all_points()
+        if len(points):
+            boxes[i, :2] = points[:, :2].min(axis=0)
+            boxes[i, 2:] = points[:, :2].max(axis=0)
+    return boxes
+
+
+def make_tiles(frame_center, frame_width, frame_height, tile_width, boxes):
+    """Split the frame into a grid of tiles of tile_width by the frame's
+    aspect ratio, starting from its top left corner, and cull the mobjects
+    outside of each one."""
+    tile_height = tile_width * frame_height / frame_width
+    columns = max(math.ceil(frame_width / tile_width - 1e-9), 1)
+    rows = max(math.ceil(frame_height / tile_height - 1e-9), 1)
+    left = frame_center[0] - frame_width / 2
+    top = frame_center[1] + frame_height / 2
+
+    drawn = ~numpy.isnan(boxes[:, 0])
+    tiles = []
+    for row in range(rows):
+        for column in range(columns):
+            x0 = left + column * tile_width - TILE_MARGIN
+            x1 = left + (column + 1) * tile_width + TILE_MARGIN
+            y1 = top - row * tile_height + TILE_MARGIN
+            y0 = top - (row + 1) * tile_height - TILE_MARGIN
+            hits = (
+                drawn
+                & (boxes[:, 0] <= x1)
+                & (boxes[:, 2] >= x0)
+                & (boxes[:, 1] <= y1)
+                & (boxes[:, 3] >= y0)
+            )
+            center = (
+                left + (column + 0.5) * tile_width,
+                top - (row + 0.5) * tile_height,
+            )
+            tiles.append(Tile(row, column, center, numpy.flatnonzero(hits).tolist()))
+    return tiles, rows, columns, tile_height
+
+
+def render_tile(index, tiles_dir, tile_width):
+    from git_sim.animations import make_transparent
+
+    scene = _scene
+    tile = _tiles[index]
+    mobjects = list_update(scene.mobjects, scene.foreground_mobjects)
+    mobjects = [mobjects[i] for i in tile.mobjects]
+    camera = scene.renderer.camera
+    camera.frame.scale_to_fit_width(tile_width)
+    camera.frame.move_to([tile.center[0], tile.center[1], 0])
+    file_name = f"tile_{tile.row}_{tile.column}." + settings.img_format
+
+    if settings.img_format in VECTOR_FORMATS:
+        write_vector_image(scene, os.path.join(tiles_dir, file_name), mobjects)
+        return file_name
+
+    camera.reset()
+    camera.capture_mobjects(mobjects)
+    image = cv2.cvtColor(camera.pixel_array, cv2.COLOR_RGBA2BGR)
+    if settings.transparent_bg:
+        image = make_transparent(image)
+    cv2.imwrite(os.path.join(tiles_dir, file_name), image)
+    return file_name
+
+
+def can_fork():
+    if "fork" not in multiprocessing.get_all_start_methods():
+        return False
+    join_background_threads(THREAD_JOIN_TIMEOUT)
+    return threading.active_count() == 1
+
+
+def write_tiles(scene, tiles_dir):
+    """Render the final state of the scene as tiles at the default zoom
+    level instead of as one zoomed out image, and write them with a
+    manifest.json describing the grid to tiles_dir.
+
+    Tiles are rendered in parallel by forked worker processes where fork is
+    available. Forking a process with other threads running can deadlock the
+    workers, so the background scratch dir deletions are waited for first,
+    and the tiles are rendered in this process if any thread is still
+    running. Tiles without any mobjects are not written.
+    """
+    global _scene, _tiles
+
+    mobjects = list_update(scene.mobjects, scene.foreground_mobjects)
+    frame = scene.renderer.camera.frame
+    frame_width, frame_height = frame.width, frame.height
+    tile_width = min(config.frame_width, frame_width)
+    tiles, rows, columns, tile_height = make_tiles(
+        frame.get_center(),
+        frame_width,
+        frame_height,
+        tile_width,
+        get_bounding_boxes(mobjects),
+    )
+    drawn = [i for i, tile in enumerate(tiles) if tile.mobjects]
+
+    _scene, _tiles = scene, tiles
+    try:
+        jobs = min(os.cpu_count() or 1, len(drawn))
+        if jobs > 1 and can_fork():
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=jobs, mp_context=multiprocessing.get_context("fork")
+            ) as executor:
+                file_names = list(
+                    executor.map(
+                        render_tile,
+                        drawn,
+                        [tiles_dir] * len(drawn),
+                        [tile_width] * len(drawn),
+                    )
+                )
+        else:
+            file_names = [render_tile(i, tiles_dir, tile_width) for i in drawn]
+    finally:
+        _scene, _tiles = None, None
+    for i, file_name in zip(drawn, file_names):
+        tiles[i].file_name = file_name
+
+    manifest = {
+        "rows": rows,
+        "columns": columns,
+        "tile_pixel_width": config.pixel_width,
+        "tile_pixel_height": config.pixel_height,
+        "tile_width": float(tile_width),
+        "tile_height": float(tile_height),
+        "tiles": [
+            {
+                "row": tile.row,
+                "column": tile.column,
+                "file": tile.file_name,
+                "center": [float(x) for x in tile.center],
+                "mobjects": len(tile.mobjects),
+            }
+            for tile in tiles
+        ],
+    }
+    manifest_path = os.path.join(tiles_dir, "manifest.json")
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest_path
@@ -0,0 +1,91 @@
+import itertools
+
+import cairo
+from manim import VMobject
+from manim.camera.camera import CAP_STYLE_MAP, LINE_JOIN_MAP
+from manim.constants import CapStyleType, LineJointType
+from manim.utils.iterables import list_update
+
+from git_sim.enums import ImgFormat
+from git_sim.settings import settings
+
+VECTOR_FORMATS = (ImgFormat.SVG, ImgFormat.PDF)
+
+
+def write_vector_image(scene, path, mobjects=None):
+    """Draw the final state of the scene, or only the given mobjects, as
+    paths into an SVG or PDF file, without rasterizing anything.
+
+    The page has the size of the output image in points and shows what the
+    camera frame shows. Mobjects without outlines, such as images, are
+    skipped.
+    """
+    camera = scene.renderer.camera
+    if mobjects is None:
+        mobjects = list_update(scene.mobjects, scene.foreground_mobjects)
+
+    width, height = camera.pixel_width, camera.pixel_height
+    if settings.img_format == ImgFormat.PDF:
+        surface = cairo.PDFSurface(path, width, height)
+    else:
+        surface = cairo.SVGSurface(path, width, height)
+    ctx = cairo.Context(surface)
+
+    if not settings.transparent_bg:
+        ctx.rectangle(0, 0, width, height)
+        ctx.set_source_rgba(
+            *camera.background_color.to_rgb(), camera.background_opacity
+        )
+        ctx.fill()
+
+    frame_width, frame_height = camera.frame_width, camera.frame_height
+    frame_center = camera.frame_center
+    ctx.set_matrix(
+        cairo.Matrix(
+            width / frame_width,
+            0,
+            0,
+            -(height / frame_height),
+            (width / 2) - frame_center[0] * (width / frame_width),
+            (height / 2) + frame_center[1] * (height / frame_height),
+        )
+    )
+    for vmobject in camera.get_mobjects_to_display(mobjects):
+        if isinstance(vmobject, VMobject):
+            draw_vmobject(camera, ctx, vmobject)
+    surface.finish()
+
+
+def draw_vmobject(camera, ctx, vmobject):
+    """Same as Camera.display_vectorized, but with colors in RGB order,
+    since the camera's are swapped for its BGRA pixel buffer."""
+    camera.set_cairo_context_path(ctx, vmobject)
+    apply_stroke(camera, ctx, vmobject, background=True)
+    set_color(camera, ctx, camera.get_fill_rgbas(vmobject), vmobject)
+    ctx.fill_preserve()
+    apply_stroke(camera, ctx, vmobject)
+
+
+def apply_stroke(camera, ctx, vmobject, background=False):
+    width = vmobject.get_stroke_width(background)
+    if width == 0:
+        return
+    set_color(camera, ctx, camera.get_stroke_rgbas(vmobject, background), vmobject)
+    ctx.set_line_width(width * camera.cairo_line_width_multiple)
+    if vmobject.joint_type != LineJointType.AUTO:
+        ctx.set_line_join(LINE_JOIN_MAP[vmobject.joint_type])
+    if vmobject.cap_style != CapStyleType.AUTO:
+        ctx.set_line_cap(CAP_STYLE_MAP[vmobject.cap_style])
+    ctx.stroke_preserve()
+
+
+def set_color(camera, ctx, rgbas, vmobject):
+    if len(rgbas) == 1:
+        ctx.set_source_rgba(*rgbas[0])
+        return
+    points = vmobject.get_gradient_start_and_end_points()
+    points = camera.transform_points_pre_display(vmobject, points)
+    gradient = cairo.LinearGradient(*itertools.chain(*(point[:2] for point in points)))
+    for i, rgba in enumerate(rgbas):
+        gradient.add_color_stop_rgba(i / (len(rgbas) - 1), *rgba)
+    ctx.set_source(gradient)
@@ -0,0 +1,51 @@
+class StatusSnapshot:
+    """Working tree status from a single `git status --porcelain=v2 -z` call,
+    instead of separate index and working tree diffs and an untracked file
+    listing that each stat every file.
+
+    unstaged holds the paths that differ between the index and the working
+    tree, like `repo.index.diff(None)`. staged holds the paths that differ
+    between HEAD (or an empty tree before the first commit) and the index,
+    like `repo.index.diff("HEAD")`. untracked holds every untracked file,
+    like `repo.untracked_files`. Paths are relative to the repo root.
+    """
+
+    def __init__(self, repo):
+        self.repo = repo
+        self.unstaged = []
+        self.staged = []
+        self.untracked = []
+
+        # Don't let status refresh the index, the simulation is read-only
+        output = repo.git.status(
+            "--porcelain=v2",
+            "-z",
+            "--untracked-files=all",
+            "--ignore-submodules=none",
+            env={"GIT_OPTIONAL_LOCKS": "0"},
+            strip_newline_in_stdout=False,
+        )
+        entries = iter(output.split("\x00"))
+        for entry in entries:
+            kind = entry[:1]
+            if kind == "1":
+                fields = entry.split(" ", 8)
+                xy, path = fields[1], fields[8]
+            elif kind == "2":
+                fields = entry.split(" ", 9)
+                xy, path = fields[1], fields[9]
+                # Renamed and copied entries are followed by the original path
+                next(entries, None)
+            elif kind == "u":
+                fields = entry.split(" ", 10)
+                xy, path = fields[1], fields[10]
+            elif kind == "?":
+                self.untracked.append(entry[2:])
+                continue
+            else:
+                continue
+
+            if xy[0] != ".":
+                self.staged.append(path)
+            if xy[1] != ".":
+                self.unstaged.append(path)
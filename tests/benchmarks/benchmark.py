@@ -0,0 +1,215 @@
+"""Benchmark git-sim subcommands on synthetic repos of increasing size.
+
+Repos are generated with git-dummy at each requested scale, then every
+subcommand is simulated in-process a few times under git_sim.profiling,
+which records the time spent in each phase: opening the repo, parsing
+commits, populating zones, layout, rasterization and encoding, and the calls
+and time of each instrumented method. Each repeat is a cold run
+with empty caches followed by a warm run that reuses them, and both are
+summarized separately. Results are written as JSON so that runs can be
+compared to spot regressions.
+
+Usage:
+    python tests/benchmarks/benchmark.py --scales small,medium --output bench.json
+"""
+
+import argparse, json, os, platform, shutil, statistics, subprocess, sys, tempfile
+import time
+from pathlib import Path
+from shlex import split
+
+SCALES = {
+    "small": {
+        "commits": 10,
+        "branches": 4,
+        "diverge-at": 2,
+        "merge": "1",
+        "tags": "v0.1,v0.2",
+        "untracked": 5,
+        "modified": 2,
+        "staged": 2,
+    },
+    "medium": {
+        "commits": 200,
+        "branches": 8,
+        "diverge-at": 20,
+        "merge": "1,2,3",
+        "tags": ",".join(f"v{i}" for i in range(10)),
+        "untracked": 50,
+        "modified": 20,
+        "staged": 20,
+    },
+    "large": {
+        "commits": 2000,
+        "branches": 16,
+        "diverge-at": 200,
+        "merge": ",".join(str(i) for i in range(1, 9)),
+        "tags": ",".join(f"v{i}" for i in range(50)),
+        "untracked": 500,
+        "modified": 200,
+        "staged": 200,
+    },
+}
+
+COMMANDS = [
+    "log",
+    "status",
+    "add",
+    "commit",
+    "restore",
+    "stash",
+    "branch new_branch",
+    "tag new_tag",
+    "checkout branch2",
+    "switch branch2",
+    "cherry-pick branch2",
+    "merge branch2",
+    "rebase branch2",
+    "reset HEAD^",
+    "revert HEAD^",
+]
+
+
+def make_repo(scale, parent_dir):
+    """Generate the repo for a scale with git-dummy, returning its path."""
+    options = " ".join(f"--{key}={value}" for key, value in SCALES[scale].items())
+    git_dummy = Path(sys.executable).parent / "git-dummy"
+    cmd = f"{git_dummy.as_posix()} --name={scale} --git-dir={parent_dir} --constant-sha {options}"
+    subprocess.run(split(cmd), check=True, capture_output=True)
+    return Path(parent_dir) / scale
+
+
+def clear_caches(repo_path, cache_dir):
+    """Empty the caches that later runs would hit: the media dir, with
+    manim's rendered text, the text cache, git-sim's in-memory text
+    templates and the repo's commit store."""
+    from git_sim import text_cache
+
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    shutil.rmtree(Path(repo_path) / ".git" / "git-sim", ignore_errors=True)
+    text_cache._memory.clear()
+
+
+def run_benchmark(scale, repo_path, work_dir, repeat, animate):
+    from git_sim import profiling
+    from git_sim.runner import run_command
+
+    cache_dir = os.path.join(work_dir, "cache")
+    media_dir = os.path.join(cache_dir, "media")
+    os.environ["GIT_SIM_TEXT_CACHE_DIR"] = os.path.join(cache_dir, "text_cache")
+
+    results = []
+    for command in COMMANDS:
+        args = ["-d", "-q", "--img-format=png", f"--media-dir={media_dir}"]
+        if animate:
+            args += ["--animate", "--low-quality"]
+        args += split(command)
+
+        for i in range(repeat):
+            clear_caches(repo_path, cache_dir)
+            for cache in ("cold", "warm"):
+                wall_start = time.perf_counter()
+                cpu_start = time.process_time()
+                profiling.start()
+                exit_code, _ = run_command(args, cwd=repo_path)
+                profile = profiling.stop()
+                results.append(
+                    {
+                        "scale": scale,
+                        "command": command,
+                        "run": i,
+                        "cache": cache,
+                        "exit_code": exit_code,
+                        "wall": time.perf_counter() - wall_start,
+                        "cpu": time.process_time() - cpu_start,
+                        "phases": {
+                            phase: {"wall": wall, "cpu": cpu}
+                            for phase, (wall, cpu) in profile.phases.items()
+                        },
+                        "methods": {
+                            name: {"calls": calls, "wall": wall, "cpu": cpu}
+                            for name, (calls, wall, cpu) in profile.methods.items()
+                        },
+                    }
+                )
+                print(
+                    f"{scale:>8} {command:<20} run {i} {cache}: {results[-1]['wall']:.3f}s",
+                    file=sys.stderr,
+                )
+    return results
+
+
+def summarize(results):
+    """Median wall time and phase times for each scale, command and cold or
+    warm caches."""
+    groups = {}
+    for result in results:
+        key = (result["scale"], result["command"], result["cache"])
+        groups.setdefault(key, []).append(result)
+
+    summary = []
+    for (scale, command, cache), runs in groups.items():
+        phases = sorted({phase for run in runs for phase in run["phases"]})
+        summary.append(
+            {
+                "scale": scale,
+                "command": command,
+                "cache": cache,
+                "ok": all(run["exit_code"] == 0 for run in runs),
+                "wall_median": statistics.median(run["wall"] for run in runs),
+                "phases_median": {
+                    phase: statistics.median(
+                        run["phases"].get(phase, {"wall": 0.0})["wall"] for run in runs
+                    )
+                    for phase in phases
+                },
+            }
+        )
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scales",
+        default="small,medium",
+        help=f"Comma separated scales to run, from {', '.join(SCALES)}",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Cold and warm runs per command"
+    )
+    parser.add_argument(
+        "--animate", action="store_true", help="Benchmark low quality videos"
+    )
+    parser.add_argument("--output", help="JSON results file, stdout by default")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="git-sim-bench-") as work_dir:
+        for scale in args.scales.split(","):
+            repo_path = make_repo(scale, work_dir)
+            results += run_benchmark(
+                scale, repo_path, work_dir, args.repeat, args.animate
+            )
+
+    import git_sim
+
+    report = {
+        "git_sim_version": git_sim.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "animate": args.animate,
+        "scales": {scale: SCALES[scale] for scale in args.scales.split(",")},
+        "summary": summarize(results),
+        "runs": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
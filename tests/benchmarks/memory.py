@@ -0,0 +1,89 @@
+"""Measure the peak memory of git-sim log for growing -n values.
+
+A repo is generated with git-dummy at the large scale, then git-sim log is
+run with --all and each -n value in a fresh process, and the peak resident
+set size of that process is read from its resource usage. Results are
+written as JSON, with the growth per commit between consecutive -n values.
+Only runs on Unix, where os.wait4 reports a child's resource usage.
+
+Usage:
+    python tests/benchmarks/memory.py --n 50,200,1000 --output memory.json
+"""
+
+import argparse, json, os, platform, subprocess, sys, tempfile, time
+from pathlib import Path
+
+from benchmark import SCALES, make_repo
+
+# ru_maxrss is in kilobytes on Linux and in bytes on macOS
+MAXRSS_BYTES = 1 if sys.platform == "darwin" else 1024
+
+
+def measure(repo_path, n, media_dir, animate):
+    """Run git-sim log -n n --all in a new process, returning its exit code
+    and peak resident set size in bytes."""
+    args = ["-d", "-q", "--img-format=png", f"--media-dir={media_dir}"]
+    if animate:
+        args += ["--animate", "--low-quality"]
+    args += ["log", "-n", str(n), "--all"]
+    process = subprocess.Popen(
+        [sys.executable, "-m", "git_sim"] + args,
+        cwd=repo_path,
+        stdout=subprocess.DEVNULL,
+    )
+    _, status, usage = os.wait4(process.pid, 0)
+    exit_code = os.WEXITSTATUS(status) if os.WIFEXITED(status) else 1
+    return exit_code, usage.ru_maxrss * MAXRSS_BYTES
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--n", default="50,200,1000", help="Comma separated -n values to run"
+    )
+    parser.add_argument(
+        "--scale",
+        default="large",
+        help=f"Scale of the generated repo, one of {', '.join(SCALES)}",
+    )
+    parser.add_argument(
+        "--animate", action="store_true", help="Measure low quality videos"
+    )
+    parser.add_argument("--output", help="JSON results file, stdout by default")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="git-sim-memory-") as work_dir:
+        repo_path = make_repo(args.scale, work_dir)
+        media_dir = os.path.join(work_dir, "media")
+        os.environ["GIT_SIM_TEXT_CACHE_DIR"] = os.path.join(work_dir, "text_cache")
+        for n in sorted(int(n) for n in args.n.split(",")):
+            exit_code, peak = measure(repo_path, n, media_dir, args.animate)
+            results.append({"n": n, "exit_code": exit_code, "peak_rss": peak})
+            print(f"-n {n:<6} {peak / 2**20:8.1f} MiB", file=sys.stderr)
+
+    for prev, result in zip(results, results[1:]):
+        result["bytes_per_commit"] = (result["peak_rss"] - prev["peak_rss"]) / (
+            result["n"] - prev["n"]
+        )
+
+    import git_sim
+
+    report = {
+        "git_sim_version": git_sim.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "animate": args.animate,
+        "scale": {args.scale: SCALES[args.scale]},
+        "runs": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Checks for the in-memory ancestry queries."""
+
+import git
+
+from git_sim.ancestry import Ancestry
+
+ACTOR = git.Actor("Ada", "ada@example.com")
+
+
+def commit(repo, message, parents=None):
+    kwargs = {"author": ACTOR, "committer": ACTOR}
+    if parents is not None:
+        kwargs["parent_commits"] = parents
+    return repo.index.commit(message, **kwargs)
+
+
+def make_repo(path):
+    """main: root - base - m1 - m2 - m3, topic: base - t1 - t2"""
+    repo = git.Repo.init(path)
+    root = commit(repo, "root")
+    base = commit(repo, "base")
+    main = [commit(repo, f"m{i}") for i in range(1, 4)]
+    t1 = commit(repo, "t1", parents=[base])
+    topic = [t1, commit(repo, "t2", parents=[t1])]
+    repo.create_head("topic", topic[-1])
+    return repo, root, base, main, topic
+
+
+class CountingAncestry(Ancestry):
+    def __init__(self, repo):
+        super().__init__(repo)
+        self.loads = 0
+
+    def load(self, left, right):
+        self.loads += 1
+        super().load(left, right)
+
+
+def test_answers_match_git(tmp_path):
+    """Every pair of commits gets the same answer as merge-base --is-ancestor."""
+    repo, root, base, main, topic = make_repo(tmp_path / "repo")
+    commits = [root, base] + main + topic
+    ancestry = Ancestry(repo)
+    for ancestor in commits:
+        for descendant in commits:
+            assert ancestry.is_ancestor(
+                ancestor.hexsha, descendant.hexsha
+            ) == repo.is_ancestor(ancestor, descendant)
+
+    assert ancestry.contains("topic", base.hexsha)
+    assert not ancestry.contains("topic", main[0].hexsha)
+    assert ancestry.is_ancestor("topic", "topic")
+    assert not ancestry.is_ancestor("no-such-branch", "topic")
+
+
+def test_walking_to_the_base_loads_once(tmp_path):
+    """A rebase style walk back from HEAD runs git once."""
+    repo, root, base, main, topic = make_repo(tmp_path / "repo")
+    ancestry = CountingAncestry(repo)
+
+    walked = [c for c in reversed(main) if not ancestry.is_ancestor(c.hexsha, "topic")]
+    assert walked == list(reversed(main))
+    assert ancestry.is_ancestor(base.hexsha, "topic")
+    assert ancestry.is_ancestor(root.hexsha, "topic")
+    assert ancestry.loads == 1
@@ -0,0 +1,36 @@
+"""Checks for batching the animations of several play() calls."""
+
+import pytest
+
+m = pytest.importorskip("manim")
+pytest.importorskip("cv2")
+
+from git_sim.git_sim_base_command import AnimationBatch
+
+
+def test_batched_mobjects_appear_when_animated():
+    """Created mobjects join the scene when their Create starts, not before
+    the batch is played, and moved mobjects join when their play starts."""
+    scene = m.Scene()
+    circle, label, arrow = m.Circle(), m.Square(), m.Line()
+    batch = AnimationBatch(
+        [
+            [m.Create(circle)],
+            [m.Create(label), arrow.animate.shift(m.UP)],
+        ]
+    )
+
+    scene.add_mobjects_from_animations([batch])
+    batch._setup_scene(scene)
+    assert scene.mobjects == []
+
+    batch.begin()
+    assert scene.mobjects == [circle]
+
+    batch.next_animation()
+    assert circle in scene.mobjects
+    assert label in scene.mobjects and arrow in scene.mobjects
+
+    batch.finish()
+    batch.clean_up_from_scene(scene)
+    assert len(scene.mobjects) == 3
@@ -0,0 +1,99 @@
+"""Checks for the persistent commit store."""
+
+import os
+
+import git
+
+from git_sim.commit_graph import CommitGraph
+
+ACTOR = git.Actor("Ada", "ada@example.com")
+
+
+def commit(repo, message, parents=None):
+    kwargs = {"author": ACTOR, "committer": ACTOR}
+    if parents is not None:
+        kwargs["parent_commits"] = parents
+    return repo.index.commit(message, **kwargs)
+
+
+def count_records(path):
+    return sum(
+        len(open(os.path.join(path, name), "rb").read().splitlines())
+        for name in os.listdir(path)
+    )
+
+
+def test_commits_are_read_from_the_store(tmp_path):
+    """A later run answers from the store without reading the repo."""
+    repo = git.Repo.init(tmp_path / "repo")
+    first = commit(repo, "first")
+    second = commit(repo, "second\n\nbody")
+    merge = commit(repo, "merge", parents=[second, first])
+    store = str(tmp_path / "commits")
+
+    graph = CommitGraph(repo, store, persist=True)
+    assert [p.hexsha for p in graph.get(merge.hexsha).parents] == [
+        second.hexsha,
+        first.hexsha,
+    ]
+    assert graph.get(second.hexsha).summary == "second"
+
+    later = CommitGraph(None, store)
+    loaded = later.get(merge.hexsha)
+    assert loaded.summary == "merge"
+    assert loaded.author.name == "Ada"
+    assert [p.summary for p in loaded.parents] == ["second", "first"]
+
+
+def test_only_new_commits_are_appended(tmp_path):
+    """Moving a ref adds the new commits to the store and nothing else."""
+    repo = git.Repo.init(tmp_path / "repo")
+    head = commit(repo, "first")
+    head = commit(repo, "second")
+    store = str(tmp_path / "commits")
+    CommitGraph(repo, store, persist=True).get(head.hexsha).parents[0].parents
+    assert count_records(store) == 2
+
+    head = commit(repo, "third")
+    graph = CommitGraph(repo, store, persist=True)
+    assert graph.get(head.hexsha).parents[0].parents[0].summary == "first"
+    assert count_records(store) == 3
+
+
+def test_missing_commits_and_damaged_records(tmp_path):
+    """Unknown commits are None, and cut short records are skipped."""
+    repo = git.Repo.init(tmp_path / "repo")
+    head = commit(repo, "first")
+    store = tmp_path / "commits"
+    store.mkdir()
+    (store / head.hexsha[:2]).write_text(head.hexsha + "\x1f\x1fAda")
+
+    graph = CommitGraph(repo, str(store))
+    assert graph.get("0" * 40) is None
+    assert graph.get(head.hexsha).summary == "first"
+
+
+def test_moved_tips_are_read_in_one_batch(tmp_path):
+    """Commits only the moved tips reach are stored when the tips are
+    updated, and unchanged tips read nothing."""
+    repo = git.Repo.init(tmp_path / "repo")
+    old = commit(repo, "first")
+    store = str(tmp_path / "commits")
+    graph = CommitGraph(repo, store, persist=True)
+    graph.update_tips([old.hexsha, None], limit=10)
+    assert graph.read_tips() == {old.hexsha}
+    assert not graph.rows
+
+    new = [commit(repo, f"new {i}\n\nbody") for i in range(3)]
+    graph = CommitGraph(repo, store, persist=True)
+    graph.update_tips([new[-1].hexsha], limit=10)
+    assert set(graph.rows) == {c.hexsha for c in new}
+    assert graph.read_tips() == {new[-1].hexsha}
+
+    later = CommitGraph(None, store)
+    assert later.get(new[-1].hexsha).summary == "new 2"
+    assert [p.summary for p in later.get(new[-1].hexsha).parents] == ["new 1"]
+
+    graph = CommitGraph(repo, store, persist=True)
+    graph.update_tips([new[-1].hexsha], limit=10)
+    assert not graph.rows
@@ -0,0 +1,163 @@
+"""Checks for the commit layout walk and the arrow collision test."""
+
+import subprocess, sys
+
+import git, numpy
+
+from git_sim.commit_graph import CommitGraph
+from git_sim.layout import (
+    ARROW_HALF_WIDTH,
+    COMMIT_RADIUS,
+    COMMIT_SPACING,
+    LANE_SPACING,
+    find_curved_edges,
+    get_arrow_length,
+    walk_commits,
+)
+from git_sim.spatial import CommitIndex
+
+
+class Scene:
+    """The parts of GitSimBaseCommand that walk_commits uses."""
+
+    def __init__(self, repo, n):
+        self.n = n
+        # No dark placeholder commits after the root
+        self.n_default = 0
+        self.n_dark_commits = 0
+        self.drawnCommits = {}
+        self.expandedCommits = {}
+        self.commit_index = CommitIndex()
+        self.commit_graph = CommitGraph(repo)
+
+    def get_commit_graph(self):
+        return self.commit_graph
+
+    def get_drawn_commit(self, commit, i):
+        return commit
+
+    def create_dark_commit(self):
+        return "dark"
+
+
+def make_chain(path, length):
+    """Repo with a single branch of length commits, made with fast-import."""
+    repo = git.Repo.init(path)
+    stream = []
+    for i in range(1, length + 1):
+        stream += [
+            "commit refs/heads/main",
+            f"mark :{i}",
+            f"committer Ada <ada@example.com> {i} +0000",
+            f"data {len(str(i))}",
+            str(i),
+        ]
+        if i > 1:
+            stream.append(f"from :{i - 1}")
+    subprocess.run(
+        ["git", "fast-import", "--quiet"],
+        cwd=path,
+        input="\n".join(stream + [""]).encode(),
+        check=True,
+    )
+    return repo, repo.commit("main")
+
+
+def bar_hits_circle(start, end, center):
+    """What the original m.Intersection test found: whether the arrow's bar,
+    a rectangle of get_arrow_length() by 0.1 centered between the ends,
+    overlaps the circle."""
+    vector = end[:2] - start[:2]
+    unit = vector / numpy.linalg.norm(vector)
+    offset = center[:2] - (start[:2] + end[:2]) / 2
+    along = abs(offset @ unit) - get_arrow_length(start, end) / 2
+    across = abs(offset @ numpy.array([-unit[1], unit[0]])) - ARROW_HALF_WIDTH
+    return max(along, 0) ** 2 + max(across, 0) ** 2 < COMMIT_RADIUS**2
+
+
+def test_curved_edges_match_the_bar_intersection():
+    """Edges between commits on the layout lattice are curved exactly when
+    their bar overlaps a commit drawn before them."""
+    rng = numpy.random.default_rng(0)
+    lattice = [
+        numpy.array([x * COMMIT_SPACING, -y * LANE_SPACING, 0.0])
+        for x in range(10)
+        for y in range(5)
+    ]
+    circles = [lattice[k] for k in rng.choice(len(lattice), 30, replace=False)]
+    index = CommitIndex()
+    for center in circles:
+        index.add(center, COMMIT_RADIUS)
+
+    pairs = [rng.choice(len(circles), 2, replace=False) for _ in range(300)]
+    starts = numpy.array([circles[a] for a, _ in pairs])
+    ends = numpy.array([circles[b] for _, b in pairs])
+    counts = rng.integers(0, len(circles) + 1, len(pairs))
+
+    curved = find_curved_edges(starts, ends, counts, index)
+    expected = [
+        any(bar_hits_circle(start, end, c) for c in circles[:count])
+        for start, end, count in zip(starts, ends, counts)
+    ]
+    assert curved.tolist() == expected
+    assert 0 < sum(expected) < len(expected)
+
+
+def test_commit_index_slots_and_candidates():
+    """Slots ignore float noise, and candidates come from nearby cells only."""
+    index = CommitIndex()
+    index.add(numpy.array([0.0, 0.0, 0.0]), COMMIT_RADIUS)
+    index.add(numpy.array([25.0, -8.0, 0.0]), COMMIT_RADIUS)
+    assert index.is_occupied(numpy.array([1e-9, -1e-9, 0.0]))
+    assert not index.is_occupied(numpy.array([0.0, -LANE_SPACING, 0.0]))
+
+    boxes, circles = index.find_candidates(
+        numpy.array([[0.6, -0.1], [10.0, 10.0]]),
+        numpy.array([[1.4, 0.1], [11.0, 11.0]]),
+        ARROW_HALF_WIDTH,
+    )
+    assert boxes.tolist() == [0] and circles.tolist() == [0]
+
+
+def test_taken_slots_move_down_a_lane(tmp_path):
+    """A branch whose tip lands on a drawn commit moves down a lane, and
+    meets the drawn history where it forks."""
+    repo = git.Repo.init(tmp_path / "repo")
+    actor = git.Actor("Ada", "ada@example.com")
+    base = repo.index.commit("base", author=actor, committer=actor)
+    main = repo.index.commit("main", author=actor, committer=actor)
+    topic = repo.index.commit(
+        "topic", parent_commits=[base], author=actor, committer=actor
+    )
+    scene = Scene(repo, n=5)
+
+    layout = walk_commits(scene, main)
+    assert [c.hexsha for c in layout.commits] == [main.hexsha, base.hexsha]
+    assert layout.centers[:, 0].tolist() == [0.0, -COMMIT_SPACING]
+
+    class Circle:
+        def __init__(self, center):
+            self.center = center
+
+        def get_center(self):
+            return self.center
+
+    for commit, center in zip(layout.commits, layout.centers):
+        scene.drawnCommits[commit.hexsha] = Circle(center)
+
+    layout = walk_commits(scene, topic)
+    assert layout.is_new == [True, False]
+    assert layout.centers[0].tolist() == [0.0, -LANE_SPACING, 0.0]
+    assert layout.centers[1].tolist() == [-COMMIT_SPACING, 0.0, 0.0]
+
+
+def test_chain_deeper_than_the_recursion_limit(tmp_path):
+    """-n values past the recursion limit lay out a straight chain."""
+    length = sys.getrecursionlimit() + 100
+    repo, head = make_chain(tmp_path / "repo", length)
+    layout = walk_commits(Scene(repo, n=length), head)
+
+    assert len(layout.commits) == length
+    assert (numpy.diff(layout.centers[:, 0]) == -COMMIT_SPACING).all()
+    assert (layout.centers[:, 1] == 0).all()
+    assert not layout.curved.any()
@@ -0,0 +1,16 @@
+"""Checks for the naming of output files."""
+
+import concurrent.futures, os
+
+from git_sim.output import claim_unique_path
+
+
+def test_concurrent_claims_get_distinct_paths(tmp_path):
+    """Runs that produce the same output file name never share a path."""
+    path = os.path.join(tmp_path, "images", "git-sim-log_01-01-26_12-00-00_000.jpg")
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        claimed = list(executor.map(lambda _: claim_unique_path(path), range(32)))
+
+    assert len(set(claimed)) == 32
+    assert path in claimed
+    assert all(os.path.exists(claimed_path) for claimed_path in claimed)
@@ -0,0 +1,45 @@
+"""Checks for the --preview tier."""
+
+import pytest
+
+pytest.importorskip("manim")
+
+from manim import config, tempconfig
+
+from git_sim.preview import (
+    PREVIEW_FRAME_BUDGET,
+    PREVIEW_FRAME_RATE,
+    PREVIEW_MAX_RUN_TIME,
+    PREVIEW_PIXEL_HEIGHT,
+    PREVIEW_PIXEL_WIDTH,
+    configure_preview,
+    get_preview_run_time,
+)
+
+
+def test_configure_preview():
+    """Previews are small, choppy and never cached."""
+    with tempconfig({}):
+        configure_preview()
+        assert (config.pixel_width, config.pixel_height) == (
+            PREVIEW_PIXEL_WIDTH,
+            PREVIEW_PIXEL_HEIGHT,
+        )
+        assert config.frame_rate == PREVIEW_FRAME_RATE
+        assert config.disable_caching
+
+
+def test_preview_run_time():
+    """Animations are capped, at one frame once the budget is used, and
+    never lengthened."""
+    with tempconfig({}):
+        configure_preview()
+        frame_time = 1 / PREVIEW_FRAME_RATE
+        budget = PREVIEW_FRAME_BUDGET / PREVIEW_FRAME_RATE
+
+        assert get_preview_run_time(5, 0) == PREVIEW_MAX_RUN_TIME
+        assert get_preview_run_time(0.2, 0) == 0.2
+        assert get_preview_run_time(0.01, 0) == 0.01
+        assert get_preview_run_time(5, budget - frame_time) == PREVIEW_MAX_RUN_TIME
+        assert get_preview_run_time(5, budget) == frame_time
+        assert get_preview_run_time(0.01, budget) == 0.01
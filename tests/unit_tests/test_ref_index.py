@@ -0,0 +1,54 @@
+"""Checks for the index of refs by commit."""
+
+import git, pytest
+
+from git_sim.ref_index import RefIndex
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = git.Repo.init(tmp_path / "repo", initial_branch="main")
+    with repo.config_writer() as config:
+        config.set_value("user", "name", "Ada")
+        config.set_value("user", "email", "ada@example.com")
+    return repo
+
+
+def commit_file(repo, path, content, message):
+    full_path = repo.working_tree_dir + "/" + path
+    with open(full_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    repo.index.add([path])
+    return repo.index.commit(message)
+
+
+def test_tags_resolve_to_commits(repo):
+    """Lightweight, annotated and nested annotated tags all point at their
+    commit, and tags of other objects are left out."""
+    first = commit_file(repo, "a.txt", "a", "first")
+    second = commit_file(repo, "a.txt", "b", "second")
+    repo.git.tag("light", first.hexsha)
+    repo.git.tag("-a", "annotated", "-m", "annotated", first.hexsha)
+    repo.git.tag("-a", "nested", "-m", "nested", "annotated")
+    repo.git.tag("tree", second.tree.hexsha)
+
+    index = RefIndex(repo)
+    assert index.tags == {
+        "annotated": first.hexsha,
+        "light": first.hexsha,
+        "nested": first.hexsha,
+    }
+    assert sorted(index.get_tags(first.hexsha)) == ["annotated", "light", "nested"]
+    assert index.get_tags(second.hexsha) == []
+
+
+def test_branches_and_tags_on_one_commit(repo):
+    """A commit lists every branch and tag that points at it."""
+    head = commit_file(repo, "a.txt", "a", "first")
+    repo.create_head("topic")
+    repo.create_tag("v1")
+
+    index = RefIndex(repo)
+    assert index.head == head.hexsha
+    assert index.get_branches(head.hexsha) == ["main", "topic"]
+    assert index.get_tags(head.hexsha) == ["v1"]
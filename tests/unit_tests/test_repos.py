@@ -0,0 +1,33 @@
+"""Checks for the repos and indexes shared by the commands of a batch."""
+
+import git
+
+from git_sim import repos
+from git_sim.ref_index import RefIndex
+from git_sim.worktree_status import StatusSnapshot
+
+
+def test_batch_commands_share_indexes(tmp_path, monkeypatch):
+    """Within a batch, the open repo's indexes are built once, but scratch
+    clones always get their own."""
+    monkeypatch.setattr(repos, "_repos", {})
+    monkeypatch.setattr(repos, "_keep_open", False)
+    monkeypatch.setattr(repos, "_shared_indexes", None)
+    git.Repo.init(tmp_path / "repo")
+    scratch = git.Repo.init(tmp_path / "scratch")
+    monkeypatch.chdir(tmp_path / "repo")
+
+    repo = repos.open_repo()
+    assert repos.get_shared_index(repo, StatusSnapshot) is not repos.get_shared_index(
+        repo, StatusSnapshot
+    )
+
+    repos.share_indexes()
+    repo = repos.open_repo()
+    assert repos.open_repo() is repo
+    status = repos.get_shared_index(repo, StatusSnapshot)
+    assert repos.get_shared_index(repo, StatusSnapshot) is status
+    assert repos.get_shared_index(repo, RefIndex) is not status
+    assert repos.get_shared_index(scratch, StatusSnapshot) is not (
+        repos.get_shared_index(scratch, StatusSnapshot)
+    )
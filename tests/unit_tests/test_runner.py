@@ -0,0 +1,41 @@
+"""Checks for the settings of commands run in-process, e.g. by the server."""
+
+import os
+
+import typer
+
+from git_sim.__main__ import app
+from git_sim.runner import get_default_map, get_settings_environ, settings_environ
+from git_sim.settings import reset_settings
+
+
+def test_client_environment_replaces_own(monkeypatch):
+    """Only the given git_sim_* variables are set while settings are read."""
+    monkeypatch.setenv("GIT_SIM_SPEED", "3")
+    monkeypatch.setenv("HOME_UNRELATED", "kept")
+    with settings_environ({"git_sim_n": "7", "PATH": "/nowhere"}):
+        assert get_settings_environ() == {"git_sim_n": "7"}
+        assert os.environ["PATH"] != "/nowhere"
+    assert get_settings_environ() == {"GIT_SIM_SPEED": "3"}
+    assert os.environ["HOME_UNRELATED"] == "kept"
+
+
+def test_options_default_to_current_settings(monkeypatch, tmp_path):
+    """Global options follow the settings of the command being run, not the
+    ones at import time."""
+    monkeypatch.chdir(tmp_path)
+    with settings_environ({"GIT_SIM_N": "7", "git_sim_style": "thick"}):
+        reset_settings()
+    try:
+        command = typer.main.get_command(app)
+        ctx = command.make_context("git-sim", ["log"], default_map=get_default_map(app))
+        assert ctx.params["n"] == 7
+        assert ctx.params["style"] == "thick"
+        assert str(ctx.params["media_dir"]) == str(tmp_path)
+
+        ctx = command.make_context(
+            "git-sim", ["-n", "3", "log"], default_map=get_default_map(app)
+        )
+        assert ctx.params["n"] == 3
+    finally:
+        reset_settings()
@@ -0,0 +1,63 @@
+"""Checks for the lifecycle of the per-run scratch dirs."""
+
+import os, subprocess, sys, tempfile
+
+from git_sim import scratch
+
+
+def make_dead_pid():
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def test_scratch_dirs_are_unique_per_run(monkeypatch, tmp_path):
+    """Two scratch dirs for the same repo never collide and belong to this
+    process."""
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    first = scratch.make_scratch_dir("my-repo")
+    second = scratch.make_scratch_dir("my-repo")
+
+    assert first != second
+    assert scratch.get_owner_pid(first) == os.getpid()
+    assert scratch.find_stale_dirs() == []
+
+
+def test_gc_removes_dirs_of_ended_runs(monkeypatch, tmp_path):
+    """Dirs of runs that ended and old dirs without an owner are removed,
+    including read-only git objects."""
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    root = scratch.get_scratch_root()
+    alive = scratch.make_scratch_dir("repo")
+    dead = os.path.join(root, f"repo-{make_dead_pid()}-abc123")
+    legacy = os.path.join(root, "repo2")
+    os.makedirs(os.path.join(dead, "objects"))
+    object_path = os.path.join(dead, "objects", "object")
+    with open(object_path, "w") as f:
+        f.write("x" * 10)
+    os.chmod(object_path, 0o444)
+    os.makedirs(legacy)
+    os.utime(legacy, (0, 0))
+
+    stale, size = scratch.collect_garbage(dry_run=True)
+    assert sorted(stale) == sorted([dead, legacy])
+    assert size == 10
+    assert os.path.exists(dead)
+
+    scratch.collect_garbage()
+    assert not os.path.exists(dead)
+    assert not os.path.exists(legacy)
+    assert os.path.exists(alive)
+
+
+def test_removal_moves_dir_to_trash(monkeypatch, tmp_path):
+    """A finished run's dir disappears right away and is deleted from the
+    trash in the background."""
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    path = scratch.make_scratch_dir("repo")
+    scratch.remove_scratch_dir(path)
+    assert not os.path.exists(path)
+
+    trash = os.path.join(scratch.get_scratch_root(), scratch.TRASH_DIR_NAME)
+    assert scratch.join_background_threads(timeout=10)
+    assert os.listdir(trash) == []
@@ -0,0 +1,47 @@
+"""Cold start checks for the git-sim CLI.
+
+Importing the CLI entry point must not pull in the rendering stack, so that
+`git-sim --help`, `git-sim -v` and mistyped subcommands return quickly.
+
+The import time budget can be adjusted for slow machines by setting
+GIT_SIM_IMPORT_BUDGET_MS.
+"""
+
+import os, subprocess, sys
+
+IMPORT_BUDGET_MS = float(os.environ.get("GIT_SIM_IMPORT_BUDGET_MS", 500))
+
+HEAVY_MODULES = ["manim", "cv2", "fontTools", "numpy", "git"]
+
+
+def run_python(*args):
+    return subprocess.run(
+        [sys.executable, *args], capture_output=True, text=True, check=True
+    )
+
+
+def test_cli_does_not_import_rendering_dependencies():
+    """Loading the CLI leaves the heavy dependencies unimported."""
+    code = (
+        "import sys, git_sim.__main__; "
+        f"print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    loaded = run_python("-c", code).stdout.split()
+    assert loaded == []
+
+
+def test_cli_import_time_within_budget():
+    """The cumulative import time reported by -X importtime stays in budget."""
+    result = run_python("-X", "importtime", "-c", "import git_sim.__main__")
+
+    cumulative_us = None
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == "git_sim.__main__":
+            cumulative_us = int(parts[1])
+
+    assert cumulative_us is not None
+    assert cumulative_us / 1000 <= IMPORT_BUDGET_MS, (
+        f"Importing git_sim.__main__ took {cumulative_us / 1000:.0f} ms, "
+        f"over the budget of {IMPORT_BUDGET_MS:.0f} ms"
+    )
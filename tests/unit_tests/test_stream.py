@@ -0,0 +1,65 @@
+"""Checks for the frames written by --stream."""
+
+import io, struct, sys
+
+import numpy, pytest
+
+pytest.importorskip("manim")
+cv2 = pytest.importorskip("cv2")
+
+from git_sim.enums import StreamFormat
+from git_sim.settings import settings
+from git_sim.stream import RGBA_MAGIC, StreamingFileWriter, encode_frame
+
+
+def make_frame(width=4, height=3):
+    frame = numpy.zeros((height, width, 4), dtype=numpy.uint8)
+    frame[..., 0] = 255
+    frame[..., 3] = 255
+    return frame
+
+
+def test_rgba_header():
+    """rgba frames are GSIM, the big-endian width and height, then pixels."""
+    frame = make_frame()
+    data = encode_frame(frame, StreamFormat.RGBA)
+
+    assert data[:4] == RGBA_MAGIC == b"GSIM"
+    assert struct.unpack(">II", data[4:12]) == (4, 3)
+    assert data[12:] == frame.tobytes()
+
+
+def test_png_and_mjpeg_frames_decode():
+    """png and mjpeg frames are complete images with the frame's colors."""
+    frame = make_frame()
+    png = cv2.imdecode(
+        numpy.frombuffer(encode_frame(frame, StreamFormat.PNG), numpy.uint8),
+        cv2.IMREAD_UNCHANGED,
+    )
+    assert png.shape == (3, 4, 4)
+    assert (png[..., 2] == 255).all() and (png[..., 0] == 0).all()
+
+    jpeg = cv2.imdecode(
+        numpy.frombuffer(encode_frame(frame, StreamFormat.MJPEG), numpy.uint8),
+        cv2.IMREAD_COLOR,
+    )
+    assert jpeg.shape == (3, 4, 3)
+
+
+@pytest.mark.parametrize(
+    "args, kwargs",
+    [((), {}), ((3,), {}), ((), {"num_frames": 3}), ((), {"repeat": 3})],
+)
+def test_repeated_frames_are_streamed(monkeypatch, args, kwargs):
+    """Frames manim asks to repeat are written that many times."""
+    from manim.scene.scene_file_writer import SceneFileWriter
+
+    monkeypatch.setattr(SceneFileWriter, "write_frame", lambda *a, **k: None)
+    monkeypatch.setattr(settings, "stream", StreamFormat.RGBA)
+    stdout = io.TextIOWrapper(io.BytesIO())
+    monkeypatch.setattr(sys, "stdout", stdout)
+
+    frame = make_frame()
+    StreamingFileWriter.__new__(StreamingFileWriter).write_frame(frame, *args, **kwargs)
+    repeat = 1 if not args and not kwargs else 3
+    assert stdout.buffer.getvalue() == encode_frame(frame, StreamFormat.RGBA) * repeat
@@ -0,0 +1,79 @@
+"""Checks for the on-disk text cache."""
+
+import os, pickle
+
+import numpy, pytest
+
+pytest.importorskip("manim")
+
+from git_sim.text_cache import build_text, get_cache_key, load, prune, store
+
+
+def make_glyphs():
+    return {
+        "points": numpy.arange(21, dtype=float).reshape(7, 3),
+        "counts": numpy.array([3, 4]),
+        "fill": numpy.ones((2, 4)),
+        "stroke": numpy.zeros((2, 4)),
+        "stroke_width": numpy.zeros(2),
+    }
+
+
+def test_glyphs_round_trip(tmp_path):
+    """Stored glyph arrays load back unchanged."""
+    path = str(tmp_path / "entry.npz")
+    glyphs = make_glyphs()
+    store(path, glyphs)
+
+    loaded = load(path)
+    assert loaded.keys() == glyphs.keys()
+    assert all((loaded[name] == glyphs[name]).all() for name in glyphs)
+
+
+def test_pickles_and_malformed_entries_are_ignored(tmp_path):
+    """Entries are never unpickled, and arrays that don't fit together are
+    treated as a cache miss."""
+    pickled = tmp_path / "pickled.npz"
+    pickled.write_bytes(pickle.dumps(make_glyphs()))
+    assert load(str(pickled)) is None
+
+    objects = str(tmp_path / "objects.npz")
+    numpy.savez(objects, **dict(make_glyphs(), points=numpy.array([None, 1])))
+    assert load(objects) is None
+
+    mismatched = str(tmp_path / "mismatched.npz")
+    store(mismatched, dict(make_glyphs(), counts=numpy.array([3, 5])))
+    assert load(mismatched) is None
+
+
+def test_key_depends_on_font_file():
+    """The same options with a different font file get a different key."""
+    options = {"font": "Monospace", "font_size": 14}
+    assert get_cache_key("HEAD", options, "a") != get_cache_key("HEAD", options, "b")
+
+
+def test_merged_text_is_one_mobject():
+    """Merged glyphs are a single VMobject, unless they're styled apart."""
+    glyphs = make_glyphs()
+    merged = build_text(glyphs, merge=True)
+    assert not merged.submobjects
+    assert (merged.points == glyphs["points"]).all()
+    assert len(build_text(glyphs).submobjects) == 2
+
+    styled = dict(glyphs, fill=numpy.array([[1.0, 1, 1, 1], [1, 0, 0, 1]]))
+    assert len(build_text(styled, merge=True).submobjects) == 2
+
+
+def test_least_recently_used_entries_are_pruned(tmp_path):
+    """Past the size bound, the entries used longest ago are removed first."""
+    paths = [str(tmp_path / f"{i}.npz") for i in range(4)]
+    for i, path in enumerate(paths):
+        store(path, make_glyphs())
+        os.utime(path, (i, i))
+    load(paths[0])
+    size = os.path.getsize(paths[0])
+
+    assert prune(str(tmp_path), max_size=4 * size) == ([], 0)
+    assert prune(str(tmp_path), max_size=3 * size, dry_run=True)[0] == paths[1:3]
+    assert prune(str(tmp_path), max_size=3 * size) == (paths[1:3], 2 * size)
+    assert sorted(os.listdir(tmp_path)) == ["0.npz", "3.npz"]
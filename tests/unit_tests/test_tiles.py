@@ -0,0 +1,38 @@
+"""Checks for splitting static images into tiles."""
+
+import numpy, pytest
+
+pytest.importorskip("manim")
+pytest.importorskip("cv2")
+
+from git_sim.tiles import make_tiles
+
+
+def test_tiles_cover_frame_and_cull_mobjects():
+    """The grid covers the whole frame and each tile only keeps the
+    mobjects that reach into it."""
+    boxes = numpy.array(
+        [
+            [-10.0, -1.0, -9.0, 1.0],
+            [0.0, 0.0, 1.0, 1.0],
+            [19.0, 3.0, 21.0, 4.0],
+            [numpy.nan] * 4,
+        ]
+    )
+    tiles, rows, columns, tile_height = make_tiles(
+        numpy.zeros(3), 45.0, 24.0, 14.0, boxes
+    )
+
+    assert (rows, columns) == (4, 4)
+    assert tile_height == pytest.approx(14.0 * 24 / 45)
+    culled = {(t.row, t.column): t.mobjects for t in tiles if t.mobjects}
+    assert culled == {(1, 0): [0], (1, 1): [1], (1, 2): [2], (1, 3): [2]}
+
+
+def test_small_frame_is_one_tile():
+    """A frame no wider than a tile is rendered as a single tile."""
+    boxes = numpy.array([[-1.0, -1.0, 1.0, 1.0]])
+    tiles, rows, columns, _ = make_tiles(numpy.zeros(3), 14.0, 8.0, 14.0, boxes)
+
+    assert (rows, columns) == (1, 1)
+    assert tiles[0].mobjects == [0]
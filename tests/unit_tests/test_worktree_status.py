@@ -0,0 +1,75 @@
+"""Checks for the working tree status snapshot."""
+
+import git, pytest
+
+from git_sim.ref_index import RefIndex
+from git_sim.worktree_status import StatusSnapshot
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = git.Repo.init(tmp_path / "repo", initial_branch="main")
+    with repo.config_writer() as config:
+        config.set_value("user", "name", "Ada")
+        config.set_value("user", "email", "ada@example.com")
+    return repo
+
+
+def commit_file(repo, path, content, message):
+    full_path = repo.working_tree_dir + "/" + path
+    with open(full_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    repo.index.add([path])
+    return repo.index.commit(message)
+
+
+def test_unborn_head(repo):
+    """A repo without commits has no HEAD commit, refs or changes but the
+    ones in the index."""
+    with open(repo.working_tree_dir + "/staged.txt", "w", encoding="utf-8") as f:
+        f.write("staged")
+    repo.index.add(["staged.txt"])
+    with open(repo.working_tree_dir + "/new.txt", "w", encoding="utf-8") as f:
+        f.write("new")
+
+    index = RefIndex(repo)
+    assert index.head is None
+    assert index.heads == {} and index.tags == {}
+
+    status = StatusSnapshot(repo)
+    assert status.staged == ["staged.txt"]
+    assert status.unstaged == []
+    assert status.untracked == ["new.txt"]
+
+
+def test_renames_and_unusual_paths(repo):
+    """Renamed entries report the new path, and paths with spaces or
+    non-ASCII characters come through unquoted."""
+    commit_file(repo, "old name.txt", "same content\n" * 10, "first")
+    commit_file(repo, "édité.txt", "a", "second")
+    repo.git.mv("old name.txt", "new name.txt")
+    with open(repo.working_tree_dir + "/édité.txt", "w", encoding="utf-8") as f:
+        f.write("b")
+    with open(repo.working_tree_dir + "/dir with space.txt", "w") as f:
+        f.write("c")
+
+    status = StatusSnapshot(repo)
+    assert status.staged == ["new name.txt"]
+    assert status.unstaged == ["édité.txt"]
+    assert status.untracked == ["dir with space.txt"]
+
+
+def test_unmerged_paths(repo):
+    """Both sides of a conflicted path count as changed."""
+    commit_file(repo, "conflict.txt", "base", "base")
+    repo.create_head("topic")
+    commit_file(repo, "conflict.txt", "main", "main")
+    repo.heads.topic.checkout()
+    commit_file(repo, "conflict.txt", "topic", "topic")
+    with pytest.raises(git.GitCommandError):
+        repo.git.merge("main")
+
+    status = StatusSnapshot(repo)
+    assert status.staged == ["conflict.txt"]
+    assert status.unstaged == ["conflict.txt"]
+    assert status.untracked == []